@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Benchmarks
+
+Measures how schedule generation, encoding, decoding, streaming encoding and full MCP tool calls
+scale with num_steps, auction_blocks and schedule length, and compares the
+results against a stored baseline so hot-path regressions fail loudly.
+
+For every case it reports ops/sec, p50/p99 latency and peak traced memory.
+Timing and memory are measured in separate runs because tracemalloc slows
+allocation-heavy code down considerably.
+
+Usage:
+    python benchmark.py                    # full suite (12 to 1e6 steps)
+    python benchmark.py --quick            # up to 1e4 steps, for CI
+    python benchmark.py --filter encode    # only cases whose name contains "encode"
+    python benchmark.py --update-baseline  # record results as the new baseline
+
+The baseline is machine-specific: regenerate it with --update-baseline on the
+machine that runs the comparison. The MCP call_tool cases are skipped when the
+server requirements (mcp, pydantic) are not installed.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+from logic import (
+    generate_schedule,
+    iter_schedule,
+    encode_supply_schedule,
+    decode_supply_schedule,
+    write_supply_schedule,
+    SupplySchedule,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Schedule sizes exercised by the suite
+FULL_SIZES = [12, 1_000, 10_000, 100_000, 1_000_000]
+QUICK_SIZES = [12, 1_000, 10_000]
+
+# Auction lengths for the (fixed 12-step) auction_blocks scaling cases
+AUCTION_BLOCKS = [14_400, 86_400, 604_800, 2_592_000]
+
+# Largest schedule pushed through the JSON-rendering call_tool path
+MAX_CALL_TOOL_SIZE = 100_000
+
+# Per-case time budget and repetition bounds for the timing run
+TIME_BUDGET_SECONDS = 1.0
+MIN_REPEATS = 5
+MAX_REPEATS = 1_000
+
+# Default allowed slowdown / memory growth relative to the baseline
+DEFAULT_TOLERANCE = 0.5
+
+# Latency increases smaller than this are treated as timer / scheduler noise
+DEFAULT_NOISE_FLOOR_MS = 1.0
+
+
+def _auction_blocks_for(num_steps: int) -> int:
+    """Auction length that keeps every step at least one block long."""
+    return max(86_400, 2 * num_steps)
+
+
+def _synthetic_schedule(length: int) -> SupplySchedule:
+    """Schedule of the given length with varied, encodable values."""
+    return SupplySchedule(
+        [(i * 7919) % 10_000 for i in range(length)],
+        [(i * 104_729) % 100_000 + 1 for i in range(length)]
+    )
+
+
+class _NullSink:
+    """Binary sink that discards everything written to it."""
+
+    def write(self, data: Any) -> int:
+        return len(data)
+
+
+def build_cases(sizes: list[int]) -> list[tuple[str, Callable[[], Any]]]:
+    """Build the (name, callable) benchmark cases."""
+    cases = []
+
+    for num_steps in sizes:
+        auction_blocks = _auction_blocks_for(num_steps)
+        cases.append((
+            f"generate_schedule[num_steps={num_steps}]",
+            lambda n=num_steps, b=auction_blocks: generate_schedule(b, num_steps=n)
+        ))
+
+    # Streaming generate + encode; peak memory should not grow with num_steps
+    for num_steps in sizes:
+        auction_blocks = _auction_blocks_for(num_steps)
+        cases.append((
+            f"write_supply_schedule[num_steps={num_steps}]",
+            lambda n=num_steps, b=auction_blocks: write_supply_schedule(iter_schedule(b, num_steps=n), _NullSink())
+        ))
+
+    for auction_blocks in AUCTION_BLOCKS:
+        cases.append((
+            f"generate_schedule[auction_blocks={auction_blocks}]",
+            lambda b=auction_blocks: generate_schedule(b)
+        ))
+
+    for length in sizes:
+        schedule = _synthetic_schedule(length)
+        entries = schedule.to_dicts()
+        encoded = encode_supply_schedule(schedule)
+        cases.append((
+            f"encode_supply_schedule[length={length}]",
+            lambda s=schedule: encode_supply_schedule(s)
+        ))
+        cases.append((
+            f"encode_supply_schedule_dicts[length={length}]",
+            lambda e=entries: encode_supply_schedule(e)
+        ))
+        cases.append((
+            f"decode_supply_schedule[length={length}]",
+            lambda e=encoded: decode_supply_schedule(e)
+        ))
+
+    cases.extend(_call_tool_cases([s for s in sizes if s <= MAX_CALL_TOOL_SIZE]))
+    return cases
+
+
+def _call_tool_cases(sizes: list[int]) -> list[tuple[str, Callable[[], Any]]]:
+    """
+    Full MCP tool invocations, including validation and JSON rendering.
+
+    The call_tool cases clear the server's response caches before every call, so they measure
+    the computation rather than cache hits; the call_tool_warm cases measure cache hits.
+    """
+    # The persistent schedule store would turn every call into a store hit
+    os.environ.pop("CCA_STORE_PATH", None)
+    try:
+        import server
+    except ImportError as e:
+        print(f"Skipping call_tool cases: {e}", file=sys.stderr)
+        return []
+
+    loop = asyncio.new_event_loop()
+
+    def cold(name: str, arguments: dict[str, Any]) -> Any:
+        server.schedule_cache.clear()
+        server.encoding_cache.clear()
+        return loop.run_until_complete(server.call_tool(name, arguments))
+
+    def warm(name: str, arguments: dict[str, Any]) -> Any:
+        return loop.run_until_complete(server.call_tool(name, arguments))
+
+    cases = []
+    for size in sizes:
+        generate_args = {"auction_blocks": _auction_blocks_for(size), "num_steps": size}
+        encode_args = {"schedule": _synthetic_schedule(size).to_dicts()}
+        for prefix, call in (("call_tool", cold), ("call_tool_warm", warm)):
+            cases.append((
+                f"{prefix}:generate_supply_schedule[num_steps={size}]",
+                lambda c=call, a=generate_args: c("generate_supply_schedule", a)
+            ))
+            cases.append((
+                f"{prefix}:encode_supply_schedule[length={size}]",
+                lambda c=call, a=encode_args: c("encode_supply_schedule", a)
+            ))
+    return cases
+
+
+def measure(fn: Callable[[], Any]) -> dict[str, float]:
+    """Time fn repeatedly within the time budget, then trace its peak memory once."""
+    fn()  # warm-up
+
+    latencies = []
+    deadline = time.perf_counter() + TIME_BUDGET_SECONDS
+    gc.collect()
+    while len(latencies) < MIN_REPEATS or (
+        len(latencies) < MAX_REPEATS and time.perf_counter() < deadline
+    ):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p99 = percentiles[49], percentiles[98]
+    else:
+        p50 = p99 = latencies[0]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "repeats": len(latencies),
+        "ops_per_sec": round(len(latencies) / sum(latencies), 2),
+        "p50_ms": round(p50 * 1000, 4),
+        "p99_ms": round(p99 * 1000, 4),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+    noise_floor_ms: float = DEFAULT_NOISE_FLOOR_MS
+) -> list[str]:
+    """Return a description of every case that regressed past the tolerance."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ("p50_ms", "peak_kib"):
+            limit = reference[metric] * (1 + tolerance)
+            if metric == "p50_ms":
+                limit = max(limit, reference[metric] + noise_floor_ms)
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]} exceeds baseline {reference[metric]} "
+                    f"by more than {tolerance:.0%}"
+                )
+    return regressions
+
+
+def load_baseline(path: str) -> Optional[dict[str, Any]]:
+    """Load a stored baseline, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the suite and compare against the baseline. Returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Only run sizes up to 1e4")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this string")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed regression as a fraction (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--noise-floor-ms", type=float, default=DEFAULT_NOISE_FLOOR_MS,
+                        help=f"Ignore latency increases below this many ms (default: {DEFAULT_NOISE_FLOOR_MS})")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    cases = [
+        (name, fn)
+        for name, fn in build_cases(QUICK_SIZES if args.quick else FULL_SIZES)
+        if args.filter in name
+    ]
+
+    results = {}
+    print(f"{'case':<60} {'ops/sec':>12} {'p50 ms':>12} {'p99 ms':>12} {'peak KiB':>12}")
+    for name, fn in cases:
+        result = measure(fn)
+        results[name] = result
+        print(
+            f"{name:<60} {result['ops_per_sec']:>12} {result['p50_ms']:>12} "
+            f"{result['p99_ms']:>12} {result['peak_kib']:>12}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        stored = load_baseline(args.baseline) or {}
+        stored_results = stored.get("results", {})
+        stored_results.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": dict(sorted(stored_results.items()))
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\n✓ Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    regressions = compare(results, baseline["results"], args.tolerance, args.noise_floor_ms)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print(f"\n✓ No regressions against baseline (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
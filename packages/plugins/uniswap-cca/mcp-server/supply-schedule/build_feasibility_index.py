@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Feasibility Index Builder
+
+Builds feasibility_index.json, which the server loads on first use to reject
+num_steps / round_to_nearest combinations that cannot produce a valid
+schedule (and suggest ones that can) without generating anything.
+
+The index covers common auction lengths (feasibility.INDEX_DURATIONS on
+chains with feasibility.INDEX_BLOCK_TIMES), every rounding in
+DEFAULT_ROUNDING_CANDIDATES and num_steps 1..INDEX_MAX_NUM_STEPS, at the
+default final_block_pct, alpha and curve. Rebuild it whenever the generation
+algorithm changes; --check fails if the stored index is out of date.
+
+Usage:
+    python build_feasibility_index.py           # rebuild feasibility_index.json
+    python build_feasibility_index.py --check   # verify the stored index is current
+"""
+
+import argparse
+import sys
+import time
+from typing import Optional
+
+from feasibility import DEFAULT_INDEX_PATH, FeasibilityIndex
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Build (or verify) the feasibility index. Returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_INDEX_PATH,
+                        help="Index file to write or check (default: feasibility_index.json)")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare a fresh build with the stored index instead of writing it")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = FeasibilityIndex.build()
+    elapsed = time.perf_counter() - start
+    print(f"Built {len(index)} (auction_blocks, round_to_nearest) entries in {elapsed:.1f}s")
+
+    if args.check:
+        try:
+            stored = FeasibilityIndex.load(args.output)
+        except (OSError, ValueError) as e:
+            print(f"\n✗ Cannot load {args.output}: {e}")
+            return 1
+        if stored.to_dict() != index.to_dict():
+            print(f"\n✗ {args.output} is out of date; run build_feasibility_index.py")
+            return 1
+        print(f"\n✓ {args.output} is up to date")
+        return 0
+
+    index.save(args.output)
+    print(f"\n✓ Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
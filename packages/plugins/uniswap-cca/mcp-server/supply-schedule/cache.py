@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - In-process Caching
+
+Bounded LRU cache used by the MCP server to reuse generated schedules,
+encodings and rendered tool responses across calls.
+
+Like logic.py, this module has no external dependencies.
+"""
+
+import asyncio
+import functools
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class _Inflight:
+    """A running computation and the number of callers awaiting it."""
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with single-flight loading.
+
+    get_or_compute() deduplicates concurrent misses: while a value is being
+    computed for a key, every other caller asking for the same key awaits the
+    same computation instead of starting its own. Failed computations are not
+    cached, and their exception is raised to every waiting caller. A caller
+    that is cancelled stops waiting without affecting the others; the
+    computation itself is only cancelled once no caller is left waiting.
+
+    Counters:
+        hits: Lookups served from the cache
+        misses: Lookups that started a computation
+        coalesced: Lookups that joined an in-flight computation
+        evictions: Entries dropped to stay within maxsize
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Args:
+            maxsize: Maximum number of entries; 0 disables caching (but
+                concurrent identical calls are still deduplicated)
+        """
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be >= 0, got {maxsize}")
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._inflight: dict[Hashable, _Inflight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key (marking it recently used), or default."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace a value, evicting the least recently used entries if full."""
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._data.clear()
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, computing and caching it on a miss.
+
+        Args:
+            key: Hashable cache key
+            compute: Coroutine function producing the value
+
+        Returns:
+            The cached or freshly computed value
+
+        Raises:
+            Whatever compute raises (the failure is not cached)
+        """
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self.misses += 1
+            # The computation runs as its own task, so no single caller owns it
+            inflight = self._inflight[key] = _Inflight(asyncio.ensure_future(compute()))
+            inflight.task.add_done_callback(functools.partial(self._finish, key, inflight))
+        else:
+            self.coalesced += 1
+
+        inflight.waiters += 1
+        try:
+            # shield: a cancelled caller must not cancel the computation others are waiting on
+            return await asyncio.shield(inflight.task)
+        finally:
+            inflight.waiters -= 1
+            if inflight.waiters == 0 and not inflight.task.done():
+                # Every caller gave up on the result
+                inflight.task.cancel()
+
+    def _finish(self, key: Hashable, inflight: _Inflight, task: asyncio.Future) -> None:
+        """Done callback of a computation: cache its value, or just retrieve its exception."""
+        if self._inflight.get(key) is inflight:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result())
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of the size and counters."""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
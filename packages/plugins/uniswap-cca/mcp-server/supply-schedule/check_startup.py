@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Cold-start Budget Check
+
+Agent runtimes spawn server.py over stdio for every session, so import time
+is paid on every session start. This script measures how much time importing
+server.py adds on top of the MCP framework it cannot avoid (mcp, pydantic),
+and fails when that overhead exceeds a budget, so cold start stays low as
+tools are added.
+
+Each measurement runs in a fresh interpreter that imports the framework
+first and then times `import server` in-process; the minimum over several
+runs is used to filter out scheduler noise. The check also fails when
+importing server.py loads any of DEFERRED_MODULES, which only some tools
+need and which the server imports on first use.
+
+Usage:
+    python check_startup.py                 # default budget
+    python check_startup.py --budget-ms 50  # custom budget
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Optional
+
+# Modules every MCP server in this package has to import anyway
+FRAMEWORK_IMPORTS = "import mcp.server, mcp.types, pydantic"
+
+# Modules the server must import on first use, not at startup
+DEFERRED_MODULES = ("scenarios", "simulation", "store", "sqlite3", "feasibility", "transport", "cProfile")
+
+# Imports the framework, then times importing server.py on top of it and lists deferred modules it loaded
+MEASURE_SCRIPT = f"""
+import sys
+import time
+{FRAMEWORK_IMPORTS}
+start = time.perf_counter()
+import server
+elapsed = time.perf_counter() - start
+print(",".join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))
+print(elapsed)
+"""
+
+DEFAULT_BUDGET_MS = 75.0
+DEFAULT_RUNS = 5
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def time_server_import() -> tuple[float, list[str]]:
+    """
+    Seconds a fresh interpreter spends importing server.py after the framework,
+    and the DEFERRED_MODULES that import loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_SCRIPT],
+        cwd=SERVER_DIR,
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    loaded, elapsed = result.stdout.splitlines()[-2:]
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+def time_framework_import() -> float:
+    """Wall-clock seconds for a fresh interpreter to import the framework."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", FRAMEWORK_IMPORTS],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Measure import overhead and compare it to the budget. Returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Max import overhead over the framework in ms (default: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Interpreter launches per measurement (default: {DEFAULT_RUNS})")
+    args = parser.parse_args(argv)
+
+    framework_ms = min(time_framework_import() for _ in range(args.runs)) * 1000
+    measurements = [time_server_import() for _ in range(args.runs)]
+    overhead_ms = min(elapsed for elapsed, _ in measurements) * 1000
+    loaded = measurements[0][1]
+
+    print(f"Interpreter + framework imports (mcp, pydantic): {framework_ms:8.1f} ms")
+    print(f"Server import overhead:                          {overhead_ms:8.1f} ms (budget {args.budget_ms:.1f} ms)")
+
+    if loaded:
+        print(f"\n✗ Importing server.py loads modules that should be imported on first use: {', '.join(loaded)}")
+        return 1
+
+    if overhead_ms > args.budget_ms:
+        print(f"\n✗ Cold-start overhead exceeds the budget by {overhead_ms - args.budget_ms:.1f} ms")
+        return 1
+
+    print("\n✓ Cold-start overhead within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Tool Execution
+
+Runs CPU-bound tool bodies (schedule generation, encoding, JSON rendering)
+off the asyncio event loop, so one large request does not stall every other
+request served by the same process.
+
+Like logic.py, this module has no external dependencies.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+from typing import Any, Callable, Optional
+
+# Supported execution modes
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+class ToolExecutor:
+    """
+    Runs synchronous tool bodies inline, on a thread pool or on a process pool.
+
+    Modes:
+        inline: Run on the event loop (no offloading; useful for debugging)
+        thread: Run on a ThreadPoolExecutor. The event loop stays responsive,
+            but CPU-bound bodies still share the GIL.
+        process: Run on a ProcessPoolExecutor for true parallelism. Tool
+            bodies and their arguments must be picklable.
+
+    At most max_concurrency calls run at once; further calls wait for a slot.
+    Each call is bounded by timeout seconds (None = no limit). A call that
+    times out or whose awaiting task is cancelled is cancelled in the pool if
+    it has not started yet; a body that is already running on a thread cannot
+    be interrupted and finishes in the background.
+
+    Inline and thread calls run in a copy of the caller's context (so
+    context variables such as the metrics call record carry over), wrapped
+    by instrument when one is set.
+    """
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        instrument: Optional[Callable[[Callable[..., Any]], Callable[..., Any]]] = None
+    ):
+        """
+        Args:
+            mode: One of EXECUTION_MODES
+            max_workers: Pool size (default: CPU count, at most 8)
+            max_concurrency: Max calls in flight (default: max_workers)
+            timeout: Per-call timeout in seconds (None or <= 0: no limit)
+            instrument: Wraps each tool body before an inline or thread call
+                (e.g. ServerMetrics.instrument); not applied in process mode,
+                where bodies must stay picklable
+        """
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode {mode!r}, expected one of {EXECUTION_MODES}")
+        self.mode = mode
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.max_concurrency = max_concurrency or self.max_workers
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.instrument = instrument
+        self._pool: Optional[concurrent.futures.Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls) -> "ToolExecutor":
+        """Build an executor from CCA_EXECUTOR, CCA_MAX_WORKERS, CCA_MAX_CONCURRENT_CALLS and CCA_TOOL_TIMEOUT."""
+        def optional_int(name: str) -> Optional[int]:
+            value = os.environ.get(name)
+            return int(value) if value else None
+
+        timeout = os.environ.get("CCA_TOOL_TIMEOUT")
+        return cls(
+            mode=os.environ.get("CCA_EXECUTOR", "thread"),
+            max_workers=optional_int("CCA_MAX_WORKERS"),
+            max_concurrency=optional_int("CCA_MAX_CONCURRENT_CALLS"),
+            timeout=float(timeout) if timeout else None
+        )
+
+    def _get_pool(self) -> concurrent.futures.Executor:
+        """Create the worker pool on first use."""
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="cca-tool"
+                )
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) according to the execution mode.
+
+        Raises:
+            TimeoutError: If the call exceeds the configured timeout
+            Whatever fn raises
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            if self.mode != "process":
+                if self.instrument is not None:
+                    fn = self.instrument(fn)
+                if self.mode == "inline":
+                    return fn(*args)
+                fn = functools.partial(contextvars.copy_context().run, fn)
+
+            future = asyncio.get_running_loop().run_in_executor(self._get_pool(), fn, *args)
+            try:
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Tool call exceeded the {self.timeout}s timeout") from None
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool, cancelling calls that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict[str, Any]:
+        """Current configuration."""
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+        }
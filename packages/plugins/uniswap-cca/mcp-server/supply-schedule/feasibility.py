@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Feasibility Index
+
+Precomputed feasibility of num_steps / round_to_nearest combinations for
+common auction lengths, so the server can reject parameters that cannot
+produce a valid schedule, and suggest ones that can, without generating
+anything. The index is built offline by build_feasibility_index.py and
+loaded by the server at startup; parameters it does not cover fall back to
+logic.check_feasibility.
+
+Like logic.py, this module has no external dependencies.
+"""
+
+import json
+import os
+from typing import Any, Iterable, Optional
+
+from logic import (
+    check_feasibility,
+    DEFAULT_ALPHA,
+    DEFAULT_CURVE,
+    DEFAULT_FINAL_BLOCK_PCT,
+    DEFAULT_ROUNDING_CANDIDATES,
+)
+
+# Bumped whenever the index layout or the generation algorithm changes
+INDEX_VERSION = 1
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "feasibility_index.json")
+
+# Auctions the index covers: durations in seconds on chains with these block times
+INDEX_DURATIONS = (3_600, 6 * 3_600, 12 * 3_600, 86_400, 2 * 86_400, 3 * 86_400, 7 * 86_400, 14 * 86_400)
+INDEX_BLOCK_TIMES = (12, 2, 1, 0.25)  # Ethereum, Base/OP, Unichain, Arbitrum
+INDEX_MAX_NUM_STEPS = 256
+
+# How far from the requested num_steps suggest_corrections looks when the index does not apply
+SUGGESTION_RADIUS = 64
+
+# Per-step statuses
+FEASIBLE = "feasible"  # Generates with every step at least one block long
+COLLAPSED = "collapsed"  # Generates, but rounding collapses some steps to zero length
+FAILS = "fails"  # generate_schedule raises
+
+
+def default_auction_lengths() -> list[int]:
+    """Auction lengths in blocks covered by the default index."""
+    return sorted({round(duration / block_time) for duration in INDEX_DURATIONS for block_time in INDEX_BLOCK_TIMES})
+
+
+def _to_ranges(values: Iterable[int]) -> list[list[int]]:
+    """Collapse sorted integers into inclusive [low, high] runs."""
+    ranges: list[list[int]] = []
+    for value in values:
+        if ranges and ranges[-1][1] == value - 1:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+    return ranges
+
+
+def _in_ranges(ranges: list[list[int]], value: int) -> bool:
+    return any(low <= value <= high for low, high in ranges)
+
+
+def _rounding_key(round_to_nearest: Optional[int]) -> str:
+    return "none" if round_to_nearest is None else str(round_to_nearest)
+
+
+class FeasibilityIndex:
+    """
+    Feasibility of num_steps 1..max_num_steps for (auction_blocks, round_to_nearest) pairs.
+
+    Covers the default final_block_pct, alpha and curve only (prebid_blocks
+    does not affect feasibility). Each pair stores the num_steps values that
+    are feasible and the ones that fail as inclusive [low, high] runs, which
+    keeps the stored index small; everything else is collapsed.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[dict[str, dict[str, list[list[int]]]]] = None,
+        max_num_steps: int = INDEX_MAX_NUM_STEPS,
+        final_block_pct: float = DEFAULT_FINAL_BLOCK_PCT,
+        alpha: float = DEFAULT_ALPHA
+    ):
+        """
+        Args:
+            entries: "auction_blocks:round_to_nearest" -> {"feasible": runs, "fails": runs}
+            max_num_steps: Largest num_steps covered
+            final_block_pct: final_block_pct the index was built for
+            alpha: alpha the index was built for
+        """
+        self.entries = entries or {}
+        self.max_num_steps = max_num_steps
+        self.final_block_pct = final_block_pct
+        self.alpha = alpha
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def build(
+        cls,
+        auction_lengths: Optional[Iterable[int]] = None,
+        roundings: Iterable[Optional[int]] = DEFAULT_ROUNDING_CANDIDATES,
+        max_num_steps: int = INDEX_MAX_NUM_STEPS
+    ) -> "FeasibilityIndex":
+        """Check every combination with logic.check_feasibility (slow; run offline)."""
+        entries = {}
+        for auction_blocks in auction_lengths or default_auction_lengths():
+            for rounding in roundings:
+                if rounding is not None and rounding >= auction_blocks:
+                    continue
+                feasible, fails = [], []
+                for num_steps in range(1, max_num_steps + 1):
+                    result = check_feasibility(auction_blocks, num_steps=num_steps, round_to_nearest=rounding)
+                    if result["feasible"]:
+                        feasible.append(num_steps)
+                    elif not result["generates"]:
+                        fails.append(num_steps)
+                entries[f"{auction_blocks}:{_rounding_key(rounding)}"] = {
+                    FEASIBLE: _to_ranges(feasible),
+                    FAILS: _to_ranges(fails),
+                }
+        return cls(entries, max_num_steps)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> "FeasibilityIndex":
+        """
+        Load an index written by save().
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is malformed or from another INDEX_VERSION
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Feasibility index version {data.get('version')} != {INDEX_VERSION}, rebuild it")
+        return cls(data["entries"], data["max_num_steps"], data["final_block_pct"], data["alpha"])
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form of the index."""
+        return {
+            "version": INDEX_VERSION,
+            "final_block_pct": self.final_block_pct,
+            "alpha": self.alpha,
+            "max_num_steps": self.max_num_steps,
+            "entries": self.entries,
+        }
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Write the index as compact JSON, one entry per line."""
+        data = self.to_dict()
+        entries = data.pop("entries")
+        header = json.dumps(data, separators=(",", ":"))[:-1]
+        lines = [
+            f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}"
+            for key, value in entries.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(header + ',"entries":{\n' + ",\n".join(lines) + "\n}}\n")
+
+    def _entry(self, params: dict[str, Any]) -> Optional[dict[str, list[list[int]]]]:
+        """Stored entry for generate_schedule keyword arguments, if the index covers them."""
+        if (
+            params.get("curve", DEFAULT_CURVE) != DEFAULT_CURVE
+            or params.get("curve_params")
+            or params.get("final_block_pct", DEFAULT_FINAL_BLOCK_PCT) != self.final_block_pct
+            or params.get("alpha", DEFAULT_ALPHA) != self.alpha
+        ):
+            return None
+        return self.entries.get(f"{params['auction_blocks']}:{_rounding_key(params.get('round_to_nearest'))}")
+
+    def status(self, params: dict[str, Any]) -> Optional[str]:
+        """FEASIBLE, COLLAPSED or FAILS for generate_schedule keyword arguments, None if not covered."""
+        entry = self._entry(params)
+        num_steps = params["num_steps"]
+        if entry is None or not 1 <= num_steps <= self.max_num_steps:
+            return None
+        if _in_ranges(entry[FEASIBLE], num_steps):
+            return FEASIBLE
+        if _in_ranges(entry[FAILS], num_steps):
+            return FAILS
+        return COLLAPSED
+
+    def feasible_num_steps(self, params: dict[str, Any]) -> Optional[list[list[int]]]:
+        """Feasible num_steps runs for the other keyword arguments, None if not covered."""
+        entry = self._entry(params)
+        return None if entry is None else entry[FEASIBLE]
+
+
+def check_parameters(index: FeasibilityIndex, params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Feasibility of generate_schedule keyword arguments, from the index when it covers them.
+
+    Returns:
+        check_feasibility's dict plus 'source' ("index" or "computed"). Index
+        answers report collapsed_steps as None (the count is not stored)
+        and a generic error message.
+    """
+    status = index.status(params)
+    if status is not None:
+        error = None
+        if status == FAILS:
+            error = (
+                f"num_steps={params['num_steps']} with round_to_nearest={params.get('round_to_nearest')} "
+                f"cannot produce a valid schedule for auction_blocks={params['auction_blocks']}"
+            )
+        return {
+            "feasible": status == FEASIBLE,
+            "generates": status != FAILS,
+            "collapsed_steps": 0 if status == FEASIBLE else None,
+            "error": error,
+            "source": "index",
+        }
+    return {**check_feasibility(**params), "source": "computed"}
+
+
+def suggest_corrections(
+    index: FeasibilityIndex,
+    params: dict[str, Any],
+    rounding_candidates: Iterable[Optional[int]] = DEFAULT_ROUNDING_CANDIDATES
+) -> list[dict[str, Any]]:
+    """
+    Nearby feasible alternatives for infeasible generate_schedule keyword arguments.
+
+    Suggests (when found) the nearest feasible num_steps with the requested
+    rounding, and the coarsest feasible round_to_nearest no coarser than the
+    request (or no rounding) for the requested num_steps. Each suggestion
+    holds only the changed parameter.
+    """
+    suggestions = []
+    num_steps = params["num_steps"]
+    rounding = params.get("round_to_nearest")
+
+    def feasible(changes: dict[str, Any]) -> bool:
+        return check_parameters(index, {**params, **changes})["feasible"]
+
+    # Nearest feasible num_steps, read from the index when it covers the pair
+    runs = index.feasible_num_steps(params)
+    if runs is not None:
+        candidates = [n for low, high in runs for n in (low, high)]
+        if candidates:
+            suggestions.append({"num_steps": min(candidates, key=lambda n: (abs(n - num_steps), n))})
+    else:
+        for distance in range(1, SUGGESTION_RADIUS + 1):
+            found = [n for n in (num_steps - distance, num_steps + distance) if n >= 1 and feasible({"num_steps": n})]
+            if found:
+                suggestions.append({"num_steps": found[0]})
+                break
+
+    # Coarsest feasible rounding up to the requested one
+    limit = rounding if rounding is not None else 0
+    roundings = sorted((r for r in rounding_candidates if r is not None and r < limit), reverse=True)
+    for candidate in [*roundings, None]:
+        if candidate != rounding and feasible({"round_to_nearest": candidate}):
+            suggestions.append({"round_to_nearest": candidate})
+            break
+
+    return suggestions
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Transport Load Generator
+
+Compares serving many short agent sessions from one warm server over
+Streamable HTTP against spawning a server per session over stdio. Each
+session connects, initializes, makes --calls tool calls and disconnects;
+--concurrency sessions run at a time until --sessions have completed.
+
+For each transport it reports sessions/sec, tool calls/sec, p50/p99
+session latency (connect to disconnect, including any spawn) and p50/p99
+tool call latency, then the HTTP speedup over stdio.
+
+Usage:
+    python loadgen.py                              # both transports, 16 sessions, 4 at a time
+    python loadgen.py --sessions 64 --concurrency 8 --calls 10
+    python loadgen.py --transport http             # HTTP only, against a server this script starts
+    python loadgen.py --transport http --url http://127.0.0.1:8000/mcp  # against a running server
+
+Requires the server requirements (mcp, which brings httpx, starlette and uvicorn).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Optional
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+
+# Tool calls cycled through by every session: typical agent requests, repeated across sessions
+CALLS = (
+    ("generate_supply_schedule", {"auction_blocks": 86400}),
+    ("generate_and_encode_supply_schedule", {"auction_blocks": 86400, "prebid_blocks": 1000}),
+    ("check_schedule_feasibility", {"auction_blocks": 50400, "round_to_nearest": 100}),
+    ("generate_supply_schedule", {"auction_blocks": 50400, "num_steps": 24, "response_format": "compact"}),
+)
+
+DEFAULT_SESSIONS = 16
+DEFAULT_CONCURRENCY = 4
+DEFAULT_CALLS = 4
+
+# Seconds to wait for a started HTTP server to accept requests
+STARTUP_TIMEOUT = 30.0
+
+
+def _percentile(values: list[float], quantile: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+
+async def _session(connect: Callable[[], Any], num_calls: int, call_latencies: list[float]) -> None:
+    """One agent session: connect, initialize, make num_calls tool calls, disconnect."""
+    from mcp import ClientSession
+
+    async with connect() as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            for i in range(num_calls):
+                name, arguments = CALLS[i % len(CALLS)]
+                start = time.perf_counter()
+                result = await session.call_tool(name, arguments)
+                call_latencies.append(time.perf_counter() - start)
+                if result.isError:
+                    raise RuntimeError(f"{name} failed: {result.content[0].text}")
+
+
+async def run_load(connect: Callable[[], Any], sessions: int, concurrency: int, calls: int) -> dict[str, Any]:
+    """Run sessions sessions, concurrency at a time, and summarize their timings."""
+    session_latencies: list[float] = []
+    call_latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await _session(connect, calls, call_latencies)
+            session_latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "sessions": sessions,
+        "calls": len(call_latencies),
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_sec": round(sessions / elapsed, 2),
+        "calls_per_sec": round(len(call_latencies) / elapsed, 2),
+        "session_p50_ms": round(_percentile(session_latencies, 0.5) * 1000, 1),
+        "session_p99_ms": round(_percentile(session_latencies, 0.99) * 1000, 1),
+        "call_p50_ms": round(statistics.median(call_latencies) * 1000, 2) if call_latencies else None,
+        "call_p99_ms": round(_percentile(call_latencies, 0.99) * 1000, 2) if call_latencies else None,
+    }
+
+
+def _stdio_connect() -> Callable[[], Any]:
+    """Connector that spawns a fresh server process per session."""
+    from mcp import StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[SERVER_PATH],
+        env={**os.environ, "PYTHONUNBUFFERED": "1"}
+    )
+    return lambda: stdio_client(params, errlog=subprocess.DEVNULL)
+
+
+def _http_connect(url: str) -> Callable[[], Any]:
+    """Connector that opens a new HTTP session against one server."""
+    from mcp.client.streamable_http import streamablehttp_client
+
+    return lambda: streamablehttp_client(url)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_healthy(base_url: str, process: subprocess.Popen) -> None:
+    """Poll /health until the server answers."""
+    import httpx
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"HTTP server exited with code {process.returncode}")
+            try:
+                if (await client.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"HTTP server did not start within {STARTUP_TIMEOUT}s")
+
+
+async def run_http(url: Optional[str], sessions: int, concurrency: int, calls: int) -> dict[str, Any]:
+    """Load an HTTP server at url, or one started (and stopped) here."""
+    if url is not None:
+        return await run_load(_http_connect(url), sessions, concurrency, calls)
+
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, SERVER_PATH, "--transport", "http", "--port", str(port)],
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        await _wait_healthy(f"http://127.0.0.1:{port}", process)
+        return await run_load(_http_connect(f"http://127.0.0.1:{port}/mcp"), sessions, concurrency, calls)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _print_row(name: str, result: dict[str, Any]) -> None:
+    print(
+        f"{name:<8} {result['sessions_per_sec']:>12} {result['calls_per_sec']:>10} "
+        f"{result['session_p50_ms']:>14} {result['session_p99_ms']:>14} "
+        f"{result['call_p50_ms']:>12} {result['call_p99_ms']:>12}"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    print(f"{args.sessions} sessions x {args.calls} calls, {args.concurrency} concurrent\n")
+    print(
+        f"{'':<8} {'sessions/s':>12} {'calls/s':>10} {'session p50ms':>14} "
+        f"{'session p99ms':>14} {'call p50ms':>12} {'call p99ms':>12}"
+    )
+
+    results = {}
+    if args.transport in ("stdio", "both"):
+        results["stdio"] = await run_load(_stdio_connect(), args.sessions, args.concurrency, args.calls)
+        _print_row("stdio", results["stdio"])
+    if args.transport in ("http", "both"):
+        results["http"] = await run_http(args.url, args.sessions, args.concurrency, args.calls)
+        _print_row("http", results["http"])
+
+    if len(results) == 2:
+        speedup = results["http"]["calls_per_sec"] / results["stdio"]["calls_per_sec"]
+        print(f"\nHTTP throughput: {speedup:.1f}x stdio spawn-per-session")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the load and print the comparison. Returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=("stdio", "http", "both"), default="both",
+                        help="Transport(s) to load (default: both)")
+    parser.add_argument("--url", help="MCP endpoint of a running HTTP server (default: start one)")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+                        help=f"Sessions to run (default: {DEFAULT_SESSIONS})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Sessions running at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS,
+                        help=f"Tool calls per session (default: {DEFAULT_CALLS})")
+    args = parser.parse_args(argv)
+    if args.sessions < 1 or args.concurrency < 1 or args.calls < 0:
+        parser.error("--sessions and --concurrency must be positive and --calls non-negative")
+
+    asyncio.run(_main(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,94 +9,794 @@ This module has no external dependencies (no mcp, no pydantic) so it can be
 tested without installing the MCP server requirements.
 """
 
-from typing import Optional
+import bisect
+import functools
+import itertools
+import math
+import mmap
+import operator
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Union
 
 # Target total supply in mps units
 TOTAL_TARGET = 10_000_000  # 1e7
 
+# Version of the schedule generation and compaction algorithms; bump whenever the same
+# parameters would produce a different schedule, so persisted schedules are not reused
+ALGORITHM_VERSION = 1
+
 # Default configuration (from Notion doc)
 DEFAULT_NUM_STEPS = 12  # Number of steps for gradual release
 DEFAULT_FINAL_BLOCK_PCT = 0.30  # ~30% reserved for final block
 DEFAULT_ALPHA = 1.2  # Convexity exponent for normalized curve C(t) = t^alpha
+DEFAULT_CURVE = "power"  # Release curve family (see CURVES)
 
+# Bit layout per encoded uint64 (matching Solidity's parse function):
+#   [  24 bits: mps  |  40 bits: blockDelta  ] = 64 bits total
+# Solidity unpacks via: mps = uint24(bytes3(data)), blockDelta = uint40(uint64(data))
+MPS_BITS = 24
+BLOCK_DELTA_BITS = 40
+MPS_MAX = 2**MPS_BITS - 1          # 16,777,215
+BLOCK_DELTA_MAX = 2**BLOCK_DELTA_BITS - 1  # 1,099,511,627,775
+ENCODED_ELEMENT_BYTES = 8
 
-def generate_schedule(
-    auction_blocks: int,
-    prebid_blocks: int = 0,
-    num_steps: int = DEFAULT_NUM_STEPS,
-    final_block_pct: float = DEFAULT_FINAL_BLOCK_PCT,
-    alpha: float = DEFAULT_ALPHA,
-    round_to_nearest: Optional[int] = None
-) -> list[dict[str, int]]:
+# Inverse lookup table resolution for sampled curves, and how many tables are kept
+SAMPLED_CURVE_TABLE_SIZE = 256
+SAMPLED_CURVE_CACHE_SIZE = 32
+
+# Entries packed per write by write_supply_schedule
+DEFAULT_STREAM_CHUNK = 4096
+
+# Blocks expanded per write by export_dense_emission
+DEFAULT_DENSE_CHUNK = 65_536
+
+# Calldata gas per byte (EIP-2028)
+CALLDATA_ZERO_BYTE_GAS = 4
+CALLDATA_NONZERO_BYTE_GAS = 16
+
+# round_to_nearest values tried by optimize_calldata_gas
+DEFAULT_ROUNDING_CANDIDATES = (None, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Granularity of the alpha values tried by solve_schedule
+SOLVER_ALPHA_STEP = 0.001
+
+
+# Native array typecode for uint32 ('I' is 4 bytes on all mainstream platforms)
+_UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+
+
+class SupplySchedule:
     """
-    Generate supply schedule using normalized convex curve.
+    Supply schedule stored as two parallel typed arrays.
 
-    Algorithm:
-        1. Reserve final_block_pct (default 30%) for final block
-        2. Distribute remaining supply equally across num_steps (default 12)
-        3. Each step releases EQUAL token amounts
-        4. Time boundaries calculated from normalized curve C(t) = t^alpha
-        5. Block durations DECREASE over time (convex curve property)
-        6. Optional rounding of block boundaries to round numbers
+    mps is held as uint32 and blockDelta as uint64 in contiguous memory
+    instead of one dict per step. The schedule is immutable once built, so
+    the totals and prefix sums used by summaries, validation and queries are
+    computed once and cached.
 
-    The key insight: equal token amounts + convex supply curve = decreasing time intervals.
+    For compatibility with the {mps, blockDelta} dict form, it behaves as a
+    read-only sequence of dicts: indexing and iteration yield
+    {"mps": ..., "blockDelta": ...}, and it compares equal to a list of
+    dicts with the same entries.
+    """
 
-    Args:
-        auction_blocks: Total number of blocks for the auction
-        prebid_blocks: Number of blocks for prebid period (0 mps)
-        num_steps: Number of steps for gradual release (default: 12)
-        final_block_pct: Percentage of supply for final block (default: 0.30)
-        alpha: Convexity exponent for curve C(t) = t^alpha (default: 1.2)
-        round_to_nearest: Round block boundaries to nearest N blocks (optional)
+    __slots__ = ("_mps", "_block_delta", "_total_mps", "_cumulative_blocks", "_cumulative_mps")
 
-    Returns:
-        List of dicts with 'mps' and 'blockDelta' keys
+    def __init__(self, mps: Iterable[int] = (), block_delta: Iterable[int] = ()):
+        try:
+            self._mps = array(_UINT32, mps)
+            self._block_delta = array('Q', block_delta)
+        except (OverflowError, TypeError) as e:
+            raise ValueError(
+                f"Schedule values must be non-negative integers (mps uint32, blockDelta uint64): {e}"
+            ) from e
+        if len(self._mps) != len(self._block_delta):
+            raise ValueError(
+                f"mps has {len(self._mps)} entries but blockDelta has {len(self._block_delta)}"
+            )
+        self._total_mps: Optional[int] = None
+        self._cumulative_blocks: Optional[array] = None
+        self._cumulative_mps: Optional[array] = None
+
+    @classmethod
+    def from_dicts(cls, schedule: Iterable[dict[str, int]]) -> "SupplySchedule":
+        """Build from a sequence of {mps, blockDelta} dicts (returned as-is if already a SupplySchedule)."""
+        if isinstance(schedule, SupplySchedule):
+            return schedule
+        if not isinstance(schedule, (list, tuple)):
+            schedule = list(schedule)
+        try:
+            return cls(
+                [item['mps'] for item in schedule],
+                [item['blockDelta'] for item in schedule]
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Schedule entries must be objects with 'mps' and 'blockDelta': {e!r}") from e
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[int, int]]) -> "SupplySchedule":
+        """Build from an iterable of (mps, blockDelta) tuples."""
+        schedule = cls()
+        try:
+            for mps, block_delta in pairs:
+                schedule._mps.append(mps)
+                schedule._block_delta.append(block_delta)
+        except (OverflowError, TypeError) as e:
+            raise ValueError(
+                f"Schedule values must be non-negative integers (mps uint32, blockDelta uint64): {e}"
+            ) from e
+        return schedule
+
+    def to_dicts(self) -> list[dict[str, int]]:
+        """Convert to a list of {mps, blockDelta} dicts."""
+        return [{"mps": m, "blockDelta": d} for m, d in zip(self._mps, self._block_delta)]
+
+    @property
+    def mps(self) -> memoryview:
+        """Read-only view of the mps column."""
+        return memoryview(self._mps).toreadonly()
+
+    @property
+    def block_delta(self) -> memoryview:
+        """Read-only view of the blockDelta column."""
+        return memoryview(self._block_delta).toreadonly()
+
+    @property
+    def total_mps(self) -> int:
+        """Total supply released, sum(mps * blockDelta)."""
+        if self._total_mps is None:
+            self._total_mps = sum(map(operator.mul, self._mps, self._block_delta))
+        return self._total_mps
+
+    @property
+    def total_blocks(self) -> int:
+        """Total number of blocks covered, sum(blockDelta)."""
+        return self.cumulative_blocks[-1]
+
+    @property
+    def final_block_mps(self) -> int:
+        """mps of the last entry (the final block)."""
+        return self._mps[-1]
+
+    @property
+    def cumulative_blocks(self) -> array:
+        """Block offset at the start of each entry, plus the total (len + 1 entries)."""
+        if self._cumulative_blocks is None:
+            self._cumulative_blocks = array('Q', itertools.accumulate(self._block_delta, initial=0))
+        return self._cumulative_blocks
+
+    @property
+    def cumulative_mps(self) -> array:
+        """Supply released before each entry, plus the total (len + 1 entries)."""
+        if self._cumulative_mps is None:
+            self._cumulative_mps = array(
+                'Q', itertools.accumulate(map(operator.mul, self._mps, self._block_delta), initial=0)
+            )
+            self._total_mps = self._cumulative_mps[-1]
+        return self._cumulative_mps
+
+    def step_at(self, block: int) -> Optional[int]:
+        """
+        Index of the entry active at a block, in O(log n).
+
+        Args:
+            block: Block offset from the start of the schedule (0 = first block)
+
+        Returns:
+            Entry index, or None if the block is outside the schedule
+        """
+        if block < 0 or block >= self.total_blocks:
+            return None
+        return bisect.bisect_right(self.cumulative_blocks, block) - 1
+
+    def released_before(self, block: int) -> int:
+        """
+        Supply released before a block starts (during the first `block` blocks), in O(log n).
+
+        Args:
+            block: Block offset from the start of the schedule; offsets past
+                the end return the total
+        """
+        cumulative_blocks = self.cumulative_blocks
+        if block <= 0:
+            return 0
+        if block >= cumulative_blocks[-1]:
+            return self.cumulative_mps[-1]
+        index = bisect.bisect_right(cumulative_blocks, block) - 1
+        return self.cumulative_mps[index] + self._mps[index] * (block - cumulative_blocks[index])
+
+    def query_blocks(self, blocks: Iterable[int]) -> dict[str, list]:
+        """
+        Answer many block queries at once.
+
+        Each query is a bisect over the cached prefix sums, so q queries take
+        O(q log n) after the index is built once.
+
+        Args:
+            blocks: Block offsets from the start of the schedule
+
+        Returns:
+            Columnar dict with, per query, 'block', 'step' (active entry index
+            or None outside the schedule), 'mps' (supply released in that
+            block, 0 outside) and 'released' (supply released up to and
+            including that block)
+        """
+        cumulative_blocks = self.cumulative_blocks
+        cumulative_mps = self.cumulative_mps
+        mps_column = self._mps
+        total_blocks = cumulative_blocks[-1]
+        total_mps = cumulative_mps[-1]
+        locate = bisect.bisect_right
+
+        result: dict[str, list] = {"block": [], "step": [], "mps": [], "released": []}
+        for block in blocks:
+            result["block"].append(block)
+            if block < 0:
+                result["step"].append(None)
+                result["mps"].append(0)
+                result["released"].append(0)
+            elif block >= total_blocks:
+                result["step"].append(None)
+                result["mps"].append(0)
+                result["released"].append(total_mps)
+            else:
+                index = locate(cumulative_blocks, block) - 1
+                mps = mps_column[index]
+                result["step"].append(index)
+                result["mps"].append(mps)
+                result["released"].append(cumulative_mps[index] + mps * (block + 1 - cumulative_blocks[index]))
+        return result
+
+    def __len__(self) -> int:
+        return len(self._mps)
+
+    def __iter__(self) -> Iterator[dict[str, int]]:
+        for m, d in zip(self._mps, self._block_delta):
+            yield {"mps": m, "blockDelta": d}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SupplySchedule(self._mps[index], self._block_delta[index])
+        return {"mps": self._mps[index], "blockDelta": self._block_delta[index]}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SupplySchedule):
+            return self._mps == other._mps and self._block_delta == other._block_delta
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self._mps.tobytes(), self._block_delta.tobytes()))
+
+    def __repr__(self) -> str:
+        return f"SupplySchedule({self.to_dicts()!r})"
+
+
+class Curve:
     """
-    schedule = []
+    Normalized cumulative release curve C: [0, 1] -> [0, 1], non-decreasing,
+    with C(0) = 0 and C(1) = 1.
 
-    # Add prebid period if specified
-    if prebid_blocks > 0:
-        schedule.append({"mps": 0, "blockDelta": prebid_blocks})
+    Step boundaries come from the inverse: the normalized time by which a
+    fraction s of the main supply has been released. Curves with a closed-form
+    inverse provide it as a function mapping an iterable of fractions to an
+    iterable of times, applied to all step fractions in one pass. Otherwise
+    the inverse is solved numerically from cdf (see numeric_inverse).
+
+    Parameters are passed as keyword arguments to cdf, inverse and validate;
+    defaults lists every accepted parameter with its default value.
+    """
+
+    __slots__ = ("name", "cdf", "_inverse", "defaults", "validate", "description")
+
+    def __init__(
+        self,
+        name: str,
+        cdf: Callable[..., float],
+        inverse: Optional[Callable[..., Iterable[float]]] = None,
+        defaults: Optional[dict[str, Any]] = None,
+        validate: Optional[Callable[..., None]] = None,
+        description: str = ""
+    ):
+        """
+        Args:
+            name: Registry name
+            cdf: C(t, **params) for a single t in [0, 1]
+            inverse: Closed-form inverse, (fractions, **params) -> times (optional)
+            defaults: Accepted parameters and their default values
+            validate: Raises ValueError for invalid parameters (optional)
+            description: One-line description for tool listings
+        """
+        self.name = name
+        self.cdf = cdf
+        self._inverse = inverse
+        self.defaults = dict(defaults or {})
+        self.validate = validate
+        self.description = description
+
+    def resolve_params(self, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """Merge params over the defaults and validate them."""
+        params = params or {}
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise ValueError(
+                f"Unknown parameter(s) {sorted(unknown)} for curve '{self.name}', "
+                f"expected {sorted(self.defaults)}"
+            )
+        resolved = {**self.defaults, **params}
+        if self.validate is not None:
+            self.validate(**resolved)
+        return resolved
+
+    def inverse(self, fractions: Iterable[float], **params: Any) -> Iterable[float]:
+        """Normalized times at which each (ascending) fraction of supply is released."""
+        if self._inverse is not None:
+            return self._inverse(fractions, **params)
+        return numeric_inverse(lambda t: self.cdf(t, **params), fractions)
+
+    def __repr__(self) -> str:
+        return f"Curve({self.name!r}, defaults={self.defaults!r})"
+
+
+def numeric_inverse(
+    cdf: Callable[[float], float],
+    fractions: Iterable[float],
+    tolerance: float = 1e-12,
+    max_iterations: int = 100
+) -> Iterator[float]:
+    """
+    Invert a non-decreasing cdf on [0, 1] numerically, for ascending fractions.
+
+    Each solve is bracketed between the previous solution and 1 and refined
+    with the Illinois variant of regula falsi, which converges superlinearly
+    on smooth curves while keeping the bracket of bisection.
+    """
+    lo = 0.0
+    for s in fractions:
+        if s <= 0.0:
+            yield 0.0
+            continue
+        if s >= 1.0:
+            yield 1.0
+            continue
+        lo = _solve_bracketed(cdf, s, lo, 1.0, tolerance, max_iterations)
+        yield lo
+
+
+def _solve_bracketed(
+    cdf: Callable[[float], float],
+    s: float,
+    a: float,
+    b: float,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100
+) -> float:
+    """Solve cdf(t) = s for t in [a, b] with the Illinois method."""
+    fa, fb = cdf(a) - s, cdf(b) - s
+    side = 0
+    t = a
+    for _ in range(max_iterations):
+        if fb == fa:
+            t = (a + b) / 2
+        else:
+            t = (a * fb - b * fa) / (fb - fa)
+        ft = cdf(t) - s
+        if abs(ft) <= tolerance or b - a <= tolerance:
+            break
+        if (ft > 0) == (fb > 0):
+            b, fb = t, ft
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = t, ft
+            if side == 1:
+                fb /= 2
+            side = 1
+    return t
+
+
+def _validate_power(alpha: float) -> None:
+    if not alpha > 0:
+        raise ValueError(f"Power curve needs alpha > 0, got {alpha}")
+
+
+def _power_inverse(fractions: Iterable[float], alpha: float) -> Iterable[float]:
+    # Inverse of C(t) = t^alpha gives the normalized time boundary
+    exponent = 1.0 / alpha
+    return (s ** exponent for s in fractions)
+
+
+def _validate_exponential(k: float) -> None:
+    if k == 0:
+        raise ValueError("Exponential curve needs a nonzero rate k (use the power curve with alpha=1 for linear)")
+
+
+def _exponential_cdf(t: float, k: float) -> float:
+    return math.expm1(k * t) / math.expm1(k)
+
+
+def _exponential_inverse(fractions: Iterable[float], k: float) -> Iterable[float]:
+    scale = math.expm1(k)
+    return (math.log1p(s * scale) / k for s in fractions)
+
+
+def _validate_logistic(k: float, midpoint: float) -> None:
+    if not k > 0:
+        raise ValueError(f"Logistic curve needs steepness k > 0, got {k}")
+    if not 0.0 <= midpoint <= 1.0:
+        raise ValueError(f"Logistic curve needs 0 <= midpoint <= 1, got {midpoint}")
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+def _logistic_cdf(t: float, k: float, midpoint: float) -> float:
+    low, high = _sigmoid(-k * midpoint), _sigmoid(k * (1.0 - midpoint))
+    return (_sigmoid(k * (t - midpoint)) - low) / (high - low)
+
+
+def _logistic_inverse(fractions: Iterable[float], k: float, midpoint: float) -> Iterable[float]:
+    low, high = _sigmoid(-k * midpoint), _sigmoid(k * (1.0 - midpoint))
+    span = high - low
+    for s in fractions:
+        y = min(max(low + s * span, low), high)
+        yield midpoint + math.log(y / (1.0 - y)) / k
+
+
+def _validate_concave(beta: float) -> None:
+    if not beta > 0:
+        raise ValueError(f"Concave curve needs beta > 0, got {beta}")
+
+
+def _concave_cdf(t: float, beta: float) -> float:
+    return 1.0 - (1.0 - t) ** beta
+
+
+def _concave_inverse(fractions: Iterable[float], beta: float) -> Iterable[float]:
+    exponent = 1.0 / beta
+    return (1.0 - max(0.0, 1.0 - s) ** exponent for s in fractions)
+
+
+def _validate_piecewise_linear(points: Sequence[Sequence[float]]) -> None:
+    try:
+        ts = [float(t) for t, _ in points]
+        cs = [float(c) for _, c in points]
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Piecewise-linear curve needs points as [t, C(t)] pairs: {e}") from e
+    if len(points) < 2 or (ts[0], cs[0]) != (0.0, 0.0) or (ts[-1], cs[-1]) != (1.0, 1.0):
+        raise ValueError("Piecewise-linear curve points must start at [0, 0] and end at [1, 1]")
+    if any(a >= b for a, b in zip(ts, ts[1:])):
+        raise ValueError("Piecewise-linear curve times must be strictly increasing")
+    if any(a > b for a, b in zip(cs, cs[1:])):
+        raise ValueError("Piecewise-linear curve values must be non-decreasing")
+
+
+def _piecewise_linear_cdf(t: float, points: Sequence[Sequence[float]]) -> float:
+    ts = [p[0] for p in points]
+    j = min(max(bisect.bisect_right(ts, t), 1), len(points) - 1)
+    (t0, c0), (t1, c1) = points[j - 1], points[j]
+    return c0 + (t - t0) / (t1 - t0) * (c1 - c0)
+
+
+def _piecewise_linear_inverse(fractions: Iterable[float], points: Sequence[Sequence[float]]) -> Iterable[float]:
+    cs = [p[1] for p in points]
+    last = len(points) - 1
+    for s in fractions:
+        # First knot with C >= s; the segment before it has C rising through s
+        j = min(max(bisect.bisect_left(cs, s), 1), last)
+        (t0, c0), (t1, c1) = points[j - 1], points[j]
+        yield t0 + (s - c0) / (c1 - c0) * (t1 - t0)
+
+
+class _MonotoneCubic:
+    """
+    Monotone piecewise-cubic Hermite interpolant (PCHIP) through (x, y) knots.
+
+    Slopes follow Fritsch-Carlson: the weighted harmonic mean of the adjacent
+    secants at interior knots, zero at local extrema, and a shape-preserving
+    three-point estimate at the ends. The interpolant never overshoots the
+    data, so non-decreasing samples give a non-decreasing curve.
+    """
+
+    __slots__ = ("xs", "ys", "slopes")
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float]):
+        self.xs = list(xs)
+        self.ys = list(ys)
+        h = [b - a for a, b in zip(self.xs, self.xs[1:])]
+        delta = [(y1 - y0) / dx for y0, y1, dx in zip(self.ys, self.ys[1:], h)]
+        n = len(self.xs)
+
+        if n == 2:
+            self.slopes = [delta[0], delta[0]]
+            return
+
+        slopes = [0.0] * n
+        for k in range(1, n - 1):
+            if delta[k - 1] * delta[k] > 0:
+                w1, w2 = 2 * h[k] + h[k - 1], h[k] + 2 * h[k - 1]
+                slopes[k] = (w1 + w2) / (w1 / delta[k - 1] + w2 / delta[k])
+        slopes[0] = self._end_slope(h[0], h[1], delta[0], delta[1])
+        slopes[-1] = self._end_slope(h[-1], h[-2], delta[-1], delta[-2])
+        self.slopes = slopes
+
+    @staticmethod
+    def _end_slope(h0: float, h1: float, delta0: float, delta1: float) -> float:
+        slope = ((2 * h0 + h1) * delta0 - h0 * delta1) / (h0 + h1)
+        if slope * delta0 <= 0:
+            return 0.0
+        if delta0 * delta1 <= 0 and abs(slope) > abs(3 * delta0):
+            return 3 * delta0
+        return slope
+
+    def __call__(self, x: float) -> float:
+        xs = self.xs
+        k = min(max(bisect.bisect_right(xs, x) - 1, 0), len(xs) - 2)
+        h = xs[k + 1] - xs[k]
+        u = (x - xs[k]) / h
+        u2, u3 = u * u, u * u * u
+        return ((2 * u3 - 3 * u2 + 1) * self.ys[k] + (u3 - 2 * u2 + u) * h * self.slopes[k]
+                + (3 * u2 - 2 * u3) * self.ys[k + 1] + (u3 - u2) * h * self.slopes[k + 1])
+
+
+def _points_key(points: Sequence[Sequence[float]]) -> tuple[tuple[float, float], ...]:
+    """Hashable form of [t, C(t)] points, for caching."""
+    return tuple((float(t), float(c)) for t, c in points)
+
+
+def _validate_sampled(points: Sequence[Sequence[float]]) -> None:
+    try:
+        key = _points_key(points)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Sampled curve needs points as [t, cumulative fraction] pairs: {e}") from e
+    if len(key) < 2:
+        raise ValueError(f"Sampled curve needs at least 2 points, got {len(key)}")
+    if not all(math.isfinite(v) for pair in key for v in pair):
+        raise ValueError("Sampled curve points must be finite")
+    if any(a[0] >= b[0] for a, b in zip(key, key[1:])):
+        raise ValueError("Sampled curve times must be strictly increasing")
+    if any(a[1] > b[1] for a, b in zip(key, key[1:])):
+        raise ValueError("Sampled curve cumulative fractions must be non-decreasing")
+    if key[-1][1] == key[0][1]:
+        raise ValueError("Sampled curve must release supply (last fraction equals the first)")
+
+
+@functools.lru_cache(maxsize=SAMPLED_CURVE_CACHE_SIZE)
+def _sampled_table(points: tuple[tuple[float, float], ...]) -> tuple[_MonotoneCubic, list[float]]:
+    """
+    Fit a sampled curve and tabulate its inverse.
+
+    The samples are rescaled so the first point maps to (0, 0) and the last to
+    (1, 1), so times and fractions can be given in any unit (days, tokens).
+    Returns the monotone interpolant C and the times t_i = C^{-1}(i / size)
+    for i = 0..SAMPLED_CURVE_TABLE_SIZE. Cached by points, so repeated calls
+    with the same curve reuse the fit and the table.
+    """
+    (t0, c0), (tn, cn) = points[0], points[-1]
+    cdf = _MonotoneCubic(
+        [(t - t0) / (tn - t0) for t, _ in points],
+        [(c - c0) / (cn - c0) for _, c in points]
+    )
+    size = SAMPLED_CURVE_TABLE_SIZE
+    times = list(numeric_inverse(cdf, (i / size for i in range(size + 1))))
+    return cdf, times
+
+
+def _sampled_cdf(t: float, points: Sequence[Sequence[float]]) -> float:
+    cdf, _ = _sampled_table(_points_key(points))
+    return cdf(t)
+
+
+def _sampled_inverse(fractions: Iterable[float], points: Sequence[Sequence[float]]) -> Iterable[float]:
+    cdf, times = _sampled_table(_points_key(points))
+    size = SAMPLED_CURVE_TABLE_SIZE
+    for s in fractions:
+        if s <= 0.0:
+            yield 0.0
+        elif s >= 1.0:
+            yield 1.0
+        else:
+            # The table brackets the solution; refine it on the interpolant
+            i = min(int(s * size), size - 1)
+            yield _solve_bracketed(cdf, s, times[i], times[i + 1])
+
+
+# Registered release curves, by name
+CURVES: dict[str, Curve] = {}
+
+
+def register_curve(curve: Curve) -> Curve:
+    """Add a curve to the registry (replacing any curve with the same name)."""
+    CURVES[curve.name] = curve
+    return curve
+
+
+def get_curve(curve: Union[str, Curve]) -> Curve:
+    """Look up a registered curve by name (Curve instances are returned as-is)."""
+    if isinstance(curve, Curve):
+        return curve
+    try:
+        return CURVES[curve]
+    except KeyError:
+        raise ValueError(f"Unknown curve '{curve}', expected one of {sorted(CURVES)}") from None
+
+
+_POWER_CURVE = register_curve(Curve(
+    "power",
+    cdf=lambda t, alpha: t ** alpha,
+    inverse=_power_inverse,
+    defaults={"alpha": DEFAULT_ALPHA},
+    validate=_validate_power,
+    description="C(t) = t^alpha; convex (back-loaded) for alpha > 1, linear for alpha = 1"
+))
+register_curve(Curve(
+    "exponential",
+    cdf=_exponential_cdf,
+    inverse=_exponential_inverse,
+    defaults={"k": 3.0},
+    validate=_validate_exponential,
+    description="C(t) = (e^(k t) - 1) / (e^k - 1); back-loaded for k > 0, front-loaded for k < 0"
+))
+register_curve(Curve(
+    "logistic",
+    cdf=_logistic_cdf,
+    inverse=_logistic_inverse,
+    defaults={"k": 10.0, "midpoint": 0.5},
+    validate=_validate_logistic,
+    description="S-curve rescaled to [0, 1]: slow start, fastest release at midpoint, slow finish"
+))
+register_curve(Curve(
+    "piecewise_linear",
+    cdf=_piecewise_linear_cdf,
+    inverse=_piecewise_linear_inverse,
+    defaults={"points": [[0.0, 0.0], [0.5, 0.25], [1.0, 1.0]]},
+    validate=_validate_piecewise_linear,
+    description="Linear interpolation between [t, C(t)] points from [0, 0] to [1, 1]"
+))
+register_curve(Curve(
+    "sampled",
+    cdf=_sampled_cdf,
+    inverse=_sampled_inverse,
+    defaults={"points": [[0.0, 0.0], [0.25, 0.1], [0.5, 0.3], [0.75, 0.6], [1.0, 1.0]]},
+    validate=_validate_sampled,
+    description="Monotone cubic (PCHIP) through sampled [t, cumulative fraction] points, in any units"
+))
+register_curve(Curve(
+    "concave",
+    cdf=_concave_cdf,
+    inverse=_concave_inverse,
+    defaults={"beta": 2.0},
+    validate=_validate_concave,
+    description="C(t) = 1 - (1 - t)^beta; front-loaded for beta > 1"
+))
+
+
+def _resolve_curve(
+    curve: Union[str, Curve],
+    alpha: float,
+    curve_params: Optional[dict[str, Any]]
+) -> tuple[Curve, dict[str, Any]]:
+    """Look up a curve and validate its parameters; curves with an alpha parameter take it from alpha."""
+    curve = get_curve(curve)
+    if "alpha" in curve.defaults:
+        curve_params = {"alpha": alpha, **(curve_params or {})}
+    return curve, curve.resolve_params(curve_params)
+
+
+def _iter_time_boundaries(
+    num_steps: int,
+    final_block_pct: float,
+    alpha: float,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None
+) -> Iterator[float]:
+    """Normalized time boundaries t_0..t_num_steps from the release curve, lazily."""
+    if not curve_params and CURVES.get(curve, curve) is _POWER_CURVE:
+        # Default power curve: invert inline, without the registry and generator layers
+        _validate_power(alpha)
+        inverse = None
+    else:
+        curve, params = _resolve_curve(curve, alpha, curve_params)
+        inverse = curve.inverse
 
     # Calculate token amount per step (equal distribution)
     main_supply_pct = 1.0 - final_block_pct  # e.g., 0.70 for 30% final block
     step_tokens_pct = main_supply_pct / num_steps  # e.g., 0.70 / 12 = 0.058333...
 
-    # Calculate time boundaries from normalized convex curve C(t) = t^alpha.
+    # Calculate time boundaries from the normalized curve, by default C(t) = t^alpha.
     # We want equal token amounts per step, so cumulative supply at step i = i/num_steps.
-    # Since C(t) = t^alpha maps [0,1] -> [0,1], its inverse t = C^{-1}(s) = s^{1/alpha}
+    # Since C(t) maps [0,1] -> [0,1], its inverse t = C^{-1}(s) (s^{1/alpha} for the power curve)
     # gives the time at which cumulative fraction s of main supply is released.
-    # Because alpha > 1, the curve is convex: early steps span longer durations
+    # For a convex curve (alpha > 1): early steps span longer durations
     # (lower MPS) and later steps span shorter durations (higher MPS).
-    time_boundaries = [0.0]  # t_0 = 0
-    for i in range(1, num_steps + 1):
-        # Cumulative fraction of main supply at step i (normalized to [0,1])
-        cum_pct = i * step_tokens_pct / main_supply_pct
-        # Inverse of C(t) = t^alpha gives the normalized time boundary
-        t_i = cum_pct ** (1.0 / alpha)
-        time_boundaries.append(t_i)
+    yield 0.0  # t_0 = 0
+    if inverse is None:
+        exponent = 1.0 / alpha
+        for i in range(1, num_steps + 1):
+            # Cumulative fraction of main supply at step i (normalized to [0,1])
+            cum_pct = i * step_tokens_pct / main_supply_pct
+            yield cum_pct ** exponent
+        return
+
+    # Cumulative fraction of main supply at step i (normalized to [0,1])
+    cum_pcts = (i * step_tokens_pct / main_supply_pct for i in range(1, num_steps + 1))
+    yield from inverse(cum_pcts, **params)
+
 
+def _time_boundaries(
+    num_steps: int,
+    final_block_pct: float,
+    alpha: float,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None
+) -> list[float]:
+    """Normalized time boundaries t_0..t_num_steps from the release curve."""
+    return list(_iter_time_boundaries(num_steps, final_block_pct, alpha, curve, curve_params))
+
+
+def _iter_block_boundaries(
+    time_boundaries: Iterable[float],
+    auction_blocks: int,
+    round_to_nearest: Optional[int]
+) -> Iterator[int]:
+    """Convert normalized time boundaries to (optionally rounded) block numbers, lazily."""
     # Convert normalized times [0,1] to block numbers [0, auction_blocks]
-    block_boundaries = [round(t * auction_blocks) for t in time_boundaries]
-
-    # Optional rounding to nearest N blocks (Step 2 in Notion doc)
-    if round_to_nearest is not None and round_to_nearest > 0:
-        block_boundaries = [
-            round(b / round_to_nearest) * round_to_nearest
-            for b in block_boundaries
-        ]
+    if round_to_nearest is None or round_to_nearest <= 0:
+        for t in time_boundaries:
+            yield round(t * auction_blocks)
+        return
+
+    # Optional rounding to nearest N blocks (Step 2 in Notion doc); one
+    # boundary is held back so the last can be replaced
+    pending = None
+    for t in time_boundaries:
+        if pending is not None:
+            yield pending
+        pending = round(round(t * auction_blocks) / round_to_nearest) * round_to_nearest
+    if pending is not None:
         # Ensure last boundary is exactly auction_blocks
-        block_boundaries[-1] = auction_blocks
+        yield auction_blocks
+
+
+def _block_boundaries(
+    time_boundaries: list[float],
+    auction_blocks: int,
+    round_to_nearest: Optional[int]
+) -> list[int]:
+    """Convert normalized time boundaries to (optionally rounded) block numbers."""
+    return list(_iter_block_boundaries(time_boundaries, auction_blocks, round_to_nearest))
+
+
+def _iter_steps(
+    block_boundaries: Iterable[int],
+    prebid_blocks: int,
+    step_tokens_pct: float
+) -> Iterator[tuple[int, int]]:
+    """Yield the (mps, blockDelta) entries for the given step boundaries, final block last."""
+    # Add prebid period if specified
+    if prebid_blocks > 0:
+        yield 0, prebid_blocks
 
-    # Generate schedule for each step
+    # Each step gets EQUAL token amount
+    step_tokens = step_tokens_pct * TOTAL_TARGET
+
+    # Generate schedule for each step, keeping a running total for the final block
     cumulative_tokens = 0
-    for i in range(num_steps):
-        start_block = block_boundaries[i]
-        end_block = block_boundaries[i + 1]
+    boundaries = iter(block_boundaries)
+    start_block = next(boundaries)
+    for i, end_block in enumerate(boundaries):
         duration = end_block - start_block
-
-        # Each step gets EQUAL token amount
-        step_tokens = step_tokens_pct * TOTAL_TARGET
+        if duration < 0:
+            raise ValueError(
+                f"Step {i + 1} ends at block {end_block}, before it starts at block {start_block}. "
+                f"Try reducing round_to_nearest below auction_blocks."
+            )
 
         # Calculate MPS (tokens per block)
         if duration > 0:
@@ -107,15 +807,30 @@ def generate_schedule(
             # Edge case: zero duration (shouldn't happen with proper inputs)
             mps = 0
 
-        schedule.append({"mps": mps, "blockDelta": duration})
         cumulative_tokens += mps * duration
+        yield mps, duration
+        start_block = end_block
 
     # Final block gets remainder to hit exactly TOTAL_TARGET
     final_tokens = TOTAL_TARGET - cumulative_tokens
-    schedule.append({"mps": final_tokens, "blockDelta": 1})
+    if final_tokens < 0:
+        raise ValueError(
+            f"Steps release {cumulative_tokens} MPS, more than the {TOTAL_TARGET} target, "
+            f"leaving a negative final block. Try fewer num_steps or a shorter auction."
+        )
+    yield final_tokens, 1
+
+
+def _schedule_from_boundaries(
+    block_boundaries: list[int],
+    prebid_blocks: int,
+    step_tokens_pct: float
+) -> SupplySchedule:
+    """Build the {mps, blockDelta} schedule for the given step boundaries."""
+    schedule = SupplySchedule.from_pairs(_iter_steps(block_boundaries, prebid_blocks, step_tokens_pct))
 
     # Validate that rounding didn't cause supply loss
-    actual_total = sum(entry["mps"] * entry["blockDelta"] for entry in schedule)
+    actual_total = schedule.total_mps
     if actual_total != TOTAL_TARGET:
         raise ValueError(
             f"Schedule totals {actual_total} MPS, expected {TOTAL_TARGET}. "
@@ -125,7 +840,578 @@ def generate_schedule(
     return schedule
 
 
-def encode_supply_schedule(schedule: list[dict[str, int]]) -> str:
+def generate_schedule(
+    auction_blocks: int,
+    prebid_blocks: int = 0,
+    num_steps: int = DEFAULT_NUM_STEPS,
+    final_block_pct: float = DEFAULT_FINAL_BLOCK_PCT,
+    alpha: float = DEFAULT_ALPHA,
+    round_to_nearest: Optional[int] = None,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None
+) -> SupplySchedule:
+    """
+    Generate supply schedule using normalized convex curve.
+
+    Algorithm:
+        1. Reserve final_block_pct (default 30%) for final block
+        2. Distribute remaining supply equally across num_steps (default 12)
+        3. Each step releases EQUAL token amounts
+        4. Time boundaries calculated from normalized curve C(t) = t^alpha
+        5. Block durations DECREASE over time (convex curve property)
+        6. Optional rounding of block boundaries to round numbers
+
+    The key insight: equal token amounts + convex supply curve = decreasing time intervals.
+
+    Args:
+        auction_blocks: Total number of blocks for the auction
+        prebid_blocks: Number of blocks for prebid period (0 mps)
+        num_steps: Number of steps for gradual release (default: 12)
+        final_block_pct: Percentage of supply for final block (default: 0.30)
+        alpha: Convexity exponent for curve C(t) = t^alpha (default: 1.2)
+        round_to_nearest: Round block boundaries to nearest N blocks (optional)
+        curve: Release curve name from CURVES, or a Curve (default: "power",
+            C(t) = t^alpha). Other curves make step durations follow their
+            own shape instead of always decreasing.
+        curve_params: Curve parameters overriding the curve's defaults (a
+            curve with an alpha parameter takes it from alpha unless given here)
+
+    Returns:
+        SupplySchedule (a read-only sequence of dicts with 'mps' and 'blockDelta' keys)
+
+    Raises:
+        ValueError: If the steps release more than TOTAL_TARGET, leaving a
+            negative final block, or if the curve or its parameters are invalid
+    """
+    time_boundaries = _time_boundaries(num_steps, final_block_pct, alpha, curve, curve_params)
+    block_boundaries = _block_boundaries(time_boundaries, auction_blocks, round_to_nearest)
+    step_tokens_pct = (1.0 - final_block_pct) / num_steps
+    return _schedule_from_boundaries(block_boundaries, prebid_blocks, step_tokens_pct)
+
+
+def iter_schedule(
+    auction_blocks: int,
+    prebid_blocks: int = 0,
+    num_steps: int = DEFAULT_NUM_STEPS,
+    final_block_pct: float = DEFAULT_FINAL_BLOCK_PCT,
+    alpha: float = DEFAULT_ALPHA,
+    round_to_nearest: Optional[int] = None,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None
+) -> Iterator[tuple[int, int]]:
+    """
+    Yield the schedule's (mps, blockDelta) entries lazily.
+
+    Produces exactly the entries of generate_schedule with the same arguments,
+    but computes each time boundary, block boundary and entry on demand,
+    keeping only a running total for the final block remainder. Memory use
+    does not grow with num_steps, so the entries can be streamed straight
+    into write_supply_schedule.
+
+    Args:
+        Same as generate_schedule
+
+    Yields:
+        (mps, blockDelta) tuples, the final block last
+
+    Raises:
+        ValueError: Once the offending step is reached, if rounding makes a
+            step end before it starts, or (before the final block) if the
+            steps release more than TOTAL_TARGET
+    """
+    time_boundaries = _iter_time_boundaries(num_steps, final_block_pct, alpha, curve, curve_params)
+    block_boundaries = _iter_block_boundaries(time_boundaries, auction_blocks, round_to_nearest)
+    step_tokens_pct = (1.0 - final_block_pct) / num_steps
+    return _iter_steps(block_boundaries, prebid_blocks, step_tokens_pct)
+
+
+def check_feasibility(
+    auction_blocks: int,
+    prebid_blocks: int = 0,
+    num_steps: int = DEFAULT_NUM_STEPS,
+    final_block_pct: float = DEFAULT_FINAL_BLOCK_PCT,
+    alpha: float = DEFAULT_ALPHA,
+    round_to_nearest: Optional[int] = None,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None
+) -> dict[str, Any]:
+    """
+    Decide whether parameters produce a valid schedule, without building it.
+
+    Walks the entries of iter_schedule in O(num_steps) time and constant
+    memory, so a failure is found without allocating the schedule. Rounding
+    can fail in two ways: a step ending before it starts or the steps
+    overshooting TOTAL_TARGET make generate_schedule raise, while steps
+    collapsed to zero length still generate but release nothing.
+
+    Args:
+        Same as generate_schedule
+
+    Returns:
+        Dict with 'feasible' (generates with no collapsed steps), 'generates'
+        (generate_schedule succeeds), 'collapsed_steps' and 'error' (the
+        generate_schedule error message, or None)
+
+    Raises:
+        ValueError: If the curve or its parameters are invalid
+    """
+    # Invalid curves raise here rather than being reported as infeasible
+    _resolve_curve(curve, alpha, curve_params)
+
+    collapsed = 0
+    entries = iter_schedule(
+        auction_blocks, prebid_blocks, num_steps, final_block_pct, alpha, round_to_nearest, curve, curve_params
+    )
+    try:
+        for _, block_delta in entries:
+            if block_delta == 0:
+                collapsed += 1
+    except ValueError as e:
+        return {"feasible": False, "generates": False, "collapsed_steps": collapsed, "error": str(e)}
+    return {"feasible": collapsed == 0, "generates": True, "collapsed_steps": collapsed, "error": None}
+
+
+def _as_column(value: Any) -> list:
+    """Wrap a scalar parameter as a one-element column; copy sequences to a list."""
+    if isinstance(value, (list, tuple, range)):
+        return list(value)
+    return [value]
+
+
+def generate_schedule_batch(
+    auction_blocks: Union[int, Sequence[int]],
+    prebid_blocks: Union[int, Sequence[int]] = 0,
+    num_steps: Union[int, Sequence[int]] = DEFAULT_NUM_STEPS,
+    final_block_pct: Union[float, Sequence[float]] = DEFAULT_FINAL_BLOCK_PCT,
+    alpha: Union[float, Sequence[float]] = DEFAULT_ALPHA,
+    round_to_nearest: Union[Optional[int], Sequence[Optional[int]]] = None,
+    grid: bool = False,
+    include_schedules: bool = True,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None
+) -> dict[str, list]:
+    """
+    Generate supply schedules for many parameter combinations at once.
+
+    Each parameter accepts a scalar or a sequence. With grid=False, sequences
+    are zipped element-wise and scalars / one-element sequences are broadcast
+    to the common length. With grid=True, the cartesian product of all
+    parameter values is evaluated.
+
+    Combinations that share (num_steps, final_block_pct, alpha) share one
+    evaluation of the curve inverse, and combinations that also share
+    (auction_blocks, round_to_nearest) share the block boundaries, so a sweep
+    over prebid lengths or a grid over auction lengths only pays for the
+    curve once per distinct shape. Every schedule is identical to what
+    generate_schedule returns for the same parameters.
+
+    Args:
+        auction_blocks: Auction length(s) in blocks
+        prebid_blocks: Prebid period length(s) in blocks
+        num_steps: Number(s) of steps for gradual release
+        final_block_pct: Final block fraction(s)
+        alpha: Convexity exponent(s)
+        round_to_nearest: Boundary rounding granularity(ies), None for no rounding
+        grid: Evaluate the cartesian product instead of zipping
+        include_schedules: Include the full schedule column in the result
+        curve: Release curve used for every combination (default: "power")
+        curve_params: Parameters of that curve, as for generate_schedule
+
+    Returns:
+        Columnar dict: one list per input parameter, plus 'total_phases',
+        'final_block_mps', 'final_block_percentage', 'schedule' (if requested)
+        and 'error'. Failed combinations have None in the result columns and
+        the error message in 'error'.
+
+    Raises:
+        ValueError: If grid=False and the sequence lengths cannot be broadcast
+    """
+    names = ("auction_blocks", "prebid_blocks", "num_steps", "final_block_pct", "alpha", "round_to_nearest")
+    columns = [
+        _as_column(v)
+        for v in (auction_blocks, prebid_blocks, num_steps, final_block_pct, alpha, round_to_nearest)
+    ]
+
+    if grid:
+        combos = list(itertools.product(*columns))
+    else:
+        size = max(len(c) for c in columns)
+        for name, column in zip(names, columns):
+            if len(column) not in (1, size):
+                raise ValueError(
+                    f"Cannot broadcast {name} of length {len(column)} to length {size}"
+                )
+        combos = list(zip(*(c * size if len(c) == 1 else c for c in columns)))
+
+    result: dict[str, list] = {name: [] for name in names}
+    result["total_phases"] = []
+    result["final_block_mps"] = []
+    result["final_block_percentage"] = []
+    if include_schedules:
+        result["schedule"] = []
+    result["error"] = []
+
+    time_cache: dict[tuple, list[float]] = {}
+    block_cache: dict[tuple, list[int]] = {}
+
+    for combo in combos:
+        blocks, prebid, steps, final_pct, a, rounding = combo
+        for name, value in zip(names, combo):
+            result[name].append(value)
+
+        try:
+            shape = (steps, final_pct, a)
+            time_boundaries = time_cache.get(shape)
+            if time_boundaries is None:
+                time_boundaries = time_cache[shape] = _time_boundaries(steps, final_pct, a, curve, curve_params)
+
+            layout = (shape, blocks, rounding)
+            block_boundaries = block_cache.get(layout)
+            if block_boundaries is None:
+                block_boundaries = block_cache[layout] = _block_boundaries(time_boundaries, blocks, rounding)
+
+            schedule = _schedule_from_boundaries(block_boundaries, prebid, (1.0 - final_pct) / steps)
+        except (ValueError, ArithmeticError, TypeError) as e:
+            result["total_phases"].append(None)
+            result["final_block_mps"].append(None)
+            result["final_block_percentage"].append(None)
+            if include_schedules:
+                result["schedule"].append(None)
+            result["error"].append(str(e))
+            continue
+
+        final_block_mps = schedule.final_block_mps
+        result["total_phases"].append(len(schedule))
+        result["final_block_mps"].append(final_block_mps)
+        result["final_block_percentage"].append(round(final_block_mps / TOTAL_TARGET * 100, 2))
+        if include_schedules:
+            result["schedule"].append(schedule)
+        result["error"].append(None)
+
+    return result
+
+
+def _merge_equal_runs(mps: Iterable[int], block_delta: Iterable[int]) -> tuple[list[int], list[int]]:
+    """Drop zero-length entries and merge adjacent entries with equal mps."""
+    mps_column: list[int] = []
+    block_delta_column: list[int] = []
+    for m, d in zip(mps, block_delta):
+        if d == 0:
+            continue
+        if mps_column and mps_column[-1] == m and block_delta_column[-1] + d <= BLOCK_DELTA_MAX:
+            block_delta_column[-1] += d
+        else:
+            mps_column.append(m)
+            block_delta_column.append(d)
+    return mps_column, block_delta_column
+
+
+def _optimal_segments(weights: Sequence[int], values: Sequence[int], max_segments: int) -> list[int]:
+    """
+    Split a sequence into at most max_segments contiguous segments minimizing
+    the weighted squared error against each segment's weighted mean.
+
+    The cost of a segment is sum(w * v^2) - sum(w * v)^2 / sum(w), read off
+    prefix sums in O(1). The DP runs one layer per segment count. When the
+    values are monotone, the optimal split point is monotone in the segment
+    end, so each layer is solved by divide and conquer in O(n log n), for
+    O(k n log n) overall. Otherwise (non-monotone curves, or step rates that
+    jitter from block rounding) each end scans its split points, which is
+    exact but O(k n^2) in the worst case. The scan runs from the end
+    backwards and stops once the last segment alone costs more than the best
+    candidate, as longer segments only cost more.
+
+    Returns:
+        Segment boundaries [0, b_1, ..., n] as indices into the sequence
+    """
+    n = len(values)
+    max_segments = min(max_segments, n)
+    prefix_w = list(itertools.accumulate(weights, initial=0))
+    prefix_wv = list(itertools.accumulate(map(operator.mul, weights, values), initial=0))
+    prefix_wvv = list(itertools.accumulate(
+        (w * v * v for w, v in zip(weights, values)), initial=0
+    ))
+    monotone = (all(map(operator.le, values, values[1:]))
+                or all(map(operator.ge, values, values[1:])))
+
+    def cost(i: int, j: int) -> float:
+        wv = prefix_wv[j] - prefix_wv[i]
+        return (prefix_wvv[j] - prefix_wvv[i]) - wv * wv / (prefix_w[j] - prefix_w[i])
+
+    inf = float("inf")
+    previous = [0.0] + [inf] * n
+    choices: list[list[int]] = []
+    for layer in range(1, max_segments + 1):
+        current = [inf] * (n + 1)
+        choice = [0] * (n + 1)
+
+        if monotone:
+            # The best split for end j lies between the best splits of its neighbours
+            stack = [(layer, n, layer - 1, n - 1)]
+            while stack:
+                lo, hi, opt_lo, opt_hi = stack.pop()
+                if lo > hi:
+                    continue
+                mid = (lo + hi) // 2
+                best, best_i = inf, opt_lo
+                for i in range(opt_lo, min(mid - 1, opt_hi) + 1):
+                    candidate = previous[i] + cost(i, mid)
+                    if candidate < best:
+                        best, best_i = candidate, i
+                current[mid] = best
+                choice[mid] = best_i
+                stack.append((lo, mid - 1, opt_lo, best_i))
+                stack.append((mid + 1, hi, best_i, opt_hi))
+        else:
+            for j in range(layer, n + 1):
+                best, best_i = inf, layer - 1
+                for i in range(j - 1, layer - 2, -1):
+                    last = cost(i, j)
+                    if last >= best:
+                        break  # previous[] is non-negative, and earlier splits only lengthen the last segment
+                    if previous[i] + last < best:
+                        best, best_i = previous[i] + last, i
+                current[j] = best
+                choice[j] = best_i
+
+        choices.append(choice)
+        previous = current
+
+    # Walk the split points back from the end
+    boundaries = [n]
+    for choice in reversed(choices):
+        boundaries.append(choice[boundaries[-1]])
+    boundaries.reverse()
+    return boundaries
+
+
+def compact_schedule(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    max_entries: Optional[int] = None
+) -> SupplySchedule:
+    """
+    Compact a schedule into fewer entries to reduce deployment calldata.
+
+    Without max_entries, zero-length entries are dropped and adjacent entries
+    with equal mps are merged. The per-block release is unchanged.
+
+    With max_entries, the schedule is then reduced to at most max_entries
+    entries. Leading zero-mps entries (the prebid period) and the final entry
+    are kept as they are; the release steps between them are grouped into
+    the contiguous segments that best fit the original per-block release
+    (least squares, weighted by blocks), found by dynamic programming. Each
+    segment releases at the mean rate of the steps it replaces, so the
+    cumulative release still follows the curve and matches it at every
+    segment boundary up to rounding. The final entry absorbs the rounding, so
+    the total (TOTAL_TARGET for generated schedules) is preserved exactly.
+
+    Args:
+        schedule: SupplySchedule or list of dicts with 'mps' and 'blockDelta' keys
+        max_entries: Maximum number of entries in the result (optional)
+
+    Returns:
+        Compacted SupplySchedule covering the same blocks with the same total
+
+    Raises:
+        ValueError: If max_entries is too small to keep the prebid period,
+            the final entry and one release segment, or if the final entry
+            cannot absorb the rounding
+    """
+    schedule = SupplySchedule.from_dicts(schedule)
+    mps_column, block_delta_column = _merge_equal_runs(schedule.mps, schedule.block_delta)
+    if max_entries is None or len(mps_column) <= max_entries:
+        return SupplySchedule(mps_column, block_delta_column)
+
+    # Keep the prebid period and the final entry; segment the steps in between
+    lead = 1 if mps_column[0] == 0 else 0
+    min_entries = lead + 2 if len(mps_column) > lead + 1 else lead + 1
+    if max_entries < min_entries:
+        raise ValueError(
+            f"max_entries must be at least {min_entries} to keep the "
+            f"{'prebid period, ' if lead else ''}release steps and final block, got {max_entries}"
+        )
+    step_mps = mps_column[lead:-1]
+    step_blocks = block_delta_column[lead:-1]
+    boundaries = _optimal_segments(step_blocks, step_mps, max_entries - lead - 1)
+
+    compacted_mps = mps_column[:lead]
+    compacted_blocks = block_delta_column[:lead]
+    for start, end in zip(boundaries, boundaries[1:]):
+        blocks = sum(step_blocks[start:end])
+        tokens = sum(map(operator.mul, step_mps[start:end], step_blocks[start:end]))
+        compacted_mps.append(round(tokens / blocks))
+        compacted_blocks.append(blocks)
+
+    # Final entry absorbs the rounding so the total is unchanged
+    final_mps, final_blocks = mps_column[-1], block_delta_column[-1]
+    released = sum(map(operator.mul, compacted_mps, compacted_blocks))
+    remainder = schedule.total_mps - released
+    if remainder < 0 or remainder % final_blocks != 0:
+        raise ValueError(
+            f"Final entry ({final_mps} mps over {final_blocks} blocks) cannot absorb the "
+            f"{remainder - final_mps * final_blocks} MPS rounding difference of the compacted steps"
+        )
+    compacted_mps.append(remainder // final_blocks)
+    compacted_blocks.append(final_blocks)
+
+    return SupplySchedule(*_merge_equal_runs(compacted_mps, compacted_blocks))
+
+
+def release_deviation(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    other: Union[SupplySchedule, list[dict[str, int]]]
+) -> int:
+    """
+    Maximum difference in cumulative supply released between two schedules
+    over the same blocks, in mps units.
+
+    Both cumulative curves are piecewise linear, so the maximum is reached at
+    an entry boundary of one of them; only those boundaries are checked.
+
+    Raises:
+        ValueError: If the schedules cover a different number of blocks
+    """
+    schedule = SupplySchedule.from_dicts(schedule)
+    other = SupplySchedule.from_dicts(other)
+    if schedule.total_blocks != other.total_blocks:
+        raise ValueError(
+            f"Schedules cover {schedule.total_blocks} and {other.total_blocks} blocks"
+        )
+
+    blocks = set(schedule.cumulative_blocks).union(other.cumulative_blocks)
+    return max(abs(schedule.released_before(b) - other.released_before(b)) for b in blocks)
+
+
+def token_amounts(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    total_supply: int
+) -> dict[str, Any]:
+    """
+    Convert a schedule from mps units to exact integer token amounts.
+
+    All arithmetic is on Python integers, so supplies like 1e29 wei are
+    exact. In one pass over the entries and the cached cumulative mps:
+        tokens_per_block: floor(total_supply * mps / TOTAL_TARGET), the
+            amount each block of the entry releases
+        step_tokens: tokens_per_block * blockDelta
+        cumulative_tokens: step_tokens summed through the entry
+        dust: What per-block flooring leaves out of the entry, compared with
+            the exact cumulative amount floor(total_supply * released / TOTAL_TARGET)
+            at its end; step_tokens + dust sums to the exact cumulative amount
+
+    Args:
+        schedule: SupplySchedule or list of {mps, blockDelta} dicts
+        total_supply: Total token supply in base units (e.g. wei)
+
+    Returns:
+        Columnar dict with 'tokens_per_block', 'step_tokens',
+        'cumulative_tokens' and 'dust' (one int per entry), plus
+        'total_supply', 'allocated_tokens' (sum of step_tokens),
+        'total_dust' (sum of dust) and 'unallocated_tokens' (supply the
+        schedule does not release when its total is not TOTAL_TARGET)
+
+    Raises:
+        ValueError: If total_supply is not a non-negative integer
+    """
+    if isinstance(total_supply, bool) or not isinstance(total_supply, int) or total_supply < 0:
+        raise ValueError(f"total_supply must be a non-negative integer, got {total_supply!r}")
+    schedule = SupplySchedule.from_dicts(schedule)
+
+    tokens_per_block = []
+    step_tokens = []
+    cumulative_tokens = []
+    dust = []
+    allocated = 0
+    exact_before = 0
+    for mps, block_delta, released in zip(schedule.mps, schedule.block_delta, schedule.cumulative_mps[1:]):
+        per_block = total_supply * mps // TOTAL_TARGET
+        step = per_block * block_delta
+        exact = total_supply * released // TOTAL_TARGET
+        allocated += step
+        tokens_per_block.append(per_block)
+        step_tokens.append(step)
+        cumulative_tokens.append(allocated)
+        dust.append(exact - exact_before - step)
+        exact_before = exact
+
+    return {
+        "tokens_per_block": tokens_per_block,
+        "step_tokens": step_tokens,
+        "cumulative_tokens": cumulative_tokens,
+        "dust": dust,
+        "total_supply": total_supply,
+        "allocated_tokens": allocated,
+        "total_dust": exact_before - allocated,
+        "unallocated_tokens": total_supply - exact_before,
+    }
+
+
+def pack_supply_schedule(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    as_memoryview: bool = False
+) -> Union[bytes, memoryview]:
+    """
+    Pack supply schedule into raw bytes for onchain deployment.
+
+    Works column-wise on the schedule's contiguous arrays: blockDelta is
+    written as big-endian uint64s into a single buffer allocated up front,
+    then the low three bytes of every big-endian mps are copied over the
+    (zero) top three bytes of each element. Bounds are checked the same way,
+    by comparing the high-order byte columns against zero, so packing is
+    linear in the schedule length with no per-element Python work.
+
+    Args:
+        schedule: SupplySchedule or list of dicts with 'mps' and 'blockDelta' keys
+        as_memoryview: Return a zero-copy memoryview over the packed buffer
+            instead of an immutable bytes copy
+
+    Returns:
+        Packed bytes (8 bytes per element), or a memoryview over them
+
+    Raises:
+        ValueError: If mps exceeds 24-bit max, blockDelta exceeds 40-bit max,
+            or either is negative
+    """
+    schedule = SupplySchedule.from_dicts(schedule)
+    count = len(schedule)
+    mps_bytes = MPS_BITS // 8
+
+    # blockDelta as big-endian uint64; the top three bytes must be zero
+    block_delta_be = array('Q', schedule._block_delta)
+    mps_be = array(_UINT32, schedule._mps)
+    if sys.byteorder == 'little':
+        block_delta_be.byteswap()
+        mps_be.byteswap()
+    buffer = bytearray(block_delta_be.tobytes())
+    mps_be_bytes = mps_be.tobytes()
+    mps_width = mps_be.itemsize
+
+    # Validate bounds against bit-width constraints by checking that the
+    # high-order byte columns are all zero, then report the first offending
+    # element in schedule order
+    zeros = bytes(count)
+    in_range = all(
+        buffer[i::ENCODED_ELEMENT_BYTES] == zeros for i in range(mps_bytes)
+    ) and all(
+        mps_be_bytes[i::mps_width] == zeros for i in range(mps_width - mps_bytes)
+    )
+    if not in_range:
+        for m, d in zip(schedule._mps, schedule._block_delta):
+            if m > MPS_MAX:
+                raise ValueError(f"mps {m} exceeds {MPS_BITS}-bit max ({MPS_MAX})")
+            if d > BLOCK_DELTA_MAX:
+                raise ValueError(f"blockDelta {d} exceeds {BLOCK_DELTA_BITS}-bit max ({BLOCK_DELTA_MAX})")
+
+    # Upper 24 bits: low three bytes of each big-endian uint32 mps
+    for i in range(mps_bytes):
+        buffer[i::ENCODED_ELEMENT_BYTES] = mps_be_bytes[mps_width - mps_bytes + i::mps_width]
+
+    if as_memoryview:
+        return memoryview(buffer)
+    return bytes(buffer)
+
+
+def encode_supply_schedule(schedule: Union[SupplySchedule, list[dict[str, int]]]) -> str:
     """
     Encode supply schedule to bytes for onchain deployment.
 
@@ -136,7 +1422,7 @@ def encode_supply_schedule(schedule: list[dict[str, int]]) -> str:
     - Pack all uint64s together (like Solidity's abi.encodePacked)
 
     Args:
-        schedule: List of dicts with 'mps' and 'blockDelta' keys
+        schedule: SupplySchedule or list of dicts with 'mps' and 'blockDelta' keys
 
     Returns:
         Hex string with 0x prefix representing packed bytes
@@ -144,31 +1430,717 @@ def encode_supply_schedule(schedule: list[dict[str, int]]) -> str:
     Raises:
         ValueError: If mps exceeds 24-bit max or blockDelta exceeds 40-bit max
     """
-    # Bit layout per uint64 (matching Solidity's parse function):
-    #   [  24 bits: mps  |  40 bits: blockDelta  ] = 64 bits total
-    # Solidity unpacks via: mps = uint24(bytes3(data)), blockDelta = uint40(uint64(data))
-    MPS_BITS = 24
-    BLOCK_DELTA_BITS = 40
-    MPS_MAX = 2**MPS_BITS - 1          # 16,777,215
-    BLOCK_DELTA_MAX = 2**BLOCK_DELTA_BITS - 1  # 1,099,511,627,775
+    # Return as hex string with 0x prefix
+    return '0x' + pack_supply_schedule(schedule, as_memoryview=True).hex()
 
-    encoded_bytes = b''
 
-    for item in schedule:
-        mps = item['mps']
-        block_delta = item['blockDelta']
+def write_supply_schedule(
+    entries: Iterable[tuple[int, int]],
+    sink: Any,
+    hex_output: bool = False,
+    chunk_size: int = DEFAULT_STREAM_CHUNK
+) -> dict[str, int]:
+    """
+    Encode (mps, blockDelta) entries incrementally into a file or socket.
 
-        # Validate bounds against bit-width constraints
-        if mps > MPS_MAX:
-            raise ValueError(f"mps {mps} exceeds {MPS_BITS}-bit max ({MPS_MAX})")
-        if block_delta > BLOCK_DELTA_MAX:
-            raise ValueError(f"blockDelta {block_delta} exceeds {BLOCK_DELTA_BITS}-bit max ({BLOCK_DELTA_MAX})")
+    Entries are consumed chunk_size at a time, each chunk packed column-wise
+    like pack_supply_schedule and written out before the next is read, so
+    memory stays bounded by the chunk size however long the schedule is.
 
-        # Pack into uint64: mps in upper 24 bits, blockDelta in lower 40 bits
-        packed = (mps << BLOCK_DELTA_BITS) | block_delta
+    Args:
+        entries: Iterable of (mps, blockDelta) tuples, e.g. from iter_schedule
+        sink: Binary file-like object with write(), or a socket with sendall()
+        hex_output: Write a 0x-prefixed hex string (as ASCII) instead of raw bytes,
+            matching encode_supply_schedule
+        chunk_size: Entries packed per write
 
-        # Convert to 8 bytes (big-endian) for abi.encodePacked compatibility
-        encoded_bytes += packed.to_bytes(8, byteorder='big')
+    Returns:
+        Dict with 'num_elements', 'length_bytes' (packed size) and 'total_mps'
 
-    # Return as hex string with 0x prefix
-    return '0x' + encoded_bytes.hex()
+    Raises:
+        ValueError: If an entry exceeds the encoding bit widths; the chunks
+            before it have already been written
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    write = getattr(sink, "sendall", None) or sink.write
+
+    if hex_output:
+        write(b"0x")
+
+    num_elements = 0
+    total_mps = 0
+    entries = iter(entries)
+    while True:
+        chunk = SupplySchedule.from_pairs(itertools.islice(entries, chunk_size))
+        if not len(chunk):
+            break
+        packed = pack_supply_schedule(chunk, as_memoryview=True)
+        write(packed.hex().encode("ascii") if hex_output else packed)
+        num_elements += len(chunk)
+        total_mps += chunk.total_mps
+
+    return {
+        "num_elements": num_elements,
+        "length_bytes": num_elements * ENCODED_ELEMENT_BYTES,
+        "total_mps": total_mps,
+    }
+
+
+# Dense per-block emission file layout (little-endian):
+#   header: magic, version, reserved, num_blocks, start_block, total_mps (32 bytes)
+#   mps: uint32 per block
+#   released: uint64 per block, cumulative supply released through that block,
+#       starting on an 8-byte boundary
+DENSE_MAGIC = b"CCAE"
+DENSE_VERSION = 1
+_DENSE_HEADER = struct.Struct("<4sHHQQQ")
+
+
+def _dense_layout(num_blocks: int) -> tuple[int, int]:
+    """(offset of the released column, total size in bytes) for a dense export."""
+    released_offset = _DENSE_HEADER.size + -(-num_blocks * 4 // 8) * 8
+    return released_offset, released_offset + num_blocks * 8
+
+
+def dense_emission_size(schedule: Union[SupplySchedule, list[dict[str, int]]]) -> int:
+    """Bytes needed by export_dense_emission for a schedule."""
+    return _dense_layout(SupplySchedule.from_dicts(schedule).total_blocks)[1]
+
+
+def export_dense_emission(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    target: Union[str, os.PathLike, bytearray, memoryview, mmap.mmap],
+    start_block: int = 0,
+    chunk_size: int = DEFAULT_DENSE_CHUNK
+) -> dict[str, int]:
+    """
+    Expand a run-length schedule into dense per-block mps and cumulative supply columns.
+
+    Each entry's blocks are written run by run, chunk_size blocks at a time:
+    the mps column by repeating the packed value and the cumulative column
+    as an arithmetic progression, so memory stays bounded by the chunk size
+    however many blocks the schedule covers. Open the result with
+    DenseEmission for windowed reads.
+
+    Args:
+        schedule: SupplySchedule or list of {mps, blockDelta} dicts
+        target: Path of the file to create (memory-mapped while writing), or
+            a writable buffer of at least dense_emission_size(schedule) bytes
+        start_block: Block number of the schedule's first block
+        chunk_size: Blocks expanded per write
+
+    Returns:
+        Dict with 'num_blocks', 'length_bytes' and 'total_mps'
+
+    Raises:
+        ValueError: If chunk_size < 1 or the buffer is too small
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    schedule = SupplySchedule.from_dicts(schedule)
+    num_blocks = schedule.total_blocks if len(schedule) else 0
+    released_offset, size = _dense_layout(num_blocks)
+
+    def fill(buffer: memoryview) -> None:
+        buffer[:_DENSE_HEADER.size] = _DENSE_HEADER.pack(
+            DENSE_MAGIC, DENSE_VERSION, 0, num_blocks, start_block, schedule.total_mps
+        )
+        mps_pos, released_pos = _DENSE_HEADER.size, released_offset
+        released = 0
+        for mps, block_delta in zip(schedule.mps, schedule.block_delta):
+            packed_mps = struct.pack("<I", mps)
+            while block_delta:
+                count = min(block_delta, chunk_size)
+                buffer[mps_pos:mps_pos + 4 * count] = packed_mps * count
+                if mps:
+                    column = array('Q', range(released + mps, released + mps * count + 1, mps))
+                else:
+                    column = array('Q', [released]) * count
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                buffer[released_pos:released_pos + 8 * count] = column.tobytes()
+                released += mps * count
+                mps_pos += 4 * count
+                released_pos += 8 * count
+                block_delta -= count
+
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w+b") as f:
+            f.truncate(size)
+            with mmap.mmap(f.fileno(), size) as mapped:
+                fill(memoryview(mapped))
+                mapped.flush()
+    else:
+        buffer = memoryview(target).cast("B")
+        if buffer.readonly or len(buffer) < size:
+            raise ValueError(f"Target must be a writable buffer of at least {size} bytes")
+        fill(buffer)
+
+    return {"num_blocks": num_blocks, "length_bytes": size, "total_mps": schedule.total_mps}
+
+
+class DenseEmission:
+    """
+    Read-only view of a dense per-block emission written by export_dense_emission.
+
+    Files are memory-mapped, so opening one reads only the 32-byte header;
+    window() touches just the pages of the requested blocks. Blocks are
+    addressed by absolute block number, from start_block to
+    start_block + num_blocks - 1. On little-endian hosts windows are
+    zero-copy typed memoryviews into the mapping.
+    """
+
+    def __init__(self, source: Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap]):
+        """
+        Args:
+            source: Path of an exported file, or a buffer holding an export
+
+        Raises:
+            ValueError: If the data is not a dense emission export
+        """
+        self._file = None
+        self._mmap = None
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, "rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._file.close()
+                raise ValueError(f"{source} is empty, not a dense emission export") from None
+            self._buffer = memoryview(self._mmap)
+        else:
+            self._buffer = memoryview(source).cast("B")
+
+        if len(self._buffer) < _DENSE_HEADER.size:
+            self.close()
+            raise ValueError("Buffer is too small for a dense emission header")
+        magic, version, _, self.num_blocks, self.start_block, self.total_mps = _DENSE_HEADER.unpack_from(self._buffer)
+        if magic != DENSE_MAGIC or version != DENSE_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {DENSE_VERSION} dense emission export (magic {magic!r}, version {version})")
+        self._released_offset, size = _dense_layout(self.num_blocks)
+        if len(self._buffer) < size:
+            available = len(self._buffer)
+            self.close()
+            raise ValueError(f"Dense emission export is truncated: {available} of {size} bytes")
+
+    def __len__(self) -> int:
+        return self.num_blocks
+
+    def _column(self, offset: int, itemsize: int, typecode: str, first: int, last: int) -> Union[memoryview, array]:
+        raw = self._buffer[offset + first * itemsize:offset + last * itemsize]
+        if sys.byteorder == 'little':
+            return raw.cast(typecode)
+        column = array(typecode, raw.tobytes())
+        column.byteswap()
+        return column
+
+    def window(self, first_block: int, last_block: int) -> tuple[Union[memoryview, array], Union[memoryview, array]]:
+        """
+        mps and cumulative released supply for blocks first_block..last_block - 1.
+
+        The window is clipped to the export; released[i] is the supply
+        released up to and including block first_block + i.
+
+        Returns:
+            (mps, released) as uint32 and uint64 sequences
+        """
+        first = min(max(first_block - self.start_block, 0), self.num_blocks)
+        last = min(max(last_block - self.start_block, first), self.num_blocks)
+        return (
+            self._column(_DENSE_HEADER.size, 4, _UINT32, first, last),
+            self._column(self._released_offset, 8, 'Q', first, last),
+        )
+
+    def close(self) -> None:
+        """Release the buffer and unmap the file (windows must no longer be in use)."""
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __enter__(self) -> "DenseEmission":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _to_packed_bytes(encoded: Union[str, bytes, bytearray, memoryview]) -> bytes:
+    """Normalize a 0x-prefixed hex string or bytes-like object to packed bytes."""
+    if isinstance(encoded, str):
+        hex_str = encoded[2:] if encoded[:2] in ('0x', '0X') else encoded
+        try:
+            data = bytes.fromhex(hex_str)
+        except ValueError as e:
+            raise ValueError(f"Encoded schedule is not valid hex: {e}") from e
+    else:
+        data = bytes(encoded)
+
+    if len(data) % ENCODED_ELEMENT_BYTES != 0:
+        raise ValueError(
+            f"Encoded schedule is {len(data)} bytes, expected a multiple of {ENCODED_ELEMENT_BYTES}"
+        )
+    return data
+
+
+def _unpack_columns(data: bytes) -> SupplySchedule:
+    """
+    Split packed big-endian uint64s into mps and blockDelta columns.
+
+    Works on whole byte columns instead of individual elements: masking
+    blockDelta zeroes the top three bytes of every uint64, and shifting mps
+    moves those three bytes to the bottom of an otherwise zero uint32. Both
+    results are then read as one native array each.
+    """
+    count = len(data) // ENCODED_ELEMENT_BYTES
+    mps_bytes = MPS_BITS // 8
+
+    # blockDelta = uint40(uint64(data)): clear the mps bytes
+    block_delta_be = bytearray(data)
+    zeros = bytes(count)
+    for i in range(mps_bytes):
+        block_delta_be[i::ENCODED_ELEMENT_BYTES] = zeros
+
+    # mps = uint24(bytes3(data)): shift the mps bytes down into a uint32
+    mps = array(_UINT32)
+    mps_be = bytearray(count * mps.itemsize)
+    shift = mps.itemsize - mps_bytes
+    for i in range(mps_bytes):
+        mps_be[shift + i::mps.itemsize] = data[i::ENCODED_ELEMENT_BYTES]
+
+    mps.frombytes(mps_be)
+    block_delta = array('Q', block_delta_be)
+    if sys.byteorder == 'little':
+        mps.byteswap()
+        block_delta.byteswap()
+
+    schedule = SupplySchedule()
+    schedule._mps = mps
+    schedule._block_delta = block_delta
+    return schedule
+
+
+def decode_supply_schedule(
+    encoded: Union[str, bytes, bytearray, memoryview],
+    verify_round_trip: bool = False
+) -> SupplySchedule:
+    """
+    Decode packed supply schedule bytes (the inverse of encode_supply_schedule).
+
+    Args:
+        encoded: Hex string (with or without 0x prefix) or bytes-like object
+            holding packed uint64 elements
+        verify_round_trip: Re-encode the decoded schedule and check that it
+            reproduces the input byte for byte
+
+    Returns:
+        SupplySchedule holding the decoded entries
+
+    Raises:
+        ValueError: If the input is not valid hex, is not a whole number of
+            uint64 elements, or fails round-trip verification
+    """
+    data = _to_packed_bytes(encoded)
+    schedule = _unpack_columns(data)
+
+    if verify_round_trip and pack_supply_schedule(schedule, as_memoryview=True) != data:
+        raise ValueError("Decoded schedule does not re-encode to the input bytes")
+
+    return schedule
+
+
+def estimate_calldata_gas(
+    schedule: Union[SupplySchedule, list[dict[str, int]], str, bytes, bytearray, memoryview],
+    zero_byte_gas: int = CALLDATA_ZERO_BYTE_GAS,
+    nonzero_byte_gas: int = CALLDATA_NONZERO_BYTE_GAS
+) -> dict[str, int]:
+    """
+    Estimate the calldata gas of a packed schedule.
+
+    Zero bytes are counted in one pass over the packed bytes; every other
+    byte is nonzero.
+
+    Args:
+        schedule: SupplySchedule, list of {mps, blockDelta} dicts, or an
+            encoded schedule (hex string or bytes-like)
+        zero_byte_gas: Gas per zero calldata byte (default: 4)
+        nonzero_byte_gas: Gas per nonzero calldata byte (default: 16)
+
+    Returns:
+        Dict with 'length_bytes', 'zero_bytes', 'nonzero_bytes' and 'gas'
+
+    Raises:
+        ValueError: If the schedule cannot be packed or the encoding is malformed
+    """
+    if isinstance(schedule, (SupplySchedule, list, tuple)):
+        data = pack_supply_schedule(schedule)
+    else:
+        data = _to_packed_bytes(schedule)
+
+    zero_bytes = data.count(0)
+    nonzero_bytes = len(data) - zero_bytes
+    return {
+        "length_bytes": len(data),
+        "zero_bytes": zero_bytes,
+        "nonzero_bytes": nonzero_bytes,
+        "gas": zero_bytes * zero_byte_gas + nonzero_bytes * nonzero_byte_gas,
+    }
+
+
+def optimize_calldata_gas(
+    auction_blocks: int,
+    prebid_blocks: int = 0,
+    num_steps: int = DEFAULT_NUM_STEPS,
+    final_block_pct: float = DEFAULT_FINAL_BLOCK_PCT,
+    alpha: float = DEFAULT_ALPHA,
+    round_to_nearest: Optional[int] = None,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None,
+    tolerance: float = 0.01,
+    num_steps_radius: int = 4,
+    rounding_candidates: Optional[Sequence[Optional[int]]] = None,
+    zero_byte_gas: int = CALLDATA_ZERO_BYTE_GAS,
+    nonzero_byte_gas: int = CALLDATA_NONZERO_BYTE_GAS
+) -> dict[str, Any]:
+    """
+    Search nearby num_steps and round_to_nearest values for the cheapest encoding.
+
+    The requested parameters define the reference schedule. Every combination
+    of num_steps within num_steps_radius of the request and round_to_nearest
+    from rounding_candidates (plus the requested value) is generated in one
+    generate_schedule_batch call, so candidates share curve evaluations. A
+    candidate is acceptable when its cumulative release never differs from
+    the reference by more than tolerance * TOTAL_TARGET at any block; the
+    acceptable candidate with the lowest calldata gas wins (ties go to the
+    smaller deviation).
+
+    Args:
+        auction_blocks, prebid_blocks, num_steps, final_block_pct, alpha,
+            round_to_nearest, curve, curve_params: Requested parameters, as
+            for generate_schedule
+        tolerance: Maximum release deviation as a fraction of TOTAL_TARGET
+        num_steps_radius: How far num_steps may move from the request
+        rounding_candidates: round_to_nearest values to try (default:
+            DEFAULT_ROUNDING_CANDIDATES); values >= auction_blocks are skipped
+        zero_byte_gas: Gas per zero calldata byte
+        nonzero_byte_gas: Gas per nonzero calldata byte
+
+    Returns:
+        Dict with 'requested' and 'best' (each with 'num_steps',
+        'round_to_nearest', 'schedule', 'max_release_deviation_mps' and the
+        estimate_calldata_gas fields), 'gas_saved', 'candidates_evaluated'
+        and 'candidates_within_tolerance'
+
+    Raises:
+        ValueError: If the requested parameters do not produce a valid
+            schedule, or tolerance or num_steps_radius is negative
+    """
+    if tolerance < 0:
+        raise ValueError(f"tolerance must be >= 0, got {tolerance}")
+    if num_steps_radius < 0:
+        raise ValueError(f"num_steps_radius must be >= 0, got {num_steps_radius}")
+
+    def describe(schedule: SupplySchedule, steps: int, rounding: Optional[int], deviation: int) -> dict[str, Any]:
+        return {
+            "num_steps": steps,
+            "round_to_nearest": rounding,
+            "schedule": schedule,
+            "max_release_deviation_mps": deviation,
+            **estimate_calldata_gas(schedule, zero_byte_gas, nonzero_byte_gas),
+        }
+
+    reference = generate_schedule(
+        auction_blocks, prebid_blocks, num_steps, final_block_pct, alpha, round_to_nearest,
+        curve, curve_params
+    )
+    requested = describe(reference, num_steps, round_to_nearest, 0)
+
+    if rounding_candidates is None:
+        rounding_candidates = DEFAULT_ROUNDING_CANDIDATES
+    roundings = [
+        r for r in dict.fromkeys([round_to_nearest, *rounding_candidates])
+        if r is None or 0 < r < auction_blocks
+    ]
+    candidates = generate_schedule_batch(
+        auction_blocks,
+        prebid_blocks,
+        list(range(max(1, num_steps - num_steps_radius), num_steps + num_steps_radius + 1)),
+        final_block_pct,
+        alpha,
+        roundings,
+        grid=True,
+        curve=curve,
+        curve_params=curve_params
+    )
+
+    max_deviation = tolerance * TOTAL_TARGET
+    best = requested
+    within_tolerance = 0
+    for steps, rounding, schedule in zip(
+        candidates["num_steps"], candidates["round_to_nearest"], candidates["schedule"]
+    ):
+        if schedule is None:
+            continue
+        deviation = release_deviation(reference, schedule)
+        if deviation > max_deviation:
+            continue
+        try:
+            candidate = describe(schedule, steps, rounding, deviation)
+        except ValueError:
+            continue  # exceeds the encoding bit widths
+        within_tolerance += 1
+        if (candidate["gas"], deviation) < (best["gas"], best["max_release_deviation_mps"]):
+            best = candidate
+
+    return {
+        "requested": requested,
+        "best": best,
+        "gas_saved": requested["gas"] - best["gas"],
+        "candidates_evaluated": len(candidates["error"]),
+        "candidates_within_tolerance": within_tolerance,
+    }
+
+
+def schedule_violations(
+    schedule: SupplySchedule,
+    max_mps: Optional[int] = None,
+    min_block_delta: Optional[int] = None,
+    final_block_pct_range: Optional[tuple[float, float]] = None,
+    max_entries: Optional[int] = None
+) -> list[str]:
+    """
+    Check a schedule against solver constraints.
+
+    max_mps and min_block_delta apply to the release steps: every entry
+    except a leading zero-mps prebid entry and the final block.
+
+    Returns:
+        One message per violated constraint (empty if the schedule satisfies all)
+    """
+    violations = []
+    mps, block_delta = schedule.mps, schedule.block_delta
+    first = 1 if len(schedule) > 1 and mps[0] == 0 else 0
+    steps = range(first, len(schedule) - 1)
+
+    if max_mps is not None and steps:
+        peak = max(mps[i] for i in steps)
+        if peak > max_mps:
+            violations.append(f"Step mps {peak} exceeds max_mps {max_mps}")
+    if min_block_delta is not None and steps:
+        shortest = min(block_delta[i] for i in steps)
+        if shortest < min_block_delta:
+            violations.append(f"Step of {shortest} blocks is shorter than min_block_delta {min_block_delta}")
+    if final_block_pct_range is not None:
+        low, high = final_block_pct_range
+        final_pct = schedule.final_block_mps / TOTAL_TARGET
+        if not low <= final_pct <= high:
+            violations.append(f"Final block releases {final_pct:.4%}, outside [{low:.4%}, {high:.4%}]")
+    if max_entries is not None and len(schedule) > max_entries:
+        violations.append(f"{len(schedule)} entries exceed max_entries {max_entries}")
+    if any(m > MPS_MAX for m in mps):
+        violations.append(f"An entry's mps exceeds the 24-bit limit {MPS_MAX}")
+    return violations
+
+
+def solve_schedule(
+    auction_blocks: int,
+    prebid_blocks: int = 0,
+    num_steps: int = DEFAULT_NUM_STEPS,
+    final_block_pct: float = DEFAULT_FINAL_BLOCK_PCT,
+    alpha: float = DEFAULT_ALPHA,
+    round_to_nearest: Optional[int] = None,
+    curve: Union[str, Curve] = DEFAULT_CURVE,
+    curve_params: Optional[dict[str, Any]] = None,
+    max_mps: Optional[int] = None,
+    min_block_delta: Optional[int] = 1,
+    final_block_pct_range: Optional[tuple[float, float]] = None,
+    max_entries: Optional[int] = None,
+    rounding_candidates: Optional[Sequence[Optional[int]]] = None,
+    num_steps_radius: int = 4
+) -> dict[str, Any]:
+    """
+    Find the parameters closest to the requested ones whose schedule meets the constraints.
+
+    The requested parameters are the targets. The search varies:
+        num_steps: Within num_steps_radius of the request, and small enough
+            for max_entries
+        final_block_pct: Only when final_block_pct_range is given; the
+            request clamped into the range, and the range bounds
+        round_to_nearest: The request, then rounding_candidates in order
+        alpha: For curves with an alpha parameter, bisection (on a
+            SOLVER_ALPHA_STEP grid) for the value closest to the request on
+            the way to 1.0. A flatter curve lowers the peak mps and lengthens
+            the shortest step, so feasibility improves towards 1.0.
+
+    Candidates are ranked by the sum of relative changes to num_steps, alpha
+    and final_block_pct; ties go to the earlier rounding candidate. Every
+    returned schedule is generated and checked, so the result is feasible
+    even where the bisection's monotonicity assumption does not hold exactly.
+
+    Args:
+        auction_blocks, prebid_blocks, num_steps, final_block_pct, alpha,
+            round_to_nearest, curve, curve_params: Target parameters, as for
+            generate_schedule
+        max_mps: Maximum mps of any release step
+        min_block_delta: Minimum blockDelta of any release step (default: 1,
+            so rounding may not collapse steps to zero length)
+        final_block_pct_range: (low, high) bounds on the final block's share
+            of TOTAL_TARGET
+        max_entries: Maximum number of schedule entries
+        rounding_candidates: round_to_nearest values allowed besides the
+            request (values >= auction_blocks are skipped)
+        num_steps_radius: How far num_steps may move from the request
+
+    Returns:
+        Dict with 'requested' ('params', 'violations'), 'best' ('params',
+        'schedule', 'metrics' with 'max_mps', 'min_block_delta',
+        'final_block_pct' and 'entries'; None if nothing is feasible),
+        'feasible' and 'candidates_evaluated'
+
+    Raises:
+        ValueError: If num_steps_radius is negative or final_block_pct_range
+            is empty
+    """
+    if num_steps_radius < 0:
+        raise ValueError(f"num_steps_radius must be >= 0, got {num_steps_radius}")
+    if final_block_pct_range is not None and not final_block_pct_range[0] <= final_block_pct_range[1]:
+        raise ValueError(f"final_block_pct_range {final_block_pct_range} is empty")
+
+    constraints = (max_mps, min_block_delta, final_block_pct_range, max_entries)
+    evaluated = 0
+
+    def params(steps: int, final_pct: float, a: float, rounding: Optional[int]) -> dict[str, Any]:
+        return {
+            "auction_blocks": auction_blocks,
+            "prebid_blocks": prebid_blocks,
+            "num_steps": steps,
+            "final_block_pct": final_pct,
+            "alpha": a,
+            "round_to_nearest": rounding,
+            "curve": curve if isinstance(curve, str) else curve.name,
+            "curve_params": curve_params,
+        }
+
+    def evaluate(steps: int, final_pct: float, a: float, rounding: Optional[int]) -> tuple[Optional[SupplySchedule], list[str]]:
+        nonlocal evaluated
+        evaluated += 1
+        try:
+            schedule = generate_schedule(
+                auction_blocks, prebid_blocks, steps, final_pct, a, rounding, curve, curve_params
+            )
+        except (ValueError, ArithmeticError) as e:
+            return None, [str(e)]
+        return schedule, schedule_violations(schedule, *constraints)
+
+    def cost(steps: int, final_pct: float, a: float) -> float:
+        return abs(steps - num_steps) / num_steps + abs(a - alpha) / alpha + abs(final_pct - final_block_pct) / final_block_pct
+
+    schedule, violations = evaluate(num_steps, final_block_pct, alpha, round_to_nearest)
+    requested = {"params": params(num_steps, final_block_pct, alpha, round_to_nearest), "violations": violations}
+    if not violations:
+        return {
+            "requested": requested,
+            "best": {"params": requested["params"], "schedule": schedule, "metrics": _solver_metrics(schedule)},
+            "feasible": True,
+            "candidates_evaluated": evaluated,
+        }
+
+    # Search space
+    max_steps = num_steps + num_steps_radius
+    if max_entries is not None:
+        max_steps = min(max_steps, max_entries - 1 - (prebid_blocks > 0))
+    center = min(num_steps, max_steps)
+    step_values = sorted(
+        range(max(1, center - num_steps_radius), max_steps + 1),
+        key=lambda n: abs(n - num_steps)
+    )
+    if final_block_pct_range is None:
+        final_values = [final_block_pct]
+    else:
+        low, high = final_block_pct_range
+        final_values = list(dict.fromkeys([min(max(final_block_pct, low), high), high, low]))
+    roundings = [
+        r for r in dict.fromkeys([round_to_nearest, *(rounding_candidates or ())])
+        if r is None or 0 < r < auction_blocks
+    ]
+    tune_alpha = "alpha" in get_curve(curve).defaults and not (curve_params and "alpha" in curve_params)
+
+    best = None
+    best_key = None
+    for rounding_index, rounding in enumerate(roundings):
+        for steps in step_values:
+            for final_pct in final_values:
+                base_cost = cost(steps, final_pct, alpha)
+                if best_key is not None and (base_cost, rounding_index) >= best_key:
+                    continue  # cannot beat the best even at the target alpha
+
+                schedule, violations = evaluate(steps, final_pct, alpha, rounding)
+                a = alpha
+                if violations and tune_alpha and alpha != 1.0:
+                    a, schedule = _bisect_alpha(
+                        lambda x: evaluate(steps, final_pct, x, rounding), alpha
+                    )
+                    violations = [] if schedule is not None else violations
+                if violations:
+                    continue
+
+                key = (cost(steps, final_pct, a), rounding_index)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best = {"params": params(steps, final_pct, a, rounding), "schedule": schedule,
+                            "metrics": _solver_metrics(schedule)}
+
+    return {
+        "requested": requested,
+        "best": best,
+        "feasible": best is not None,
+        "candidates_evaluated": evaluated,
+    }
+
+
+def _bisect_alpha(
+    evaluate: Callable[[float], tuple[Optional[SupplySchedule], list[str]]],
+    alpha: float
+) -> tuple[float, Optional[SupplySchedule]]:
+    """
+    Feasible alpha closest to an infeasible target alpha, between it and 1.0.
+
+    Alphas are taken on the SOLVER_ALPHA_STEP grid, counted in grid steps
+    from 1.0. Returns (alpha, schedule), with schedule None if even 1.0 is
+    infeasible.
+    """
+    def feasible(units: int) -> Optional[SupplySchedule]:
+        schedule, violations = evaluate(round(1.0 + units * SOLVER_ALPHA_STEP, 6))
+        return None if violations else schedule
+
+    # Grid steps from 1.0: 0 is assumed feasible, target is not
+    target = math.trunc((alpha - 1.0) / SOLVER_ALPHA_STEP)
+    good, bad = 0, target if target != 0 else (1 if alpha > 1.0 else -1)
+    best = feasible(good)
+    if best is None:
+        return alpha, None
+
+    while abs(bad - good) > 1:
+        middle = (good + bad) // 2 if bad > good else -((-good - bad) // 2)
+        schedule = feasible(middle)
+        if schedule is None:
+            bad = middle
+        else:
+            good, best = middle, schedule
+    return round(1.0 + good * SOLVER_ALPHA_STEP, 6), best
+
+
+def _solver_metrics(schedule: SupplySchedule) -> dict[str, Any]:
+    """Constraint-relevant measurements of a schedule."""
+    mps, block_delta = schedule.mps, schedule.block_delta
+    first = 1 if len(schedule) > 1 and mps[0] == 0 else 0
+    steps = range(first, len(schedule) - 1)
+    return {
+        "max_mps": max((mps[i] for i in steps), default=0),
+        "min_block_delta": min((block_delta[i] for i in steps), default=0),
+        "final_block_pct": schedule.final_block_mps / TOTAL_TARGET,
+        "entries": len(schedule),
+    }
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Server Metrics
+
+Per-tool request counts, error counts, payload sizes and latency histograms
+for the MCP server, split into phases (validation, generation, encoding,
+serialization) so it is visible where time goes across many sessions.
+
+A call is tracked with ServerMetrics.track(); code anywhere below it, on
+the event loop or on a worker thread the call's context was copied to,
+times itself with phase(). Phases of calls that run on a process pool are
+not visible to the server; those calls report validation and total time
+only.
+
+Diagnostics modes, switchable at runtime with set_diagnostics():
+    off: Counters and histograms only (default; a few microseconds per call)
+    log: Also log one structured JSON line per call
+    profile: Also profile tool bodies with cProfile (one call at a time;
+        concurrent calls are skipped) and report the hottest functions
+
+Like logic.py, this module has no external dependencies.
+"""
+
+import contextlib
+import contextvars
+import functools
+import io
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+if TYPE_CHECKING:
+    import pstats
+
+# Diagnostics modes
+DIAGNOSTICS_MODES = ("off", "log", "profile")
+
+# Phases timed inside tool calls, besides the whole call ("total")
+PHASES = ("validation", "generation", "encoding", "serialization")
+
+# Latency histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+LATENCY_BUCKETS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 30_000
+)
+
+# Functions reported from the profile, by cumulative time
+PROFILE_TOP_FUNCTIONS = 25
+
+# The call being tracked in the current context, if any
+_current_call: contextvars.ContextVar[Optional["CallRecord"]] = contextvars.ContextVar(
+    "cca_current_call", default=None
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, sum and max, in milliseconds."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Record one latency."""
+        self.counts[bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        """Upper bound of the bucket holding the quantile (capped at the max), None if empty."""
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable summary with the non-empty buckets as [upper_ms, count] pairs."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": [
+                [bound, count]
+                for bound, count in zip((*self.buckets, None), self.counts)
+                if count
+            ],
+        }
+
+
+class CallRecord:
+    """
+    Phase timings and outcome of one tool call.
+
+    A record is closed when its call finishes. A worker thread can outlive its
+    call (after a timeout) and still hold the record through its copied
+    context, so phases and errors reported after closing are dropped.
+    """
+
+    __slots__ = ("tool", "phases", "payload_bytes", "error", "closed")
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.phases: dict[str, float] = {}
+        self.payload_bytes = 0
+        self.error = False
+        self.closed = False
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        if not self.closed:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def close(self) -> dict[str, float]:
+        """Stop accepting phases; returns a snapshot of the phase timings."""
+        self.closed = True
+        return dict(self.phases)
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block as a phase of the tracked call (no-op outside a tracked call)."""
+    record = _current_call.get()
+    if record is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record.add_phase(name, time.perf_counter() - start)
+
+
+def mark_error() -> None:
+    """Count the tracked call as failed (no-op outside a tracked call)."""
+    record = _current_call.get()
+    if record is not None and not record.closed:
+        record.error = True
+
+
+class _ToolMetrics:
+    """Counters and per-phase histograms of one tool."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.payload_bytes_total = 0
+        self.payload_bytes_max = 0
+        self.latency = {name: LatencyHistogram() for name in ("total", *PHASES)}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "payload_bytes": {
+                "total": self.payload_bytes_total,
+                "mean": round(self.payload_bytes_total / self.requests) if self.requests else None,
+                "max": self.payload_bytes_max,
+            },
+            "latency": {name: histogram.to_dict() for name, histogram in self.latency.items() if histogram.count},
+        }
+
+
+class ServerMetrics:
+    """
+    Per-tool metrics of a server process.
+
+    track() and the counters run on the event loop; phase timings are
+    collected on the call's CallRecord (from whichever thread runs the
+    phase) and folded in when the call finishes, so no locking is needed
+    outside profiling.
+    """
+
+    def __init__(self, diagnostics: str = "off", logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            diagnostics: One of DIAGNOSTICS_MODES
+            logger: Logger for the "log" mode (default: the cca-supply-schedule logger)
+        """
+        self.logger = logger or logging.getLogger("cca-supply-schedule")
+        self.started = time.time()
+        self._tools: dict[str, _ToolMetrics] = {}
+        self._profile_lock = threading.Lock()
+        self._profile: Optional["pstats.Stats"] = None
+        self.profiled_calls = 0
+        self.diagnostics = "off"
+        self.set_diagnostics(diagnostics)
+
+    def set_diagnostics(self, mode: str) -> None:
+        """Switch the diagnostics mode; takes effect for the next call."""
+        if mode not in DIAGNOSTICS_MODES:
+            raise ValueError(f"Unknown diagnostics mode {mode!r}, expected one of {DIAGNOSTICS_MODES}")
+        self.diagnostics = mode
+
+    def reset(self) -> None:
+        """Drop all counters, histograms and profile data."""
+        self.started = time.time()
+        self._tools.clear()
+        with self._profile_lock:
+            self._profile = None
+            self.profiled_calls = 0
+
+    @contextlib.contextmanager
+    def track(self, tool: str) -> Iterator[CallRecord]:
+        """Track one call of a tool; the caller sets payload_bytes on the yielded record."""
+        record = CallRecord(tool)
+        token = _current_call.set(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.error = True
+            raise
+        finally:
+            record.add_phase("total", time.perf_counter() - start)
+            _current_call.reset(token)
+            self._record(record, record.close())
+
+    def _record(self, record: CallRecord, phases: dict[str, float]) -> None:
+        """Fold a finished call, with its phase timings at close, into the tool's metrics."""
+        metrics = self._tools.get(record.tool)
+        if metrics is None:
+            metrics = self._tools[record.tool] = _ToolMetrics()
+        metrics.requests += 1
+        metrics.errors += record.error
+        metrics.payload_bytes_total += record.payload_bytes
+        metrics.payload_bytes_max = max(metrics.payload_bytes_max, record.payload_bytes)
+        for name, seconds in phases.items():
+            histogram = metrics.latency.get(name)
+            if histogram is None:
+                histogram = metrics.latency[name] = LatencyHistogram()
+            histogram.observe(seconds * 1000)
+
+        if self.diagnostics != "off":
+            self.logger.info(json.dumps({
+                "event": "tool_call",
+                "tool": record.tool,
+                "error": record.error,
+                "payload_bytes": record.payload_bytes,
+                "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in phases.items()},
+            }, separators=(",", ":")))
+
+    def instrument(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """fn, wrapped to run under the profiler while the diagnostics mode is "profile"."""
+        if self.diagnostics != "profile":
+            return fn
+
+        # Imported on first use; the profiler modules add to cold start
+        import cProfile
+        import pstats
+
+        @functools.wraps(fn)
+        def profiled(*args: Any) -> Any:
+            # cProfile cannot profile two calls at once; calls that find it busy run unprofiled
+            if not self._profile_lock.acquire(blocking=False):
+                return fn(*args)
+            try:
+                profiler = cProfile.Profile()
+                try:
+                    return profiler.runcall(fn, *args)
+                finally:
+                    stats = pstats.Stats(profiler, stream=io.StringIO())
+                    if self._profile is None:
+                        self._profile = stats
+                    else:
+                        self._profile.add(stats)
+                    self.profiled_calls += 1
+            finally:
+                self._profile_lock.release()
+
+        return profiled
+
+    def _profile_summary(self) -> Optional[dict[str, Any]]:
+        """Hottest functions by cumulative time across the profiled calls."""
+        with self._profile_lock:
+            if self._profile is None:
+                return None
+            # pstats maps (file, line, name) -> (primitive calls, calls, tottime, cumtime, callers)
+            entries = sorted(
+                self._profile.stats.items(),
+                key=lambda item: item[1][3],
+                reverse=True
+            )[:PROFILE_TOP_FUNCTIONS]
+            return {
+                "profiled_calls": self.profiled_calls,
+                "functions": [
+                    {
+                        "function": f"{name} ({os.path.basename(filename)}:{line})",
+                        "calls": calls,
+                        "total_ms": round(tottime * 1000, 3),
+                        "cumulative_ms": round(cumtime * 1000, 3),
+                    }
+                    for (filename, line, name), (_, calls, tottime, cumtime, _) in entries
+                ],
+            }
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable view of every tool's metrics."""
+        output = {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "diagnostics": self.diagnostics,
+            "requests": sum(metrics.requests for metrics in self._tools.values()),
+            "errors": sum(metrics.errors for metrics in self._tools.values()),
+            "tools": {tool: metrics.to_dict() for tool, metrics in sorted(self._tools.items())},
+        }
+        profile = self._profile_summary()
+        if profile is not None:
+            output["profile"] = profile
+        return output
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Monte Carlo Scenarios
+
+Runs many randomized demand scenarios against one schedule with the
+clearing simulation (simulation.py) and aggregates the outcomes, to show
+the spread of clearing prices, proceeds and final-block concentration a
+schedule leads to rather than the result of a single bid book.
+
+Scenarios run in chunks on a process pool shared by every run in the
+process (one pool per worker count), so worker startup is paid once and
+concurrent or abandoned runs never hold more than max_workers processes
+between them. Every scenario draws its bid
+book from a seed derived from the run seed and its own index, so results
+do not depend on the number of workers or on which worker ran what; chunk
+results are merged in scenario order as they arrive, into streaming
+summaries (mean, min, max and P-square quantile estimates) of constant
+size, so memory stays flat however many scenarios run. A time budget
+stops the run early with the scenarios completed so far.
+
+Like logic.py, this module has no external dependencies.
+"""
+
+import concurrent.futures
+import hashlib
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, Iterator, Optional, Sequence, Union
+
+from logic import SupplySchedule, TOTAL_TARGET
+from simulation import simulate_auction, synthetic_bids
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Per-scenario outcomes, in the order _run_chunk reports them
+SCENARIO_METRICS = (
+    "final_clearing_price",  # Clearing price in the last block
+    "average_price",  # Currency raised / tokens sold
+    "currency_raised",  # Total currency raised
+    "sell_through",  # Share of the released supply sold
+    "final_block_share",  # Share of the tokens sold that sold in the final block
+    "outbid_share",  # Share of the accepted bids that were outbid
+)
+
+# Largest default chunk; the time budget is checked between chunks
+MAX_CHUNK_SIZE = 16
+
+# Chunks in flight per worker; bounds how many out-of-order results wait to be merged
+CHUNKS_PER_WORKER = 2
+
+# Process pools shared by all runs, by worker count
+_pools: dict[int, concurrent.futures.ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _shared_pool(max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """The shared pool with max_workers processes, started on first use."""
+    with _pools_lock:
+        pool = _pools.get(max_workers)
+        if pool is None:
+            pool = _pools[max_workers] = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        return pool
+
+
+def _discard_pool(max_workers: int, pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    """Drop a broken shared pool so the next run starts a fresh one."""
+    with _pools_lock:
+        if _pools.get(max_workers) is pool:
+            del _pools[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools() -> None:
+    """Shut down the shared pools, cancelling chunks that have not started."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of one quantile with the P-square algorithm (Jain & Chlamtac, 1985).
+
+    Keeps five markers whose heights track the minimum, the quantile, the
+    maximum and two points halfway between, adjusting them with piecewise
+    parabolic interpolation as values arrive. Uses constant memory; exact
+    for the first five values.
+    """
+
+    def __init__(self, quantile: float):
+        if not 0 < quantile < 1:
+            raise ValueError(f"quantile must be between 0 and 1, got {quantile}")
+        self.quantile = quantile
+        self.count = 0
+        self._heights: list[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1.0, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5.0]
+        self._increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Find the cell the value falls in, extending the extremes
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in (1, 2, 3):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    # Fall back to linear interpolation when the parabola leaves the neighbours' range
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise-parabolic height of marker i moved by step."""
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        """Current estimate (None before the first observation)."""
+        if not self.count:
+            return None
+        if self.count <= 5:
+            # Linear interpolation between the closest ranks of the values seen so far
+            rank = self.quantile * (self.count - 1)
+            low = int(rank)
+            high = min(low + 1, self.count - 1)
+            return self._heights[low] + (rank - low) * (self._heights[high] - self._heights[low])
+        return self._heights[2]
+
+
+class StreamingSummary:
+    """Count, mean, min, max and quantile estimates of a stream of values, in constant memory."""
+
+    def __init__(self, quantiles: Sequence[float] = DEFAULT_QUANTILES):
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._quantiles = [P2Quantile(q) for q in quantiles]
+
+    def add(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        for estimator in self._quantiles:
+            estimator.add(value)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable summary; quantiles keyed like "p5", "p50", "p95"."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "quantiles": {f"p{estimator.quantile * 100:g}": estimator.value() for estimator in self._quantiles},
+        }
+
+
+def scenario_seed(seed: int, index: int) -> int:
+    """Seed of scenario `index` in a run seeded with `seed` (stable across processes and platforms)."""
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _run_chunk(
+    schedule: SupplySchedule,
+    demand: dict[str, Any],
+    start: int,
+    stop: int
+) -> list[tuple[Optional[float], ...]]:
+    """Simulate scenarios start..stop-1 and return their SCENARIO_METRICS."""
+    results = []
+    released_tokens = demand["total_supply"] * schedule.total_mps / TOTAL_TARGET
+    for index in range(start, stop):
+        seed = scenario_seed(demand["seed"], index)
+
+        # Scenario-level demand shock, mean 1, then a bid book around it
+        rng = random.Random(seed)
+        sigma = demand["demand_sigma"]
+        multiplier = rng.lognormvariate(-sigma * sigma / 2, sigma) if sigma else 1.0
+        bids = synthetic_bids(
+            demand["num_bids"],
+            schedule.total_blocks,
+            demand["floor_price"],
+            seed=seed,
+            price_sigma=demand["price_sigma"],
+            mean_amount=demand["expected_demand"] * multiplier / demand["num_bids"]
+        )
+        result = simulate_auction(schedule, bids, demand["total_supply"], demand["floor_price"])
+
+        sold = result["total_tokens_sold"]
+        results.append((
+            result["final_clearing_price"],
+            result["average_price"],
+            result["total_currency_raised"],
+            sold / released_tokens if released_tokens else None,
+            result["tokens_sold"][-1] / sold if sold else None,
+            result["bids_outbid"] / result["bids_accepted"] if result["bids_accepted"] else None,
+        ))
+    return results
+
+
+def iter_scenario_summaries(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    num_scenarios: int,
+    total_supply: float,
+    floor_price: float,
+    num_bids: int = 1_000,
+    expected_demand: Optional[float] = None,
+    demand_sigma: float = 0.5,
+    price_sigma: float = 0.5,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES
+) -> Iterator[dict[str, Any]]:
+    """
+    Run randomized demand scenarios against a schedule, yielding running summaries.
+
+    Each scenario draws a bid book with synthetic_bids(): num_bids bids
+    whose budgets add up to expected_demand times a log-normal demand shock
+    (mean 1, spread demand_sigma), priced log-normally above the floor.
+
+    Args:
+        schedule: SupplySchedule or list of {mps, blockDelta} dicts
+        num_scenarios: Number of scenarios to run
+        total_supply: Tokens the schedule releases in full
+        floor_price: Auction floor price, in currency per token
+        num_bids: Bids per scenario
+        expected_demand: Mean total bid budget per scenario, in currency
+            (default: total_supply * floor_price, the supply's value at the floor)
+        demand_sigma: Log-normal sigma of the per-scenario demand shock (0 for none)
+        price_sigma: Log-normal sigma of bid prices over the floor
+        seed: Run seed; the same seed gives the same scenarios
+        max_workers: Worker processes (default: CPU count, at most 8; 1 runs in-process)
+        chunk_size: Scenarios per task (default: about 8 tasks per worker, at most
+            16, so a time budget is checked often)
+        time_budget: Seconds after which the run stops with the scenarios
+            completed so far (None: no limit)
+        quantiles: Quantiles to estimate for every metric
+
+    Yields:
+        After each merged chunk, a summary with 'completed' and
+        'num_scenarios', 'elapsed' seconds, 'budget_exhausted' and 'metrics'
+        (a StreamingSummary dict per SCENARIO_METRICS entry). The last
+        summary covers scenarios 0..completed-1 in order, so a rerun with the
+        same seed and a larger budget only adds scenarios.
+
+    Raises:
+        ValueError: If a count, price or spread is out of range
+    """
+    schedule = SupplySchedule.from_dicts(schedule)
+    if num_scenarios <= 0 or num_bids <= 0:
+        raise ValueError(f"num_scenarios and num_bids must be positive, got {num_scenarios}, {num_bids}")
+    if total_supply <= 0 or floor_price <= 0:
+        raise ValueError(f"total_supply and floor_price must be positive, got {total_supply}, {floor_price}")
+    if demand_sigma < 0 or price_sigma <= 0:
+        raise ValueError(
+            f"demand_sigma must be non-negative and price_sigma positive, got {demand_sigma}, {price_sigma}"
+        )
+    if expected_demand is not None and expected_demand <= 0:
+        raise ValueError(f"expected_demand must be positive, got {expected_demand}")
+
+    demand = {
+        "total_supply": total_supply,
+        "floor_price": floor_price,
+        "num_bids": num_bids,
+        "expected_demand": expected_demand if expected_demand is not None else total_supply * floor_price,
+        "demand_sigma": demand_sigma,
+        "price_sigma": price_sigma,
+        "seed": seed,
+    }
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    chunk_size = chunk_size or max(1, min(MAX_CHUNK_SIZE, math.ceil(num_scenarios / (max_workers * 8))))
+    chunks = [(start, min(start + chunk_size, num_scenarios)) for start in range(0, num_scenarios, chunk_size)]
+
+    summaries = {name: StreamingSummary(quantiles) for name in SCENARIO_METRICS}
+    started = time.perf_counter()
+    deadline = started + time_budget if time_budget is not None else math.inf
+    completed = 0
+
+    def snapshot(budget_exhausted: bool) -> dict[str, Any]:
+        return {
+            "completed": completed,
+            "num_scenarios": num_scenarios,
+            "elapsed": time.perf_counter() - started,
+            "budget_exhausted": budget_exhausted,
+            "metrics": {name: summary.to_dict() for name, summary in summaries.items()},
+        }
+
+    def merge(results: list[tuple[Optional[float], ...]]) -> None:
+        nonlocal completed
+        for values in results:
+            for name, value in zip(SCENARIO_METRICS, values):
+                if value is not None:
+                    summaries[name].add(value)
+        completed += len(results)
+
+    if max_workers == 1:
+        for start, stop in chunks:
+            if time.perf_counter() >= deadline:
+                yield snapshot(True)
+                return
+            merge(_run_chunk(schedule, demand, start, stop))
+            yield snapshot(False)
+        return
+
+    pool = _shared_pool(max_workers)
+    pending = {}  # chunk number -> future
+    try:
+        ready = {}  # chunk number -> results waiting for earlier chunks
+        next_submit = next_merge = 0
+        while next_merge < len(chunks):
+            while next_submit < len(chunks) and len(pending) + len(ready) < max_workers * CHUNKS_PER_WORKER:
+                pending[next_submit] = pool.submit(_run_chunk, schedule, demand, *chunks[next_submit])
+                next_submit += 1
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                yield snapshot(True)
+                return
+            done, _ = concurrent.futures.wait(
+                pending.values(),
+                timeout=None if remaining == math.inf else remaining,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for number in [number for number, future in pending.items() if future in done]:
+                ready[number] = pending.pop(number).result()
+
+            # Merge in scenario order so the summaries do not depend on scheduling
+            merged = False
+            while next_merge in ready:
+                merge(ready.pop(next_merge))
+                next_merge += 1
+                merged = True
+            if merged:
+                yield snapshot(False)
+    except concurrent.futures.BrokenExecutor:
+        _discard_pool(max_workers, pool)
+        raise
+    finally:
+        # Chunks that have not started are dropped; running ones finish on the shared workers
+        for future in pending.values():
+            future.cancel()
+
+
+def run_scenarios(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    num_scenarios: int,
+    **kwargs: Any
+) -> dict[str, Any]:
+    """
+    Run randomized demand scenarios against a schedule and return the final summary.
+
+    Takes the arguments of iter_scenario_summaries().
+    """
+    summary = None
+    for summary in iter_scenario_summaries(schedule, num_scenarios, **kwargs):
+        pass
+    return summary
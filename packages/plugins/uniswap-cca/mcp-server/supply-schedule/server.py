@@ -6,22 +6,63 @@ This MCP server provides tools for generating supply schedules for
 Continuous Clearing Auction (CCA) contracts using a normalized convex curve.
 """
 
+import asyncio
+import base64
+import functools
 import json
 import logging
-from typing import Any, Optional
+import os
+import sys
+from decimal import Decimal, InvalidOperation
+from typing import TYPE_CHECKING, Annotated, Any, Literal, Optional, Union
 
 from mcp.server import Server
 from mcp.types import Tool, TextContent
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    NonNegativeInt,
+    PositiveInt,
+    WithJsonSchema,
+    field_validator,
+    model_validator,
+)
 
 from logic import (
     generate_schedule,
+    generate_schedule_batch,
     encode_supply_schedule,
+    decode_supply_schedule,
+    pack_supply_schedule,
+    compact_schedule,
+    release_deviation,
+    estimate_calldata_gas,
+    optimize_calldata_gas,
+    solve_schedule,
+    token_amounts,
+    SupplySchedule,
+    CURVES,
+    DEFAULT_CURVE,
     TOTAL_TARGET,
+    MPS_MAX,
+    ENCODED_ELEMENT_BYTES,
+    CALLDATA_ZERO_BYTE_GAS,
+    CALLDATA_NONZERO_BYTE_GAS,
+    DEFAULT_ROUNDING_CANDIDATES,
     DEFAULT_NUM_STEPS,
     DEFAULT_FINAL_BLOCK_PCT,
     DEFAULT_ALPHA,
 )
+from cache import LRUCache
+from executor import ToolExecutor
+from metrics import ServerMetrics, mark_error, phase, DIAGNOSTICS_MODES
+
+if TYPE_CHECKING:
+    import argparse
+
+    from feasibility import FeasibilityIndex
+    from store import ScheduleStore
 
 # Configure logging to stderr (not stdout for STDIO servers)
 logging.basicConfig(
@@ -31,11 +72,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger("cca-supply-schedule")
 
+# Response formats:
+#   json: Indented JSON with the schedule as {mps, blockDelta} objects (default)
+#   compact: Same fields without whitespace
+#   columnar: Compact, with the schedule as {"mps": [...], "blockDelta": [...]}
+#   binary: Compact, with the schedule and encoding as base64 of the packed bytes
+ResponseFormat = Literal["json", "compact", "columnar", "binary"]
 
-class GenerateScheduleInput(BaseModel):
-    """Input parameters for generate_supply_schedule tool."""
+# Release curve families (see logic.CURVES)
+CurveName = Literal[tuple(CURVES)]
+
+# Curve parameter bounds, shared by the single-schedule tools and every element of a batch
+MIN_FINAL_BLOCK_PCT = 0.1
+MAX_FINAL_BLOCK_PCT = 0.9
+FinalBlockPct = Annotated[float, Field(gt=MIN_FINAL_BLOCK_PCT, lt=MAX_FINAL_BLOCK_PCT)]
+Alpha = Annotated[float, Field(gt=0)]
+
+CURVE_DESCRIPTION = (
+    f"Release curve (default: {DEFAULT_CURVE}). "
+    + " ".join(
+        f"{name}: {curve.description} (params: {json.dumps(curve.defaults)})."
+        for name, curve in CURVES.items()
+    )
+)
+
+RESPONSE_FORMAT_DESCRIPTION = (
+    "Response format: json (indented, default), compact (no whitespace), columnar "
+    "(schedule as {mps: [...], blockDelta: [...]}) or binary (schedule and encoding as "
+    "base64 of the packed uint64s, in schedule_base64 / encoded_base64)"
+)
+
+
+class ScheduleParams(BaseModel):
+    """Curve parameters shared by the tools that generate a schedule."""
     auction_blocks: int = Field(
-        description="Total number of blocks for the auction (e.g., 86400 for 2 days on Base)",
+        description="Total number of blocks for the auction (e.g., 86400 for 2 days on Base with 2s blocks)",
         gt=0
     )
     prebid_blocks: int = Field(
@@ -48,245 +119,1524 @@ class GenerateScheduleInput(BaseModel):
         description=f"Number of steps for gradual release (default: {DEFAULT_NUM_STEPS})",
         gt=0
     )
-    final_block_pct: float = Field(
+    final_block_pct: FinalBlockPct = Field(
         default=DEFAULT_FINAL_BLOCK_PCT,
-        description=f"Percentage of supply for final block (default: {DEFAULT_FINAL_BLOCK_PCT}, range: 0.1-0.9)",
-        gt=0.1,
-        lt=0.9
+        description=f"Percentage of supply for final block as decimal (default: {DEFAULT_FINAL_BLOCK_PCT}, range: 0.1-0.9)"
     )
-    alpha: float = Field(
+    alpha: Alpha = Field(
         default=DEFAULT_ALPHA,
-        description=f"Convexity exponent for curve C(t) = t^alpha (default: {DEFAULT_ALPHA})",
-        gt=0
+        description=f"Convexity exponent for curve C(t) = t^alpha (default: {DEFAULT_ALPHA})"
     )
     round_to_nearest: Optional[int] = Field(
         default=None,
-        description="Round block boundaries to nearest N blocks (e.g., 100). None = no rounding",
+        description="Round block boundaries to nearest N blocks (e.g., 100). Omit for no rounding.",
         ge=1
     )
+    curve: CurveName = Field(
+        default=DEFAULT_CURVE,
+        description=CURVE_DESCRIPTION
+    )
+    curve_params: Optional[dict[str, Any]] = Field(
+        default=None,
+        description=(
+            "Parameters of the selected curve, overriding its defaults "
+            "(the power curve takes alpha from the alpha parameter)"
+        )
+    )
+
+    def cache_key(self) -> str:
+        """Hashable key identifying the normalized parameters."""
+        return json.dumps(self.model_dump(mode="json"), sort_keys=True)
+
+    def schedule_kwargs(self) -> dict[str, Any]:
+        """Keyword arguments for generate_schedule."""
+        return {
+            "auction_blocks": self.auction_blocks,
+            "prebid_blocks": self.prebid_blocks,
+            "num_steps": self.num_steps,
+            "final_block_pct": self.final_block_pct,
+            "alpha": self.alpha,
+            "round_to_nearest": self.round_to_nearest,
+            "curve": self.curve,
+            "curve_params": self.curve_params,
+        }
+
+
+class GenerateScheduleInput(ScheduleParams):
+    """Input parameters for generate_supply_schedule tool."""
+    compaction: Literal["none", "merge", "optimal"] = Field(
+        default="none",
+        description=(
+            "Reduce the number of encoded entries: none (default), merge (merge adjacent steps with "
+            "equal mps, same per-block release) or optimal (best fit of the curve with at most "
+            "max_entries entries, total still exactly 1e7)"
+        )
+    )
+    max_entries: Optional[int] = Field(
+        default=None,
+        description="Maximum number of schedule entries for optimal compaction",
+        ge=2
+    )
+    response_format: ResponseFormat = Field(
+        default="json",
+        description=RESPONSE_FORMAT_DESCRIPTION
+    )
+
+    @model_validator(mode="after")
+    def _check_compaction(self) -> "GenerateScheduleInput":
+        """max_entries is required by, and only used for, optimal compaction."""
+        if (self.compaction == "optimal") != (self.max_entries is not None):
+            raise ValueError("max_entries must be set exactly when compaction is 'optimal'")
+        return self
+
+    def generation_params(self) -> dict[str, Any]:
+        """The normalized parameters that determine the generated schedule (not how it is rendered)."""
+        return self.model_dump(mode="json", include={*ScheduleParams.model_fields, "compaction", "max_entries"})
+
+
+class GenerateAndEncodeInput(GenerateScheduleInput):
+    """Input parameters for generate_and_encode_supply_schedule tool."""
+    include_schedule: bool = Field(
+        default=True,
+        description="Include the schedule array in the response (set false for large num_steps)"
+    )
+
+
+class EstimateCalldataGasInput(BaseModel):
+    """Input parameters for estimate_calldata_gas tool."""
+    encoded: str = Field(
+        description="Packed auctionStepsData as a hex string (0x prefix optional)"
+    )
+    zero_byte_gas: NonNegativeInt = Field(
+        default=CALLDATA_ZERO_BYTE_GAS,
+        description=f"Gas per zero calldata byte (default: {CALLDATA_ZERO_BYTE_GAS})"
+    )
+    nonzero_byte_gas: NonNegativeInt = Field(
+        default=CALLDATA_NONZERO_BYTE_GAS,
+        description=f"Gas per nonzero calldata byte (default: {CALLDATA_NONZERO_BYTE_GAS})"
+    )
+
+
+class OptimizeCalldataGasInput(ScheduleParams):
+    """Input parameters for optimize_calldata_gas tool."""
+    tolerance: float = Field(
+        default=0.01,
+        description=(
+            "Maximum difference in cumulative supply released at any block, compared with the "
+            "requested schedule, as a fraction of total supply (default: 0.01)"
+        ),
+        ge=0,
+        le=1
+    )
+    num_steps_radius: int = Field(
+        default=4,
+        description="Try num_steps values up to this far from the requested one (default: 4)",
+        ge=0,
+        le=64
+    )
+    round_to_nearest_candidates: Optional[list[Optional[PositiveInt]]] = Field(
+        default=None,
+        description=(
+            "round_to_nearest values to try, null meaning no rounding "
+            f"(default: {json.dumps(list(DEFAULT_ROUNDING_CANDIDATES))})"
+        ),
+        max_length=64
+    )
+    zero_byte_gas: NonNegativeInt = Field(
+        default=CALLDATA_ZERO_BYTE_GAS,
+        description=f"Gas per zero calldata byte (default: {CALLDATA_ZERO_BYTE_GAS})"
+    )
+    nonzero_byte_gas: NonNegativeInt = Field(
+        default=CALLDATA_NONZERO_BYTE_GAS,
+        description=f"Gas per nonzero calldata byte (default: {CALLDATA_NONZERO_BYTE_GAS})"
+    )
+    include_schedule: bool = Field(
+        default=False,
+        description="Include the best schedule array and its encoding in the response"
+    )
+
+
+class SolveScheduleInput(ScheduleParams):
+    """Input parameters for solve_supply_schedule tool."""
+    max_mps: Optional[int] = Field(
+        default=None,
+        description="Maximum mps of any release step (excluding the prebid period and final block)",
+        ge=1,
+        le=MPS_MAX
+    )
+    min_block_delta: Optional[int] = Field(
+        default=1,
+        description="Minimum blockDelta of any release step (default: 1, i.e. no steps collapsed by rounding)",
+        ge=0
+    )
+    final_block_pct_min: Optional[float] = Field(
+        default=None,
+        description="Lowest acceptable share of supply released in the final block, as decimal",
+        gt=MIN_FINAL_BLOCK_PCT,
+        lt=MAX_FINAL_BLOCK_PCT
+    )
+    final_block_pct_max: Optional[float] = Field(
+        default=None,
+        description="Highest acceptable share of supply released in the final block, as decimal",
+        gt=MIN_FINAL_BLOCK_PCT,
+        lt=MAX_FINAL_BLOCK_PCT
+    )
+    max_entries: Optional[int] = Field(
+        default=None,
+        description="Maximum number of schedule entries (calldata uint64s)",
+        ge=2
+    )
+    round_to_nearest_candidates: Optional[list[Optional[PositiveInt]]] = Field(
+        default=None,
+        description=(
+            "round_to_nearest values allowed besides the requested one, in order of preference, "
+            "null meaning no rounding (default: only the requested value)"
+        ),
+        max_length=64
+    )
+    num_steps_radius: int = Field(
+        default=4,
+        description="Try num_steps values up to this far from the requested one (default: 4)",
+        ge=0,
+        le=64
+    )
+    include_schedule: bool = Field(
+        default=True,
+        description="Include the solved schedule array and its encoding in the response"
+    )
+
+    @model_validator(mode="after")
+    def _check_final_block_range(self) -> "SolveScheduleInput":
+        """The final-block bounds must not cross."""
+        if (self.final_block_pct_min is not None and self.final_block_pct_max is not None
+                and self.final_block_pct_min > self.final_block_pct_max):
+            raise ValueError("final_block_pct_min must not exceed final_block_pct_max")
+        return self
+
+    def final_block_pct_range(self) -> Optional[tuple[float, float]]:
+        """(low, high) final-block bounds, or None if neither is set; a missing bound is the field limit."""
+        if self.final_block_pct_min is None and self.final_block_pct_max is None:
+            return None
+        return (
+            self.final_block_pct_min if self.final_block_pct_min is not None else MIN_FINAL_BLOCK_PCT,
+            self.final_block_pct_max if self.final_block_pct_max is not None else MAX_FINAL_BLOCK_PCT
+        )
+
+
+# Upper bounds on the size and duration of a single simulate_schedule_scenarios call
+MAX_SCENARIOS = 100_000
+MAX_SCENARIO_BIDS = 100_000
+MAX_SCENARIO_TIME_BUDGET = 300.0
+
+
+class SimulateScenariosInput(ScheduleParams):
+    """Input parameters for simulate_schedule_scenarios tool."""
+    total_supply: float = Field(
+        description="Tokens the schedule releases in full, in whole tokens (e.g. 1000000)",
+        gt=0
+    )
+    floor_price: float = Field(
+        description="Auction floor price, in currency per token (e.g. 0.1)",
+        gt=0
+    )
+    num_scenarios: int = Field(
+        default=1_000,
+        description=f"Number of randomized demand scenarios (default: 1000, max: {MAX_SCENARIOS:,})",
+        ge=1,
+        le=MAX_SCENARIOS
+    )
+    num_bids: int = Field(
+        default=1_000,
+        description=f"Bids per scenario (default: 1000, max: {MAX_SCENARIO_BIDS:,})",
+        ge=1,
+        le=MAX_SCENARIO_BIDS
+    )
+    expected_demand: Optional[float] = Field(
+        default=None,
+        description="Mean total bid budget per scenario, in currency (default: total_supply * floor_price)",
+        gt=0
+    )
+    demand_sigma: float = Field(
+        default=0.5,
+        description="Log-normal spread of total demand between scenarios (default: 0.5; 0 for none)",
+        ge=0
+    )
+    price_sigma: float = Field(
+        default=0.5,
+        description="Log-normal spread of bid prices over the floor price (default: 0.5)",
+        gt=0
+    )
+    seed: int = Field(
+        default=0,
+        description="Run seed; the same seed and parameters give the same scenarios (default: 0)"
+    )
+    time_budget: float = Field(
+        default=30.0,
+        description=(
+            "Seconds after which the run stops and reports the scenarios completed so far "
+            f"(default: 30, max: {MAX_SCENARIO_TIME_BUDGET:g})"
+        ),
+        gt=0,
+        le=MAX_SCENARIO_TIME_BUDGET
+    )
+
+
+class GetServerMetricsInput(BaseModel):
+    """Input parameters for get_server_metrics tool."""
+    diagnostics: Optional[Literal[DIAGNOSTICS_MODES]] = Field(
+        default=None,
+        description=(
+            "Switch the diagnostics mode for later calls: off (counters and histograms only), log (also log "
+            "one structured JSON line per call to stderr) or profile (also profile tool bodies with cProfile "
+            "and report the hottest functions). Omit to keep the current mode."
+        )
+    )
+    reset: bool = Field(
+        default=False,
+        description="Clear all metrics after reporting them"
+    )
+
+
+# Upper bound on the number of blocks a single query call may ask about
+MAX_QUERY_BLOCKS = 100_000
+
+
+class ScheduleSourceInput(BaseModel):
+    """A schedule given either by its generation parameters or by its encoding."""
+    schedule_params: Optional[ScheduleParams] = Field(
+        default=None,
+        description="generate_supply_schedule parameters of the schedule"
+    )
+    encoded: Optional[str] = Field(
+        default=None,
+        description="Packed auctionStepsData hex of the schedule (instead of schedule_params)"
+    )
+
+    @model_validator(mode="after")
+    def _check_source(self) -> "ScheduleSourceInput":
+        """Exactly one schedule source must be given."""
+        if (self.schedule_params is None) == (self.encoded is None):
+            raise ValueError("Provide exactly one of schedule_params or encoded")
+        return self
+
+    def source_key(self) -> tuple:
+        """Hashable key identifying the schedule."""
+        if self.schedule_params is not None:
+            return ("params", self.schedule_params.cache_key())
+        encoded = self.encoded.lower()
+        return ("encoded", encoded[2:] if encoded.startswith("0x") else encoded)
+
+
+class QueryScheduleInput(ScheduleSourceInput):
+    """Input parameters for query_supply_schedule tool."""
+    blocks: list[int] = Field(
+        description="Block numbers to query",
+        min_length=1,
+        max_length=MAX_QUERY_BLOCKS
+    )
+    start_block: int = Field(
+        default=0,
+        description="Block number at which the schedule starts (default: 0, i.e. blocks are offsets into the schedule)"
+    )
+
+
+def _to_token_units(value: Any) -> int:
+    """Parse an exact integer token amount from an integer or a decimal string (e.g. "1e29")."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            amount = Decimal(value.strip())
+        except InvalidOperation:
+            raise ValueError(f"total_supply {value!r} is not a number") from None
+        if amount.is_finite() and amount == amount.to_integral_value():
+            return int(amount)
+        raise ValueError(f"total_supply {value!r} is not a whole number of base units")
+    raise ValueError(
+        f"total_supply must be an integer or a decimal string, got {type(value).__name__} "
+        "(floats cannot represent large supplies exactly)"
+    )
+
+
+class TokenAmountsInput(ScheduleSourceInput):
+    """Input parameters for convert_to_token_amounts tool."""
+    total_supply: Annotated[int, WithJsonSchema({
+        "type": ["integer", "string"],
+        "description": (
+            "Total token supply in base units (e.g. wei), as an integer or a decimal string such as "
+            "\"100000000000000000000000000000\" or \"1e29\" (strings keep large values exact)"
+        )
+    })]
+    include_steps: bool = Field(
+        default=True,
+        description="Include the per-entry amounts (set false for just the totals)"
+    )
+
+    @field_validator("total_supply", mode="before")
+    @classmethod
+    def _parse_total_supply(cls, value: Any) -> int:
+        """Parse the supply exactly; floats are rejected."""
+        amount = _to_token_units(value)
+        if amount <= 0:
+            raise ValueError(f"total_supply must be positive, got {amount}")
+        return amount
 
 
 class EncodeScheduleInput(BaseModel):
     """Input parameters for encode_supply_schedule tool."""
-    schedule: list[dict[str, int]] = Field(
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    schedule: Annotated[SupplySchedule, WithJsonSchema({
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "mps": {
+                    "type": "integer",
+                    "description": "Tokens per block (max: 16777215 for 24-bit)",
+                    "minimum": 0,
+                    "maximum": 16777215
+                },
+                "blockDelta": {
+                    "type": "integer",
+                    "description": "Number of blocks (max: 1099511627775 for 40-bit)",
+                    "minimum": 0,
+                    "maximum": 1099511627775
+                }
+            },
+            "required": ["mps", "blockDelta"]
+        }
+    })] = Field(
         description="Supply schedule as array of {mps, blockDelta} objects"
     )
+    response_format: ResponseFormat = Field(
+        default="json",
+        description=RESPONSE_FORMAT_DESCRIPTION
+    )
+
+    @field_validator("schedule", mode="before")
+    @classmethod
+    def _to_supply_schedule(cls, value: Any) -> SupplySchedule:
+        """Convert the {mps, blockDelta} array straight into a SupplySchedule."""
+        return SupplySchedule.from_dicts(value)
+
+
+class DecodeScheduleInput(BaseModel):
+    """Input parameters for decode_supply_schedule tool."""
+    encoded: str = Field(
+        description="Packed auctionStepsData as a hex string (0x prefix optional)"
+    )
+    verify_round_trip: bool = Field(
+        default=True,
+        description="Re-encode the decoded schedule and confirm it matches the input byte for byte"
+    )
+    include_schedule: bool = Field(
+        default=True,
+        description="Include the decoded schedule array in the response"
+    )
+    response_format: ResponseFormat = Field(
+        default="json",
+        description=RESPONSE_FORMAT_DESCRIPTION
+    )
+
+
+# Upper bound on the number of combinations a single batch call may evaluate
+MAX_BATCH_COMBINATIONS = 250_000
+
+
+class GenerateScheduleBatchInput(BaseModel):
+    """Input parameters for generate_supply_schedule_batch tool."""
+    auction_blocks: Union[PositiveInt, list[PositiveInt]] = Field(
+        description="Auction length(s) in blocks"
+    )
+    prebid_blocks: Union[NonNegativeInt, list[NonNegativeInt]] = Field(
+        default=0,
+        description="Prebid period length(s) in blocks (default: 0)"
+    )
+    num_steps: Union[PositiveInt, list[PositiveInt]] = Field(
+        default=DEFAULT_NUM_STEPS,
+        description=f"Number(s) of steps for gradual release (default: {DEFAULT_NUM_STEPS})"
+    )
+    final_block_pct: Union[FinalBlockPct, list[FinalBlockPct]] = Field(
+        default=DEFAULT_FINAL_BLOCK_PCT,
+        description=f"Final block fraction(s) (default: {DEFAULT_FINAL_BLOCK_PCT}, range: 0.1-0.9)"
+    )
+    alpha: Union[Alpha, list[Alpha]] = Field(
+        default=DEFAULT_ALPHA,
+        description=f"Convexity exponent(s) (default: {DEFAULT_ALPHA})"
+    )
+    round_to_nearest: Union[Optional[PositiveInt], list[Optional[PositiveInt]]] = Field(
+        default=None,
+        description="Boundary rounding granularity(ies); null = no rounding"
+    )
+    curve: CurveName = Field(
+        default=DEFAULT_CURVE,
+        description="Release curve for every combination (see generate_supply_schedule)"
+    )
+    curve_params: Optional[dict[str, Any]] = Field(
+        default=None,
+        description="Parameters of the selected curve"
+    )
+    grid: bool = Field(
+        default=False,
+        description="Evaluate the cartesian product of all values instead of zipping them"
+    )
+    include_schedules: bool = Field(
+        default=False,
+        description="Include every generated schedule in the response (default: false)"
+    )
+
+    def combination_count(self) -> int:
+        """Number of combinations this request evaluates."""
+        lengths = [
+            len(v) if isinstance(v, list) else 1
+            for v in (self.auction_blocks, self.prebid_blocks, self.num_steps,
+                      self.final_block_pct, self.alpha, self.round_to_nearest)
+        ]
+        if self.grid:
+            count = 1
+            for length in lengths:
+                count *= length
+            return count
+        return max(lengths)
+
+
+def _input_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """JSON Schema for a tool's input model, without pydantic's generated titles."""
+    def strip_titles(node: Any) -> Any:
+        if isinstance(node, dict):
+            return {
+                key: strip_titles(value)
+                for key, value in node.items()
+                if not (key == "title" and isinstance(value, str))
+            }
+        if isinstance(node, list):
+            return [strip_titles(item) for item in node]
+        return node
+
+    schema = strip_titles(model.model_json_schema())
+    schema.pop("description", None)  # the model docstring; the tool has its own description
+    return schema
+
+
+# Tool definitions, built once at import from the input models so the schemas
+# cannot drift from validation and list_tools does no work per listing
+TOOLS = [
+    Tool(
+        name="generate_supply_schedule",
+        description=(
+            "Generate a CCA (Continuous Clearing Auction) supply schedule using a normalized convex curve. "
+            f"The schedule distributes supply equally across {DEFAULT_NUM_STEPS} steps (configurable) with "
+            f"time durations that DECREASE over time (convex curve property). Each step releases equal token amounts. "
+            f"Approximately {DEFAULT_FINAL_BLOCK_PCT*100}% of supply is reserved for the final block. "
+            "Returns an array of {mps, blockDelta} objects. "
+            "MPS = milli-basis points (1e7 = 10 million), representing tokens per block."
+        ),
+        inputSchema=_input_schema(GenerateScheduleInput)
+    ),
+    Tool(
+        name="generate_supply_schedule_batch",
+        description=(
+            "Generate CCA supply schedules for many parameter combinations in one call, for parameter sweeps. "
+            "Every parameter of generate_supply_schedule accepts a single value or an array. Arrays are zipped "
+            "element-wise (single values are broadcast), or combined as a cartesian product when grid is true. "
+            "Returns columnar results: one array per parameter plus total_phases, final_block_mps, "
+            "final_block_percentage, optional schedules and a per-combination error (null on success). "
+            f"At most {MAX_BATCH_COMBINATIONS} combinations per call."
+        ),
+        inputSchema=_input_schema(GenerateScheduleBatchInput)
+    ),
+    Tool(
+        name="generate_and_encode_supply_schedule",
+        description=(
+            "Generate a CCA supply schedule and encode it for onchain deployment in one call. "
+            "Takes the same parameters as generate_supply_schedule and returns its summary together with "
+            "the packed auctionStepsData hex string that encode_supply_schedule would return, without "
+            "sending the schedule back through the client. Set include_schedule to false to omit the "
+            "{mps, blockDelta} array for large step counts."
+        ),
+        inputSchema=_input_schema(GenerateAndEncodeInput)
+    ),
+    Tool(
+        name="encode_supply_schedule",
+        description=(
+            "Encode a CCA supply schedule to bytes for onchain deployment. "
+            "For each {mps, blockDelta} element, creates a uint64 where the first 24 bits are mps "
+            "and the next 40 bits are blockDelta. All uint64s are packed together (like Solidity's abi.encodePacked). "
+            "Returns a hex string with 0x prefix. This encoded bytes string is passed to the Factory's "
+            "initializeDistribution function as part of the configData parameter."
+        ),
+        inputSchema=_input_schema(EncodeScheduleInput)
+    ),
+    Tool(
+        name="decode_supply_schedule",
+        description=(
+            "Decode packed CCA auctionStepsData bytes back into a supply schedule (the inverse of "
+            "encode_supply_schedule). Each uint64 is split into its upper 24 bits (mps) and lower 40 bits "
+            "(blockDelta). Optionally re-encodes the result to confirm a byte-for-byte round trip. "
+            "Returns the schedule with element count, total MPS and total blocks, for auditing deployed configs."
+        ),
+        inputSchema=_input_schema(DecodeScheduleInput)
+    ),
+    Tool(
+        name="query_supply_schedule",
+        description=(
+            "Answer many supply-at-block queries against one schedule in a single call. The schedule is "
+            "given either as generate_supply_schedule parameters (schedule_params) or as packed "
+            "auctionStepsData hex (encoded), and indexed once with prefix sums. For each block returns the "
+            "active step index, the mps released in that block and the cumulative supply released up to "
+            f"and including it (in mps, out of {TOTAL_TARGET:,}). Blocks before start_block or after the "
+            f"schedule have a null step. At most {MAX_QUERY_BLOCKS:,} blocks per call."
+        ),
+        inputSchema=_input_schema(QueryScheduleInput)
+    ),
+    Tool(
+        name="convert_to_token_amounts",
+        description=(
+            "Convert a schedule from mps units to exact integer token amounts for a total supply in base "
+            "units (e.g. 1e29 wei, passed as a string to stay exact). The schedule is given as "
+            "generate_supply_schedule parameters (schedule_params) or packed auctionStepsData hex (encoded). "
+            "Returns, per entry, tokens_per_block (floor of total_supply * mps / 1e7), step_tokens, "
+            "cumulative_tokens and the rounding dust per-block flooring leaves out, plus totals. "
+            "Amounts are decimal strings."
+        ),
+        inputSchema=_input_schema(TokenAmountsInput)
+    ),
+    Tool(
+        name="simulate_schedule_scenarios",
+        description=(
+            "Monte Carlo risk analysis of a schedule: generates it from the generate_supply_schedule parameters, "
+            "then replays it against many randomized demand scenarios (synthetic bid books with random total "
+            "demand, bid prices and timing) with a CCA clearing simulation, on a process pool. Returns the mean, "
+            "min, max and quantiles (p5, p25, p50, p75, p95) of the final clearing price, average price, "
+            "currency raised, sell-through, final-block share of tokens sold and share of bids outbid. Stops "
+            "after time_budget seconds with the scenarios completed so far; clients that send a progress token "
+            "receive the running quantiles as progress notifications."
+        ),
+        inputSchema=_input_schema(SimulateScenariosInput)
+    ),
+    Tool(
+        name="get_server_metrics",
+        description=(
+            "Report this server process's metrics: per tool, the request and error counts, response payload "
+            "sizes and latency histograms (count, mean, max, p50/p95/p99 and buckets in ms) for the whole call "
+            "and its validation, generation, encoding and serialization phases; plus executor and cache "
+            "statistics. Can switch the diagnostics mode (off, log, profile) without restarting the server, "
+            "and reset the metrics."
+        ),
+        inputSchema=_input_schema(GetServerMetricsInput)
+    ),
+    Tool(
+        name="estimate_calldata_gas",
+        description=(
+            "Estimate the calldata gas of packed auctionStepsData. Counts zero and nonzero bytes "
+            f"(default {CALLDATA_ZERO_BYTE_GAS} and {CALLDATA_NONZERO_BYTE_GAS} gas per byte, configurable) and "
+            "returns length_bytes, zero_bytes, nonzero_bytes and gas."
+        ),
+        inputSchema=_input_schema(EstimateCalldataGasInput)
+    ),
+    Tool(
+        name="optimize_calldata_gas",
+        description=(
+            "Find the cheapest-to-deploy schedule close to the requested one. Takes the parameters of "
+            "generate_supply_schedule, tries nearby num_steps values and round_to_nearest values, and "
+            "returns the candidate with the lowest calldata gas whose cumulative release stays within "
+            "tolerance of the requested schedule, with the gas of the requested schedule for comparison."
+        ),
+        inputSchema=_input_schema(OptimizeCalldataGasInput)
+    ),
+    Tool(
+        name="check_schedule_feasibility",
+        description=(
+            "Check whether generate_supply_schedule parameters produce a valid schedule without generating "
+            "it. Rounding can make generation fail (a step ending before it starts, or the steps releasing "
+            "more than the total) or collapse steps to zero length. Common auction lengths and roundings are "
+            "answered instantly from a precomputed index; other parameters are checked in one pass over the "
+            "steps. Infeasible parameters come with suggested num_steps and round_to_nearest corrections."
+        ),
+        inputSchema=_input_schema(ScheduleParams)
+    ),
+    Tool(
+        name="solve_supply_schedule",
+        description=(
+            "Find schedule parameters that satisfy constraints in one call, instead of retrying "
+            "generate_supply_schedule. Takes the parameters of generate_supply_schedule as targets plus "
+            "constraints (max_mps, min_block_delta, final_block_pct_min/max, max_entries and allowed "
+            "round_to_nearest_candidates). Searches nearby num_steps, the final-block range and the rounding "
+            "candidates, and bisects alpha towards 1.0, returning the feasible parameters closest to the "
+            "targets with their schedule and encoding, or feasible: false with the requested parameters' "
+            "violations."
+        ),
+        inputSchema=_input_schema(SolveScheduleInput)
+    )
+]
 
 
 # Create MCP server instance
 server = Server("cca-supply-schedule")
 
+# In-process caches (sizes configurable via environment; 0 disables caching).
+# schedule_cache maps (tool name, input cache_key()) -> rendered response of generate_supply_schedule,
+# generate_and_encode_supply_schedule, optimize_calldata_gas and solve_supply_schedule; the tool
+# name keeps tools whose inputs serialize alike from sharing entries;
+# encoding_cache maps (SupplySchedule, response_format) -> rendered encode_supply_schedule response.
+schedule_cache = LRUCache(int(os.environ.get("CCA_SCHEDULE_CACHE_SIZE", "64")))
+encoding_cache = LRUCache(int(os.environ.get("CCA_ENCODING_CACHE_SIZE", "64")))
+
+# Indexed schedules for query_supply_schedule and convert_to_token_amounts, keyed by source_key()
+index_cache = LRUCache(int(os.environ.get("CCA_INDEX_CACHE_SIZE", "64")))
+
+# Per-tool request counts, payload sizes and phase latencies (diagnostics mode switchable at runtime
+# with get_server_metrics); tool bodies on the executor are profiled in "profile" mode
+server_metrics = ServerMetrics(os.environ.get("CCA_DIAGNOSTICS", "off"), logger)
+
+# Worker pool for tool bodies (mode, pool size, concurrency and timeout configurable via environment)
+executor = ToolExecutor.from_env()
+executor.instrument = server_metrics.instrument
+
+
+# The feasibility index and the schedule store are opened on the first call that needs them, not at
+# import, so cold start only pays for what listing tools needs.
+
+@functools.cache
+def schedule_store() -> Optional["ScheduleStore"]:
+    """
+    Optional on-disk store of generated schedules shared across restarts and server processes
+    (enabled by CCA_STORE_PATH), keyed by schedule_key(GenerateScheduleInput.generation_params()).
+    """
+    if not os.environ.get("CCA_STORE_PATH"):
+        return None
+    from store import ScheduleStore
+
+    return ScheduleStore.from_env()
+
+
+@functools.cache
+def feasibility_index() -> "FeasibilityIndex":
+    """Precomputed feasibility of common auction lengths and roundings (see build_feasibility_index.py)."""
+    from feasibility import DEFAULT_INDEX_PATH, FeasibilityIndex
+
+    try:
+        return FeasibilityIndex.load(os.environ.get("CCA_FEASIBILITY_INDEX", DEFAULT_INDEX_PATH))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Feasibility index not loaded, checking parameters on demand: {e}")
+        return FeasibilityIndex()
+
+
+def _render(output: dict[str, Any], response_format: ResponseFormat) -> str:
+    """
+    Serialize a tool response, appending its own size as payload_bytes.
+
+    payload_bytes is the UTF-8 size of the returned text, including the
+    payload_bytes field itself.
+    """
+    with phase("serialization"):
+        size = 0
+        while True:
+            output = {**output, "payload_bytes": size}
+            if response_format == "json":
+                text = json.dumps(output, indent=2)
+            else:
+                text = json.dumps(output, separators=(",", ":"))
+            # json.dumps output is ASCII, so characters == bytes
+            if len(text) == size:
+                return text
+
+            # Only the digit count of size changes the length; settle it before serializing again
+            base = len(text) - len(str(size))
+            size = base
+            while size != base + len(str(size)):
+                size = base + len(str(size))
+
+
+def _format_schedule(schedule: SupplySchedule, response_format: ResponseFormat) -> dict[str, Any]:
+    """The schedule in the requested format, keyed by its response field name."""
+    with phase("serialization"):
+        if response_format == "columnar":
+            return {"schedule": {"mps": schedule.mps.tolist(), "blockDelta": schedule.block_delta.tolist()}}
+        if response_format == "binary":
+            return {"schedule_base64": base64.b64encode(pack_supply_schedule(schedule)).decode("ascii")}
+        return {"schedule": schedule.to_dicts()}
+
+
+def _format_encoding(schedule: SupplySchedule, response_format: ResponseFormat) -> dict[str, Any]:
+    """The packed encoding in the requested format, with its length and element count."""
+    with phase("encoding"):
+        packed = pack_supply_schedule(schedule)
+        if response_format == "binary":
+            encoding = {"encoded_base64": base64.b64encode(packed).decode("ascii")}
+        else:
+            encoding = {"encoded": "0x" + packed.hex()}
+
+        return {
+            **encoding,
+            "length_bytes": len(packed),
+            "num_elements": len(schedule),
+            "calldata_gas": estimate_calldata_gas(packed)["gas"]
+        }
+
+
+def _generate(input_data: GenerateScheduleInput) -> tuple[SupplySchedule, Optional[dict[str, Any]]]:
+    """
+    Generate (and optionally compact) the schedule described by a generate_supply_schedule input.
+
+    Returns:
+        The schedule and, when compaction was requested, a report of the entries and bytes saved
+    """
+    with phase("generation"):
+        schedule = generate_schedule(**input_data.schedule_kwargs())
+        if input_data.compaction == "none":
+            return schedule, None
+
+        compacted = compact_schedule(schedule, max_entries=input_data.max_entries)
+    entries_saved = len(schedule) - len(compacted)
+    report = {
+        "mode": input_data.compaction,
+        "original_entries": len(schedule),
+        "entries": len(compacted),
+        "entries_saved": entries_saved,
+        "bytes_saved": entries_saved * ENCODED_ELEMENT_BYTES,
+        "max_release_deviation_mps": release_deviation(schedule, compacted)
+    }
+    return compacted, report
+
+
+def _schedule_summary(input_data: GenerateScheduleInput, schedule: SupplySchedule) -> dict[str, Any]:
+    """Summary statistics reported for a generated schedule."""
+    final_block_mps = schedule.final_block_mps
+    final_block_percentage = (final_block_mps / TOTAL_TARGET) * 100
+
+    summary = {
+        "total_mps": schedule.total_mps,
+        "target_mps": TOTAL_TARGET,
+        "final_block_mps": final_block_mps,
+        "final_block_percentage": round(final_block_percentage, 2),
+        "num_steps": input_data.num_steps,
+        "alpha": input_data.alpha,
+        "main_supply_pct": round((1.0 - input_data.final_block_pct) * 100, 2),
+        "step_tokens_pct": round((1.0 - input_data.final_block_pct) / input_data.num_steps * 100, 4)
+    }
+    if input_data.curve != DEFAULT_CURVE:
+        summary["curve"] = input_data.curve
+        summary["curve_params"] = CURVES[input_data.curve].resolve_params(input_data.curve_params)
+    return summary
+
+
+def _generate_summarized(
+    input_data: GenerateScheduleInput
+) -> tuple[SupplySchedule, dict[str, Any], Optional[dict[str, Any]]]:
+    """
+    Generate a schedule with its summary and compaction report, reusing the schedule store if enabled.
+
+    Returns:
+        The schedule, its summary and, when compaction was requested, the compaction report
+    """
+    store = schedule_store()
+    if store is None:
+        schedule, compaction = _generate(input_data)
+        return schedule, _schedule_summary(input_data, schedule), compaction
+
+    from store import StoredSchedule, schedule_key
+
+    key = schedule_key(input_data.generation_params())
+    stored = store.get(key)
+    if stored is not None:
+        try:
+            with phase("encoding"):
+                schedule = decode_supply_schedule(stored.steps)
+            if schedule.total_mps != TOTAL_TARGET:
+                raise ValueError(f"schedule releases {schedule.total_mps} mps, expected {TOTAL_TARGET}")
+        except ValueError as e:
+            # A corrupt entry is a miss: regenerate (and overwrite it) below
+            store.invalidate(key, str(e))
+        else:
+            return schedule, stored.summary, stored.compaction
+
+    schedule, compaction = _generate(input_data)
+    summary = _schedule_summary(input_data, schedule)
+    with phase("encoding"):
+        steps = pack_supply_schedule(schedule)
+    store.put(key, StoredSchedule(steps, summary, compaction))
+    return schedule, summary, compaction
+
+
+def _generate_schedule_response(input_data: GenerateScheduleInput) -> str:
+    """Generate a schedule and render the generate_supply_schedule response."""
+    # Generate schedule
+    schedule, summary, compaction = _generate_summarized(input_data)
+
+    # Format output
+    output = {
+        **_format_schedule(schedule, input_data.response_format),
+        "auction_blocks": input_data.auction_blocks,
+        "prebid_blocks": input_data.prebid_blocks,
+        "total_phases": len(schedule),
+        "summary": summary
+    }
+    if compaction is not None:
+        output["compaction"] = compaction
+
+    return _render(output, input_data.response_format)
+
+
+def _generate_and_encode_response(input_data: GenerateAndEncodeInput) -> str:
+    """Generate and encode a schedule and render the generate_and_encode_supply_schedule response."""
+    # Generate and encode in-process; the schedule never round-trips through JSON
+    schedule, summary, compaction = _generate_summarized(input_data)
+
+    # Format output (in binary format the packed encoding already is the schedule)
+    output = {
+        "auction_blocks": input_data.auction_blocks,
+        "prebid_blocks": input_data.prebid_blocks,
+        "total_phases": len(schedule),
+        "summary": summary,
+        **({"compaction": compaction} if compaction is not None else {}),
+        **_format_encoding(schedule, input_data.response_format)
+    }
+    if input_data.include_schedule and input_data.response_format != "binary":
+        output = {**_format_schedule(schedule, input_data.response_format), **output}
+
+    return _render(output, input_data.response_format)
+
+
+def _encode_schedule_response(input_data: EncodeScheduleInput) -> str:
+    """Encode a schedule and render the encode_supply_schedule response."""
+    # Encode schedule and format output
+    output = _format_encoding(input_data.schedule, input_data.response_format)
+
+    return _render(output, input_data.response_format)
+
+
+def _generate_schedule_batch_response(input_data: GenerateScheduleBatchInput) -> str:
+    """Generate a batch of schedules and render the generate_supply_schedule_batch response."""
+    combinations = input_data.combination_count()
+    if combinations > MAX_BATCH_COMBINATIONS:
+        raise ValueError(
+            f"Batch has {combinations} combinations, max is {MAX_BATCH_COMBINATIONS}"
+        )
+
+    # Generate all schedules
+    with phase("generation"):
+        results = generate_schedule_batch(
+            auction_blocks=input_data.auction_blocks,
+            prebid_blocks=input_data.prebid_blocks,
+            num_steps=input_data.num_steps,
+            final_block_pct=input_data.final_block_pct,
+            alpha=input_data.alpha,
+            round_to_nearest=input_data.round_to_nearest,
+            grid=input_data.grid,
+            include_schedules=input_data.include_schedules,
+            curve=input_data.curve,
+            curve_params=input_data.curve_params
+        )
+    if input_data.include_schedules:
+        results["schedule"] = [
+            schedule.to_dicts() if schedule is not None else None
+            for schedule in results["schedule"]
+        ]
+
+    # Format output
+    output = {
+        "num_combinations": len(results["error"]),
+        "num_errors": sum(1 for error in results["error"] if error is not None),
+        "target_mps": TOTAL_TARGET,
+        "results": results
+    }
+
+    return _render(output, "compact")
+
+
+def _decode_schedule_response(input_data: DecodeScheduleInput) -> str:
+    """Decode a schedule and render the decode_supply_schedule response."""
+    # Decode schedule
+    with phase("encoding"):
+        schedule = decode_supply_schedule(
+            input_data.encoded,
+            verify_round_trip=input_data.verify_round_trip
+        )
+
+    # Calculate summary statistics
+    total_mps = schedule.total_mps
+    total_blocks = schedule.total_blocks
+
+    # Format output
+    output = {
+        "num_elements": len(schedule),
+        "length_bytes": len(schedule) * 8,
+        "total_mps": total_mps,
+        "target_mps": TOTAL_TARGET,
+        "total_blocks": total_blocks,
+        "round_trip_verified": input_data.verify_round_trip
+    }
+    if input_data.include_schedule:
+        output.update(_format_schedule(schedule, input_data.response_format))
+
+    return _render(output, input_data.response_format)
+
+
+def _index_schedule(input_data: ScheduleSourceInput) -> SupplySchedule:
+    """Generate or decode the schedule and build its prefix-sum index."""
+    if input_data.schedule_params is not None:
+        with phase("generation"):
+            schedule = generate_schedule(**input_data.schedule_params.schedule_kwargs())
+    else:
+        with phase("encoding"):
+            schedule = decode_supply_schedule(input_data.encoded)
+
+    # Build the cached prefix sums now, so every later query is a bisect
+    schedule.cumulative_blocks
+    schedule.cumulative_mps
+    return schedule
+
+
+def _query_schedule_response(schedule: SupplySchedule, input_data: QueryScheduleInput) -> str:
+    """Answer block queries and render the query_supply_schedule response."""
+    # Query offsets into the schedule
+    start = input_data.start_block
+    results = schedule.query_blocks([block - start for block in input_data.blocks])
+    results["block"] = input_data.blocks
+
+    # Format output
+    output = {
+        "num_queries": len(input_data.blocks),
+        "start_block": start,
+        "total_blocks": schedule.total_blocks,
+        "total_mps": schedule.total_mps,
+        "target_mps": TOTAL_TARGET,
+        "results": results
+    }
+
+    return _render(output, "compact")
+
+
+def _token_amounts_response(schedule: SupplySchedule, input_data: TokenAmountsInput) -> str:
+    """Convert to token amounts and render the convert_to_token_amounts response."""
+    amounts = token_amounts(schedule, input_data.total_supply)
+
+    # Format output (amounts as decimal strings, exact for any JSON client)
+    output = {
+        "total_supply": str(amounts["total_supply"]),
+        "allocated_tokens": str(amounts["allocated_tokens"]),
+        "total_dust": str(amounts["total_dust"]),
+        "unallocated_tokens": str(amounts["unallocated_tokens"]),
+        "total_mps": schedule.total_mps,
+        "target_mps": TOTAL_TARGET,
+        "num_elements": len(schedule)
+    }
+    if input_data.include_steps:
+        output["steps"] = {
+            "mps": schedule.mps.tolist(),
+            "blockDelta": schedule.block_delta.tolist(),
+            **{
+                column: [str(amount) for amount in amounts[column]]
+                for column in ("tokens_per_block", "step_tokens", "cumulative_tokens", "dust")
+            }
+        }
+
+    return _render(output, "compact")
+
+
+def _estimate_calldata_gas_response(input_data: EstimateCalldataGasInput) -> str:
+    """Estimate calldata gas and render the estimate_calldata_gas response."""
+    output = estimate_calldata_gas(
+        input_data.encoded,
+        zero_byte_gas=input_data.zero_byte_gas,
+        nonzero_byte_gas=input_data.nonzero_byte_gas
+    )
+
+    return _render(output, "json")
+
+
+def _optimize_calldata_gas_response(input_data: OptimizeCalldataGasInput) -> str:
+    """Search for the cheapest schedule and render the optimize_calldata_gas response."""
+    # Search nearby parameters
+    with phase("generation"):
+        result = optimize_calldata_gas(
+            **input_data.schedule_kwargs(),
+            tolerance=input_data.tolerance,
+            num_steps_radius=input_data.num_steps_radius,
+            rounding_candidates=input_data.round_to_nearest_candidates,
+            zero_byte_gas=input_data.zero_byte_gas,
+            nonzero_byte_gas=input_data.nonzero_byte_gas
+        )
+
+    # Format output (schedules only on request)
+    def candidate(entry: dict[str, Any], include_schedule: bool) -> dict[str, Any]:
+        schedule = entry["schedule"]
+        formatted = {key: value for key, value in entry.items() if key != "schedule"}
+        formatted["total_phases"] = len(schedule)
+        if include_schedule:
+            formatted["schedule"] = schedule.to_dicts()
+            formatted["encoded"] = encode_supply_schedule(schedule)
+        return formatted
+
+    output = {
+        "requested": candidate(result["requested"], False),
+        "best": candidate(result["best"], input_data.include_schedule),
+        "gas_saved": result["gas_saved"],
+        "tolerance_mps": round(input_data.tolerance * TOTAL_TARGET),
+        "candidates_evaluated": result["candidates_evaluated"],
+        "candidates_within_tolerance": result["candidates_within_tolerance"]
+    }
+
+    return _render(output, "json")
+
+
+def _solve_schedule_response(input_data: SolveScheduleInput) -> str:
+    """Search for feasible parameters and render the solve_supply_schedule response."""
+    # Search around the requested parameters
+    with phase("generation"):
+        result = solve_schedule(
+            **input_data.schedule_kwargs(),
+            max_mps=input_data.max_mps,
+            min_block_delta=input_data.min_block_delta,
+            final_block_pct_range=input_data.final_block_pct_range(),
+            max_entries=input_data.max_entries,
+            rounding_candidates=input_data.round_to_nearest_candidates,
+            num_steps_radius=input_data.num_steps_radius
+        )
+
+    # Format output
+    best = result["best"]
+    if best is not None:
+        schedule = best["schedule"]
+        best = {"params": best["params"], "metrics": best["metrics"], "total_phases": len(schedule)}
+        if input_data.include_schedule:
+            best["schedule"] = schedule.to_dicts()
+            best["encoded"] = encode_supply_schedule(schedule)
+
+    output = {
+        "feasible": result["feasible"],
+        "requested": result["requested"],
+        "best": best,
+        "candidates_evaluated": result["candidates_evaluated"]
+    }
+
+    return _render(output, "json")
+
+
+def _scenarios_output(
+    input_data: SimulateScenariosInput,
+    schedule: SupplySchedule,
+    summary: dict[str, Any]
+) -> dict[str, Any]:
+    """The simulate_schedule_scenarios response for a running or final summary."""
+    return {
+        "num_scenarios": summary["num_scenarios"],
+        "completed": summary["completed"],
+        "budget_exhausted": summary["budget_exhausted"],
+        "elapsed_seconds": round(summary["elapsed"], 3),
+        "seed": input_data.seed,
+        "total_phases": len(schedule),
+        "final_block_percentage": round(schedule.final_block_mps / TOTAL_TARGET * 100, 2),
+        "metrics": summary["metrics"]
+    }
+
+
+def _scenario_schedule(input_data: SimulateScenariosInput) -> SupplySchedule:
+    """Generate the schedule the scenarios run against."""
+    with phase("generation"):
+        return generate_schedule(**input_data.schedule_kwargs())
+
+
+async def _run_scenarios(input_data: SimulateScenariosInput) -> str:
+    """
+    Run the scenarios and render the simulate_schedule_scenarios response.
+
+    The runner uses its own process pool (shared across calls), so it is driven from a thread
+    rather than through the tool executor; each running summary it yields is
+    forwarded as a progress notification when the client asked for progress.
+    """
+    from scenarios import iter_scenario_summaries
+
+    schedule = await executor.run(_scenario_schedule, input_data)
+    summaries = iter_scenario_summaries(
+        schedule,
+        input_data.num_scenarios,
+        total_supply=input_data.total_supply,
+        floor_price=input_data.floor_price,
+        num_bids=input_data.num_bids,
+        expected_demand=input_data.expected_demand,
+        demand_sigma=input_data.demand_sigma,
+        price_sigma=input_data.price_sigma,
+        seed=input_data.seed,
+        time_budget=input_data.time_budget
+    )
+
+    try:
+        context = server.request_context
+        progress_token = context.meta.progressToken if context.meta is not None else None
+    except LookupError:  # Called outside an MCP request (e.g. from tests)
+        context, progress_token = None, None
+
+    summary = None
+    try:
+        while (latest := await asyncio.to_thread(next, summaries, None)) is not None:
+            summary = latest
+            if progress_token is not None:
+                await context.session.send_progress_notification(
+                    progress_token,
+                    summary["completed"],
+                    summary["num_scenarios"],
+                    message=json.dumps(_scenarios_output(input_data, schedule, summary), separators=(",", ":"))
+                )
+    finally:
+        try:
+            summaries.close()
+        except ValueError:  # Still running in its thread after a cancellation; it stops at the next yield
+            pass
+
+    return _render(_scenarios_output(input_data, schedule, summary), "json")
+
+
+def _server_metrics_response(input_data: GetServerMetricsInput, store_stats: Optional[dict[str, Any]]) -> str:
+    """Report (and optionally reset) the metrics and render the get_server_metrics response."""
+    output = {
+        **server_metrics.snapshot(),
+        "executor": executor.stats(),
+        "caches": {
+            "schedule": schedule_cache.stats(),
+            "encoding": encoding_cache.stats(),
+            "index": index_cache.stats()
+        }
+    }
+    if store_stats is not None:
+        output["caches"]["store"] = store_stats
+    if input_data.reset:
+        server_metrics.reset()
+    if input_data.diagnostics is not None:
+        server_metrics.set_diagnostics(input_data.diagnostics)
+        output["diagnostics"] = input_data.diagnostics
+
+    return _render(output, "json")
+
+
+def _check_feasibility_response(input_data: ScheduleParams) -> str:
+    """Check the parameters and render the check_schedule_feasibility response."""
+    from feasibility import check_parameters, suggest_corrections
+
+    params = input_data.schedule_kwargs()
+    index = feasibility_index()
+    output = check_parameters(index, params)
+    output["suggestions"] = [] if output["feasible"] else suggest_corrections(index, params)
+
+    return _render(output, "json")
+
+
+async def _infeasible_response(input_data: ScheduleParams, message: str) -> Optional[list[TextContent]]:
+    """Error response for parameters the feasibility index knows to fail, None otherwise."""
+    from feasibility import FAILS
+
+    if not feasibility_index.cache_info().currsize:
+        # Read and parse the index file in a thread on first use, off the event loop
+        await asyncio.to_thread(feasibility_index)
+    if feasibility_index().status(input_data.schedule_kwargs()) != FAILS:
+        return None
+    mark_error()
+    return _text_response(await executor.run(_infeasible_text, input_data, message))
+
+
+def _infeasible_text(input_data: ScheduleParams, message: str) -> str:
+    """Render the error for parameters the feasibility index knows to fail, with suggested corrections."""
+    from feasibility import check_parameters, suggest_corrections
+
+    params = input_data.schedule_kwargs()
+    index = feasibility_index()
+    result = check_parameters(index, params)
+    return json.dumps({
+        "error": result["error"],
+        "message": message,
+        "suggestions": suggest_corrections(index, params)
+    })
+
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
+    return TOOLS
+
+
+def _text_response(text: str) -> list[TextContent]:
+    """Wrap a rendered response as MCP text content."""
     return [
-        Tool(
-            name="generate_supply_schedule",
-            description=(
-                "Generate a CCA (Continuous Clearing Auction) supply schedule using a normalized convex curve. "
-                f"The schedule distributes supply equally across {DEFAULT_NUM_STEPS} steps (configurable) with "
-                f"time durations that DECREASE over time (convex curve property). Each step releases equal token amounts. "
-                f"Approximately {DEFAULT_FINAL_BLOCK_PCT*100}% of supply is reserved for the final block. "
-                "Returns an array of {mps, blockDelta} objects. "
-                "MPS = milli-basis points (1e7 = 10 million), representing tokens per block."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "auction_blocks": {
-                        "type": "integer",
-                        "description": "Total number of blocks for the auction (e.g., 86400 for 2 days on Base with 2s blocks)",
-                        "minimum": 1
-                    },
-                    "prebid_blocks": {
-                        "type": "integer",
-                        "description": "Number of blocks for prebid period with 0 mps (default: 0)",
-                        "minimum": 0,
-                        "default": 0
-                    },
-                    "num_steps": {
-                        "type": "integer",
-                        "description": f"Number of steps for gradual release (default: {DEFAULT_NUM_STEPS})",
-                        "minimum": 1,
-                        "default": DEFAULT_NUM_STEPS
-                    },
-                    "final_block_pct": {
-                        "type": "number",
-                        "description": f"Percentage of supply for final block as decimal (default: {DEFAULT_FINAL_BLOCK_PCT}, range: 0.1-0.9)",
-                        "minimum": 0.1,
-                        "maximum": 0.9,
-                        "default": DEFAULT_FINAL_BLOCK_PCT
-                    },
-                    "alpha": {
-                        "type": "number",
-                        "description": f"Convexity exponent for curve C(t) = t^alpha (default: {DEFAULT_ALPHA})",
-                        "minimum": 0,
-                        "default": DEFAULT_ALPHA
-                    },
-                    "round_to_nearest": {
-                        "type": "integer",
-                        "description": "Round block boundaries to nearest N blocks (e.g., 100). Omit for no rounding.",
-                        "minimum": 1
-                    }
-                },
-                "required": ["auction_blocks"]
-            }
-        ),
-        Tool(
-            name="encode_supply_schedule",
-            description=(
-                "Encode a CCA supply schedule to bytes for onchain deployment. "
-                "For each {mps, blockDelta} element, creates a uint64 where the first 24 bits are mps "
-                "and the next 40 bits are blockDelta. All uint64s are packed together (like Solidity's abi.encodePacked). "
-                "Returns a hex string with 0x prefix. This encoded bytes string is passed to the Factory's "
-                "initializeDistribution function as part of the configData parameter."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "schedule": {
-                        "type": "array",
-                        "description": "Supply schedule as array of {mps, blockDelta} objects",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "mps": {
-                                    "type": "integer",
-                                    "description": "Tokens per block (max: 16777215 for 24-bit)",
-                                    "minimum": 0,
-                                    "maximum": 16777215
-                                },
-                                "blockDelta": {
-                                    "type": "integer",
-                                    "description": "Number of blocks (max: 1099511627775 for 40-bit)",
-                                    "minimum": 0,
-                                    "maximum": 1099511627775
-                                }
-                            },
-                            "required": ["mps", "blockDelta"]
-                        }
-                    }
-                },
-                "required": ["schedule"]
-            }
+        TextContent(
+            type="text",
+            text=text
         )
     ]
 
 
+def _error_response(e: Exception, message: str) -> list[TextContent]:
+    """Log a tool failure and render it as an error response."""
+    logger.error(f"{message}: {e}", exc_info=True)
+    mark_error()
+    return _text_response(json.dumps({
+        "error": str(e),
+        "message": message
+    }))
+
+
+def _validate(model: type[BaseModel], arguments: Any) -> Any:
+    """Validate tool arguments against the tool's input model, timed as the validation phase."""
+    with phase("validation"):
+        return model(**arguments)
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool calls."""
+    """Handle tool calls, tracking per-tool metrics."""
+    with server_metrics.track(name) as record:
+        response = await _dispatch(name, arguments)
+        record.payload_bytes = sum(len(content.text.encode()) for content in response)
+        return response
+
+
+async def _dispatch(name: str, arguments: Any) -> list[TextContent]:
+    """Run a tool call."""
     if name == "generate_supply_schedule":
         try:
             # Validate input
-            input_data = GenerateScheduleInput(**arguments)
-
-            # Generate schedule
-            schedule = generate_schedule(
-                auction_blocks=input_data.auction_blocks,
-                prebid_blocks=input_data.prebid_blocks,
-                num_steps=input_data.num_steps,
-                final_block_pct=input_data.final_block_pct,
-                alpha=input_data.alpha,
-                round_to_nearest=input_data.round_to_nearest
-            )
+            input_data = _validate(GenerateScheduleInput, arguments)
 
-            # Calculate summary statistics
-            total_mps = sum(item["mps"] * item["blockDelta"] for item in schedule)
-            final_block_mps = schedule[-1]["mps"]
-            final_block_percentage = (final_block_mps / TOTAL_TARGET) * 100
-
-            # Format output
-            output = {
-                "schedule": schedule,
-                "auction_blocks": input_data.auction_blocks,
-                "prebid_blocks": input_data.prebid_blocks,
-                "total_phases": len(schedule),
-                "summary": {
-                    "total_mps": total_mps,
-                    "target_mps": TOTAL_TARGET,
-                    "final_block_mps": final_block_mps,
-                    "final_block_percentage": round(final_block_percentage, 2),
-                    "num_steps": input_data.num_steps,
-                    "alpha": input_data.alpha,
-                    "main_supply_pct": round((1.0 - input_data.final_block_pct) * 100, 2),
-                    "step_tokens_pct": round((1.0 - input_data.final_block_pct) / input_data.num_steps * 100, 4)
-                }
-            }
+            # Reject parameters known to fail before doing any work
+            rejected = await _infeasible_response(input_data, "Failed to generate supply schedule")
+            if rejected is not None:
+                return rejected
 
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(output, indent=2)
-                )
-            ]
+            # Generate schedule off the event loop (cached; concurrent identical calls share one computation)
+            async def compute() -> str:
+                return await executor.run(_generate_schedule_response, input_data)
+
+            return _text_response(await schedule_cache.get_or_compute((name, input_data.cache_key()), compute))
         except Exception as e:
-            logger.error(f"Error generating supply schedule: {e}", exc_info=True)
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "error": str(e),
-                        "message": "Failed to generate supply schedule"
-                    })
-                )
-            ]
+            return _error_response(e, "Failed to generate supply schedule")
+
+    elif name == "generate_supply_schedule_batch":
+        try:
+            # Validate input
+            input_data = _validate(GenerateScheduleBatchInput, arguments)
+
+            # Generate all schedules off the event loop
+            return _text_response(await executor.run(_generate_schedule_batch_response, input_data))
+        except Exception as e:
+            return _error_response(e, "Failed to generate supply schedule batch")
+
+    elif name == "generate_and_encode_supply_schedule":
+        try:
+            # Validate input
+            input_data = _validate(GenerateAndEncodeInput, arguments)
+
+            # Reject parameters known to fail before doing any work
+            rejected = await _infeasible_response(input_data, "Failed to generate and encode supply schedule")
+            if rejected is not None:
+                return rejected
+
+            # Generate and encode off the event loop (cached alongside generate_supply_schedule responses)
+            async def compute() -> str:
+                return await executor.run(_generate_and_encode_response, input_data)
+
+            return _text_response(await schedule_cache.get_or_compute((name, input_data.cache_key()), compute))
+        except Exception as e:
+            return _error_response(e, "Failed to generate and encode supply schedule")
 
     elif name == "encode_supply_schedule":
         try:
             # Validate input
-            input_data = EncodeScheduleInput(**arguments)
+            input_data = _validate(EncodeScheduleInput, arguments)
 
-            # Encode schedule
-            encoded = encode_supply_schedule(input_data.schedule)
+            # Encode schedule off the event loop (cached by schedule contents and format)
+            async def compute() -> str:
+                return await executor.run(_encode_schedule_response, input_data)
 
-            # Calculate output statistics
-            length_bytes = (len(encoded) - 2) // 2  # Subtract '0x' and divide by 2 (2 hex chars per byte)
-            num_elements = len(input_data.schedule)
+            cache_key = (input_data.schedule, input_data.response_format)
+            return _text_response(await encoding_cache.get_or_compute(cache_key, compute))
+        except Exception as e:
+            return _error_response(e, "Failed to encode supply schedule")
 
-            # Format output
-            output = {
-                "encoded": encoded,
-                "length_bytes": length_bytes,
-                "num_elements": num_elements
-            }
+    elif name == "decode_supply_schedule":
+        try:
+            # Validate input
+            input_data = _validate(DecodeScheduleInput, arguments)
 
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(output, indent=2)
-                )
-            ]
+            # Decode schedule off the event loop
+            return _text_response(await executor.run(_decode_schedule_response, input_data))
         except Exception as e:
-            logger.error(f"Error encoding supply schedule: {e}", exc_info=True)
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "error": str(e),
-                        "message": "Failed to encode supply schedule"
-                    })
-                )
-            ]
+            return _error_response(e, "Failed to decode supply schedule")
+
+    elif name == "query_supply_schedule":
+        try:
+            # Validate input
+            input_data = _validate(QueryScheduleInput, arguments)
+
+            # Build the index once per schedule (cached), then query off the event loop
+            async def compute() -> SupplySchedule:
+                return await executor.run(_index_schedule, input_data)
+
+            schedule = await index_cache.get_or_compute(input_data.source_key(), compute)
+            return _text_response(await executor.run(_query_schedule_response, schedule, input_data))
+        except Exception as e:
+            return _error_response(e, "Failed to query supply schedule")
+
+    elif name == "convert_to_token_amounts":
+        try:
+            # Validate input
+            input_data = _validate(TokenAmountsInput, arguments)
+
+            # Reuse the indexed schedule (shared with query_supply_schedule), then convert off the event loop
+            async def compute() -> SupplySchedule:
+                return await executor.run(_index_schedule, input_data)
+
+            schedule = await index_cache.get_or_compute(input_data.source_key(), compute)
+            return _text_response(await executor.run(_token_amounts_response, schedule, input_data))
+        except Exception as e:
+            return _error_response(e, "Failed to convert to token amounts")
+
+    elif name == "estimate_calldata_gas":
+        try:
+            # Validate input
+            input_data = _validate(EstimateCalldataGasInput, arguments)
+
+            # Count bytes off the event loop
+            return _text_response(await executor.run(_estimate_calldata_gas_response, input_data))
+        except Exception as e:
+            return _error_response(e, "Failed to estimate calldata gas")
+
+    elif name == "optimize_calldata_gas":
+        try:
+            # Validate input
+            input_data = _validate(OptimizeCalldataGasInput, arguments)
+
+            # Search off the event loop (cached by parameters)
+            async def compute() -> str:
+                return await executor.run(_optimize_calldata_gas_response, input_data)
+
+            return _text_response(await schedule_cache.get_or_compute((name, input_data.cache_key()), compute))
+        except Exception as e:
+            return _error_response(e, "Failed to optimize calldata gas")
+
+    elif name == "check_schedule_feasibility":
+        try:
+            # Validate input
+            input_data = _validate(ScheduleParams, arguments)
+
+            # Look up or check off the event loop
+            return _text_response(await executor.run(_check_feasibility_response, input_data))
+        except Exception as e:
+            return _error_response(e, "Failed to check schedule feasibility")
+
+    elif name == "solve_supply_schedule":
+        try:
+            # Validate input
+            input_data = _validate(SolveScheduleInput, arguments)
+
+            # Search off the event loop (cached by parameters and constraints)
+            async def compute() -> str:
+                return await executor.run(_solve_schedule_response, input_data)
+
+            return _text_response(await schedule_cache.get_or_compute((name, input_data.cache_key()), compute))
+        except Exception as e:
+            return _error_response(e, "Failed to solve supply schedule")
+
+    elif name == "simulate_schedule_scenarios":
+        try:
+            # Validate input
+            input_data = _validate(SimulateScenariosInput, arguments)
+
+            # Reject parameters known to fail before doing any work
+            rejected = await _infeasible_response(input_data, "Failed to simulate schedule scenarios")
+            if rejected is not None:
+                return rejected
+
+            # Run on the scenario runner's process pool, streaming progress (not cached: results depend
+            # on the time budget)
+            return _text_response(await _run_scenarios(input_data))
+        except Exception as e:
+            return _error_response(e, "Failed to simulate schedule scenarios")
+
+    elif name == "get_server_metrics":
+        try:
+            # Validate input
+            input_data = _validate(GetServerMetricsInput, arguments)
+
+            # The store is queried (SQLite) in a thread, in this process where its counters live
+            store = schedule_store()
+            store_stats = await asyncio.to_thread(store.stats) if store is not None else None
+
+            # Snapshot on the event loop, where the metrics are updated
+            return _text_response(_server_metrics_response(input_data, store_stats))
+        except Exception as e:
+            return _error_response(e, "Failed to get server metrics")
 
     else:
         raise ValueError(f"Unknown tool: {name}")
 
 
-async def main():
+def _parse_args(argv: Optional[list[str]]) -> "argparse.Namespace":
+    """Command-line options; each defaults to its environment variable."""
+    import argparse
+
+    import transport
+
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description="CCA Supply Schedule MCP Server")
+    parser.add_argument(
+        "--transport", choices=("stdio", "http"), default=env("CCA_TRANSPORT", "stdio"),
+        help="stdio (one client per process) or http (Streamable HTTP, many clients per process)"
+    )
+    parser.add_argument("--host", default=env("CCA_HTTP_HOST", transport.DEFAULT_HOST), help="HTTP bind address")
+    parser.add_argument(
+        "--port", type=int, default=int(env("CCA_HTTP_PORT", transport.DEFAULT_PORT)), help="HTTP port"
+    )
+    parser.add_argument(
+        "--max-in-flight", type=int, default=int(env("CCA_HTTP_MAX_IN_FLIGHT", transport.DEFAULT_MAX_IN_FLIGHT)),
+        help="Max HTTP requests processed at once"
+    )
+    parser.add_argument(
+        "--max-queued", type=int, default=int(env("CCA_HTTP_MAX_QUEUED", transport.DEFAULT_MAX_QUEUED)),
+        help="Max HTTP requests waiting for a slot; further requests get 503"
+    )
+    parser.add_argument(
+        "--keep-alive", type=float, default=float(env("CCA_HTTP_KEEP_ALIVE", transport.DEFAULT_KEEP_ALIVE)),
+        help="Seconds idle HTTP connections are kept open"
+    )
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None):
     """Run the MCP server."""
-    from mcp.server.stdio import stdio_server
-
-    async with stdio_server() as (read_stream, write_stream):
-        logger.info("CCA Supply Schedule MCP Server starting...")
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    args = _parse_args(argv)
+    try:
+        if args.transport == "http":
+            from transport import serve_http
+
+            logger.info(
+                f"CCA Supply Schedule MCP Server listening on http://{args.host}:{args.port}/mcp "
+                f"(executor: {executor.stats()})..."
+            )
+            await serve_http(
+                server,
+                host=args.host,
+                port=args.port,
+                max_in_flight=args.max_in_flight,
+                max_queued=args.max_queued,
+                keep_alive=args.keep_alive,
+                stats=lambda: {"executor": executor.stats()}
+            )
+        else:
+            from mcp.server.stdio import stdio_server
+
+            async with stdio_server() as (read_stream, write_stream):
+                logger.info(f"CCA Supply Schedule MCP Server starting (executor: {executor.stats()})...")
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options()
+                )
+    finally:
+        executor.shutdown()
+        if "scenarios" in sys.modules:
+            sys.modules["scenarios"].shutdown_pools()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Clearing Simulation
+
+Replays a supply schedule block by block against a bid book to show how an
+auction would clear: the clearing price, tokens sold and currency raised in
+every block. Used to compare alpha / final_block_pct choices against
+synthetic bid flow before deploying.
+
+Clearing model (prices in currency per token, amounts in currency units):
+
+- A bid placed at block s with max price p and budget A spends its budget
+  over the rest of the auction in proportion to the supply released, i.e.
+  A * mps_t / R(s) in block t, where R(s) is the supply (in mps) released
+  from block s on. Its spending rate per mps, w = A / R(s), is constant.
+- Each block sells total_supply * mps_t / 1e7 tokens at a uniform clearing
+  price, the lowest price at which the bids priced strictly above it demand
+  no more than the supply. Because every bid's spending scales with mps_t,
+  the clearing price depends only on the set of active bids, not on mps_t.
+- The price never drops below the floor price or the previous block's
+  price. Bids priced below it are outbid and stop spending; bids priced
+  exactly at it are filled pro rata. Supply the bids do not absorb (at the
+  floor price) is unsold.
+- A bid must be priced above the clearing price when it is placed and is
+  rejected otherwise, as are bids placed after the last block that releases
+  supply.
+
+The active set, and so the price, only changes at blocks where bids arrive,
+so the simulation works per arrival block rather than per block: bid
+weights live in a Fenwick tree over price ranks, the clearing price is
+found with one O(log n) descent, outbid bids come off a heap, and the
+per-block columns are filled a segment at a time. A 2-day auction on Base
+(86,400 blocks) against 100,000 bids simulates in about a second.
+
+Like logic.py, this module has no external dependencies.
+"""
+
+import heapq
+import itertools
+import math
+import operator
+import random
+from array import array
+from typing import Any, Sequence, Union
+
+from logic import SupplySchedule, TOTAL_TARGET
+
+# Columns of a bid book
+BID_COLUMNS = ("block", "max_price", "amount")
+
+
+class _Fenwick:
+    """Fenwick (binary indexed) tree of float weights over price ranks."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0.0] * (size + 1)
+        self.top_bit = 1 << (size.bit_length() - 1) if size else 0
+
+    def add(self, rank: int, delta: float) -> None:
+        i = rank + 1
+        tree = self.tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+
+def synthetic_bids(
+    num_bids: int,
+    num_blocks: int,
+    floor_price: float,
+    seed: int = 0,
+    price_sigma: float = 0.5,
+    mean_amount: float = 1.0,
+    amount_sigma: float = 1.0
+) -> dict[str, array]:
+    """
+    Generate a random bid book.
+
+    Bids arrive uniformly over the first num_blocks blocks, are priced at
+    floor_price * (1 + X) with X log-normal (median 1, spread price_sigma),
+    and have log-normal budgets with mean mean_amount. The same arguments
+    always produce the same book.
+
+    Args:
+        num_bids: Number of bids
+        num_blocks: Blocks bids arrive over (usually the schedule's total_blocks)
+        floor_price: Auction floor price, in currency per token
+        seed: Random seed
+        price_sigma: Log-normal sigma of the price markup over the floor
+        mean_amount: Mean bid budget, in currency units
+        amount_sigma: Log-normal sigma of the budgets
+
+    Returns:
+        Columnar dict with 'block' (array of int) and 'max_price' and 'amount'
+        (arrays of float), sorted by block
+
+    Raises:
+        ValueError: If a count or price is not positive
+    """
+    if num_bids < 0 or num_blocks <= 0:
+        raise ValueError(f"num_bids must be non-negative and num_blocks positive, got {num_bids}, {num_blocks}")
+    if floor_price <= 0 or mean_amount <= 0:
+        raise ValueError(f"floor_price and mean_amount must be positive, got {floor_price}, {mean_amount}")
+
+    rng = random.Random(seed)
+    amount_mu = math.log(mean_amount) - amount_sigma * amount_sigma / 2
+    blocks = sorted(rng.randrange(num_blocks) for _ in range(num_bids))
+    return {
+        "block": array('q', blocks),
+        "max_price": array('d', (floor_price * (1.0 + rng.lognormvariate(0.0, price_sigma)) for _ in range(num_bids))),
+        "amount": array('d', (rng.lognormvariate(amount_mu, amount_sigma) for _ in range(num_bids))),
+    }
+
+
+def _per_block_mps(schedule: SupplySchedule) -> array:
+    """mps of every block, expanded from the schedule entries."""
+    per_block = array('d')
+    for mps, block_delta in zip(schedule.mps, schedule.block_delta):
+        per_block.extend(array('d', [float(mps)]) * block_delta)
+    return per_block
+
+
+def simulate_auction(
+    schedule: Union[SupplySchedule, list[dict[str, int]]],
+    bids: dict[str, Sequence],
+    total_supply: float,
+    floor_price: float
+) -> dict[str, Any]:
+    """
+    Replay a schedule block by block against a bid book.
+
+    Args:
+        schedule: SupplySchedule or list of {mps, blockDelta} dicts
+        bids: Columnar bid book with 'block' (offset into the schedule),
+            'max_price' (currency per token) and 'amount' (currency budget),
+            as returned by synthetic_bids(); need not be sorted
+        total_supply: Tokens the schedule releases in full, in token units
+        floor_price: Auction floor price, in currency per token
+
+    Returns:
+        Dict with per-block arrays 'clearing_price', 'tokens_sold' and
+        'currency_raised' (one float per block of the schedule), and totals
+        'total_tokens_sold', 'total_currency_raised', 'unsold_tokens'
+        (supply released but not sold), 'final_clearing_price',
+        'average_price' (None if nothing sold), 'bids_accepted',
+        'bids_rejected' and 'bids_outbid'
+
+    Raises:
+        ValueError: If the bid book is malformed or a price or supply is not positive
+    """
+    schedule = SupplySchedule.from_dicts(schedule)
+    try:
+        block_col, price_col, amount_col = (bids[column] for column in BID_COLUMNS)
+    except KeyError as e:
+        raise ValueError(f"Bid book must have columns {', '.join(BID_COLUMNS)}: missing {e}") from None
+    num_bids = len(block_col)
+    if len(price_col) != num_bids or len(amount_col) != num_bids:
+        raise ValueError(
+            f"Bid columns must have equal lengths, got {num_bids}, {len(price_col)}, {len(amount_col)}"
+        )
+    if total_supply <= 0 or floor_price <= 0:
+        raise ValueError(f"total_supply and floor_price must be positive, got {total_supply}, {floor_price}")
+
+    total_blocks = schedule.total_blocks
+    total_mps = schedule.total_mps
+    tokens_per_mps = total_supply / TOTAL_TARGET
+
+    # Price ranks: prices[rank] ascending, with +inf past the highest
+    prices = sorted(set(price_col))
+    rank_of = {price: rank for rank, price in enumerate(prices)}
+    prices.append(math.inf)
+    fenwick = _Fenwick(len(prices) - 1)
+    tree = fenwick.tree
+    level = [0.0] * len(prices)  # Active weight at each rank
+
+    clearing_price = array('d')
+    rate = array('d')  # Currency spent per mps in each block
+    active = []  # Heap of (max_price, weight) for outbid removal
+    total_weight = 0.0
+    price = floor_price
+    spend = 0.0
+    accepted = rejected = outbid = 0
+
+    order = sorted(range(num_bids), key=block_col.__getitem__)
+    position = 0
+    for block, group in itertools.groupby(order, key=block_col.__getitem__):
+        if block >= total_blocks:
+            rejected += num_bids - accepted - rejected
+            break
+        remaining = total_mps - schedule.released_before(max(block, 0))
+        if block < 0 or remaining <= 0:
+            rejected += sum(1 for _ in group)
+            continue
+
+        # Blocks since the last arrival clear at the last price
+        clearing_price.extend(array('d', [price]) * (block - position))
+        rate.extend(array('d', [spend]) * (block - position))
+        position = block
+
+        # Add the block's bids
+        for i in group:
+            bid_price = price_col[i]
+            amount = amount_col[i]
+            if bid_price <= price or amount <= 0:
+                rejected += 1
+                continue
+            weight = amount / remaining
+            rank = rank_of[bid_price]
+            fenwick.add(rank, weight)
+            level[rank] += weight
+            total_weight += weight
+            heapq.heappush(active, (bid_price, weight))
+            accepted += 1
+
+        # Lowest price at which the bids strictly above it spend no more than the supply is worth:
+        # the first rank count m with (total_weight - prefix(m)) < tokens_per_mps * prices[m]
+        if total_weight < tokens_per_mps * prices[0]:
+            market = total_weight / tokens_per_mps
+        else:
+            # Largest m where the condition still fails, by Fenwick descent
+            m = 0
+            prefix = 0.0
+            step = fenwick.top_bit
+            while step:
+                candidate = m + step
+                if candidate <= fenwick.size:
+                    candidate_prefix = prefix + tree[candidate]
+                    if total_weight - candidate_prefix >= tokens_per_mps * prices[candidate]:
+                        m = candidate
+                        prefix = candidate_prefix
+                step >>= 1
+            above = max(total_weight - prefix - level[m], 0.0)
+            market = max(prices[m], above / tokens_per_mps)
+        price = max(price, market)
+
+        # Drop outbid bids; the price is unchanged since they were below it
+        while active and active[0][0] < price:
+            bid_price, weight = heapq.heappop(active)
+            rank = rank_of[bid_price]
+            fenwick.add(rank, -weight)
+            level[rank] -= weight
+            total_weight -= weight
+            outbid += 1
+        total_weight = max(total_weight, 0.0)
+        spend = min(total_weight, tokens_per_mps * price)
+
+    clearing_price.extend(array('d', [price]) * (total_blocks - position))
+    rate.extend(array('d', [spend]) * (total_blocks - position))
+
+    per_block_mps = _per_block_mps(schedule)
+    currency_raised = array('d', map(operator.mul, per_block_mps, rate))
+    tokens_sold = array('d', map(operator.truediv, currency_raised, clearing_price))
+    total_tokens_sold = math.fsum(tokens_sold)
+    total_currency_raised = math.fsum(currency_raised)
+
+    return {
+        "clearing_price": clearing_price,
+        "tokens_sold": tokens_sold,
+        "currency_raised": currency_raised,
+        "total_tokens_sold": total_tokens_sold,
+        "total_currency_raised": total_currency_raised,
+        "unsold_tokens": max(tokens_per_mps * total_mps - total_tokens_sold, 0.0),
+        "final_clearing_price": price,
+        "average_price": total_currency_raised / total_tokens_sold if total_tokens_sold else None,
+        "bids_accepted": accepted,
+        "bids_rejected": rejected,
+        "bids_outbid": outbid,
+    }
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - Persistent Schedule Store
+
+Optional on-disk cache of generated schedules that survives server
+restarts and is shared by every server process on the machine. Entries are
+content-addressed: the key is a SHA-256 of the normalized generation
+parameters and ALGORITHM_VERSION, so a schedule is only ever reused for
+exactly the parameters and algorithm that produced it, and bumping the
+version orphans every older entry (they are dropped when a store opens).
+
+Each entry holds the packed auctionStepsData (which decodes losslessly to
+the schedule), the schedule summary and the compaction report, if any.
+
+The store is a SQLite database in WAL mode: readers never block each other
+or the writer, writers from several processes are serialized by SQLite's
+own locking (waiting up to BUSY_TIMEOUT_MS), and eviction runs in the
+writer's transaction. When the entries exceed max_bytes, the least
+recently used ones are deleted until they fit in EVICT_TO_FRACTION of it.
+
+The store is strictly a cache: a database that cannot be opened, read or
+written, or an entry that does not decode, is logged and counted in the
+errors counter (corrupt entries are deleted), and the caller simply
+generates the schedule again.
+
+Like logic.py, this module has no external dependencies (sqlite3 is part of
+the standard library, and is imported on first use to keep cold start fast).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
+
+from logic import ALGORITHM_VERSION
+
+if TYPE_CHECKING:
+    import sqlite3
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Fraction of max_bytes the entries are evicted down to once they exceed it
+EVICT_TO_FRACTION = 0.9
+
+# How long a connection waits for another process's write lock
+BUSY_TIMEOUT_MS = 5_000
+
+# Entries read more recently than this are not re-stamped on a hit (saves a write per read)
+ACCESS_RESOLUTION_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    key TEXT PRIMARY KEY,
+    algorithm INTEGER NOT NULL,
+    steps BLOB NOT NULL,
+    summary TEXT NOT NULL,
+    compaction TEXT,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schedules_accessed ON schedules (accessed);
+"""
+
+logger = logging.getLogger("cca-supply-schedule")
+
+
+class StoredSchedule(NamedTuple):
+    """A stored schedule: packed auctionStepsData, summary and compaction report."""
+    steps: bytes
+    summary: dict[str, Any]
+    compaction: Optional[dict[str, Any]]
+
+
+def schedule_key(params: dict[str, Any]) -> str:
+    """Content address of the schedule generated from params (JSON-serializable) by ALGORITHM_VERSION."""
+    canonical = json.dumps(
+        {"algorithm": ALGORITHM_VERSION, "params": params},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ScheduleStore:
+    """
+    SQLite-backed store of generated schedules, safe to share between threads and processes.
+
+    Every thread (and every process, after a fork) opens its own
+    connection on first use.
+
+    Counters (of this process):
+        hits: Lookups served from the store
+        misses: Lookups that found nothing
+        writes: Entries stored
+        evictions: Entries deleted to stay within max_bytes
+        errors: Failed reads or writes and corrupt entries (treated as misses / skipped)
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path: Database file (created with its directory if missing)
+            max_bytes: Max total size of the stored entries
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ScheduleStore"]:
+        """Build a store from CCA_STORE_PATH and CCA_STORE_MAX_MB, or None if CCA_STORE_PATH is unset."""
+        path = os.environ.get("CCA_STORE_PATH")
+        if not path:
+            return None
+        max_mb = os.environ.get("CCA_STORE_MAX_MB")
+        return cls(path, int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES)
+
+    def _connect(self) -> "sqlite3.Connection":
+        """This thread's connection, opened (and the schema set up) on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        import sqlite3
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        connection.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.executescript(_SCHEMA)
+        # Entries of other algorithm versions can never be hit again
+        connection.execute("DELETE FROM schedules WHERE algorithm != ?", (ALGORITHM_VERSION,))
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get(self, key: str) -> Optional[StoredSchedule]:
+        """The schedule stored under key (marking it recently used), or None (also if the entry is corrupt)."""
+        import sqlite3
+
+        try:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT steps, summary, compaction, accessed FROM schedules WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            steps, summary, compaction, accessed = row
+            stored = StoredSchedule(
+                bytes(steps),
+                json.loads(summary),
+                json.loads(compaction) if compaction is not None else None
+            )
+            if not isinstance(stored.summary, dict) or not isinstance(stored.compaction, (dict, type(None))):
+                raise ValueError("summary and compaction must be JSON objects")
+            now = time.time()
+            if now - accessed > ACCESS_RESOLUTION_SECONDS:
+                connection.execute("UPDATE schedules SET accessed = ? WHERE key = ?", (now, key))
+        except (sqlite3.Error, OSError) as e:
+            self._count("errors")
+            logger.warning(f"Schedule store read failed ({self.path}): {e}")
+            return None
+        except (ValueError, TypeError) as e:
+            self.invalidate(key, str(e))
+            return None
+
+        self._count("hits")
+        return stored
+
+    def invalidate(self, key: str, reason: str) -> None:
+        """Count a corrupt entry as an error and delete it, so the next put() replaces it."""
+        import sqlite3
+
+        self._count("errors")
+        logger.warning(f"Schedule store entry {key} is corrupt, discarding it ({self.path}): {reason}")
+        try:
+            self._connect().execute("DELETE FROM schedules WHERE key = ?", (key,))
+        except (sqlite3.Error, OSError):
+            pass
+
+    def put(self, key: str, stored: StoredSchedule) -> None:
+        """Store a schedule under key, then evict least recently used entries beyond max_bytes."""
+        import sqlite3
+
+        summary = json.dumps(stored.summary, separators=(",", ":"))
+        compaction = json.dumps(stored.compaction, separators=(",", ":")) if stored.compaction is not None else None
+        size = len(stored.steps) + len(summary) + len(compaction or "")
+        if size > self.max_bytes:
+            return
+
+        try:
+            connection = self._connect()
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO schedules VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, ALGORITHM_VERSION, stored.steps, summary, compaction, size, now, now)
+                )
+                evicted = self._evict(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, OSError) as e:
+            self._count("errors")
+            logger.warning(f"Schedule store write failed ({self.path}): {e}")
+            return
+
+        self._count("writes")
+        self._count("evictions", evicted)
+
+    def _evict(self, connection: "sqlite3.Connection") -> int:
+        """Delete least recently used entries until they fit; returns how many were deleted."""
+        (total,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM schedules").fetchone()
+        if total <= self.max_bytes:
+            return 0
+
+        target = total - int(self.max_bytes * EVICT_TO_FRACTION)
+        freed = 0
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM schedules ORDER BY accessed, created"):
+            victims.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        connection.executemany("DELETE FROM schedules WHERE key = ?", victims)
+        return len(victims)
+
+    def clear(self) -> None:
+        """Delete every entry (counters are kept)."""
+        self._connect().execute("DELETE FROM schedules")
+
+    def close(self) -> None:
+        """Close this thread's connection (others close when their threads exit)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of the size, limits and counters."""
+        import sqlite3
+
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM schedules"
+            ).fetchone()
+        except (sqlite3.Error, OSError):
+            entries = size = None
+        return {
+            "path": self.path,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
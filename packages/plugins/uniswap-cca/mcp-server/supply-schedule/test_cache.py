@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test the LRU cache used by the MCP server.
+"""
+
+import asyncio
+
+from cache import LRUCache
+
+
+def test_lru_eviction():
+    """Test LRU ordering, eviction and counters."""
+    print("Testing LRU eviction...")
+
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1, "Expected cached value for 'a'"
+
+    # 'b' is now least recently used and gets evicted
+    cache.put("c", 3)
+    assert "b" not in cache, "'b' should have been evicted"
+    assert "a" in cache and "c" in cache, "'a' and 'c' should still be cached"
+    assert cache.get("b", "missing") == "missing", "Evicted key should return the default"
+
+    stats = cache.stats()
+    print(f"  Stats: {stats}")
+    assert stats == {"size": 2, "maxsize": 2, "hits": 1, "misses": 1, "coalesced": 0, "evictions": 1}
+
+    # maxsize=0 disables storage
+    disabled = LRUCache(maxsize=0)
+    disabled.put("a", 1)
+    assert len(disabled) == 0, "Disabled cache should not store entries"
+    print("\n✓ LRU eviction test passed!")
+
+
+def test_single_flight():
+    """Test that concurrent identical computations are shared."""
+    print("\nTesting single-flight deduplication...")
+
+    cache = LRUCache(maxsize=8)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        results = await asyncio.gather(*[cache.get_or_compute("key", compute) for _ in range(10)])
+        # A later call is a plain hit
+        results.append(await cache.get_or_compute("key", compute))
+        return results
+
+    results = asyncio.run(run())
+    stats = cache.stats()
+    print(f"  Computations: {len(calls)}, stats: {stats}")
+
+    assert results == ["value"] * 11, f"Unexpected results: {results}"
+    assert len(calls) == 1, f"Expected one computation, got {len(calls)}"
+    assert stats["misses"] == 1 and stats["coalesced"] == 9 and stats["hits"] == 1
+    print("\n✓ Single-flight test passed!")
+
+
+def test_failures_not_cached():
+    """Test that failed computations propagate to all waiters and are not cached."""
+    print("\nTesting failure propagation...")
+
+    cache = LRUCache(maxsize=8)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *[cache.get_or_compute("key", fail) for _ in range(3)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results), f"Expected ValueErrors, got {results}"
+    assert "key" not in cache, "Failures should not be cached"
+    print(f"  ✓ {len(results)} waiters received: {results[0]!r}")
+    print("\n✓ Failure propagation test passed!")
+
+
+def test_cancelled_caller():
+    """Test that cancelling one caller does not cancel the others or the shared computation."""
+    print("\nTesting cancellation of a single caller...")
+
+    cache = LRUCache(maxsize=8)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def abandoned():
+        await asyncio.sleep(0.05)
+        return "abandoned"
+
+    async def run():
+        first = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0.01)
+        # The caller that started the computation gives up
+        first.cancel()
+        value = await second
+        try:
+            await first
+            assert False, "Cancelled caller should raise CancelledError"
+        except asyncio.CancelledError:
+            pass
+
+        # Once every caller has given up, the computation is cancelled and not cached
+        lone = asyncio.create_task(cache.get_or_compute("other", abandoned))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        await asyncio.gather(lone, return_exceptions=True)
+        await asyncio.sleep(0.06)
+        return value
+
+    value = asyncio.run(run())
+    assert value == "value", f"Uncancelled caller got {value!r}"
+    assert len(calls) == 1, f"Expected one computation, got {len(calls)}"
+    assert cache.get("key") == "value", "Shared computation should have been cached"
+    assert "other" not in cache, "Computation abandoned by every caller should not be cached"
+    print("  ✓ Remaining caller received the value and it was cached")
+    print("\n✓ Cancelled caller test passed!")
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_single_flight()
+    test_failures_not_cached()
+    test_cancelled_caller()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
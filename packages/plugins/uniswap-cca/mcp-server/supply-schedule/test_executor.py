@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the worker-pool executor used by the MCP server.
+"""
+
+import asyncio
+import time
+
+from executor import ToolExecutor
+from logic import generate_schedule, encode_supply_schedule
+
+
+def _encode_generated(auction_blocks: int) -> str:
+    """Picklable tool body used by the process-pool test."""
+    return encode_supply_schedule(generate_schedule(auction_blocks))
+
+
+def test_execution_modes():
+    """Test that every mode returns the same result as a direct call."""
+    print("Testing execution modes...")
+
+    expected = _encode_generated(86400)
+    for mode in ("inline", "thread", "process"):
+        executor = ToolExecutor(mode=mode, max_workers=2)
+        try:
+            result = asyncio.run(executor.run(_encode_generated, 86400))
+        finally:
+            executor.shutdown()
+        assert result == expected, f"{mode} mode returned a different result"
+        print(f"  ✓ {mode} mode matches direct call")
+
+    try:
+        ToolExecutor(mode="fibers")
+        assert False, "Should have raised ValueError for an unknown mode"
+    except ValueError as e:
+        print(f"  ✓ Unknown mode rejected: {e}")
+
+    print("\n✓ Execution modes test passed!")
+
+
+def test_concurrency_limit():
+    """Test that at most max_concurrency calls run at once."""
+    print("\nTesting concurrency limit...")
+
+    executor = ToolExecutor(mode="thread", max_workers=4, max_concurrency=2)
+    running = []
+    peak = []
+
+    def body():
+        running.append(1)
+        peak.append(len(running))
+        time.sleep(0.02)
+        running.pop()
+
+    async def run():
+        await asyncio.gather(*[executor.run(body) for _ in range(8)])
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    print(f"  Peak concurrent calls: {max(peak)}")
+    assert max(peak) <= 2, f"Expected at most 2 concurrent calls, got {max(peak)}"
+    print("\n✓ Concurrency limit test passed!")
+
+
+def test_timeout():
+    """Test that slow calls time out without blocking the event loop."""
+    print("\nTesting per-call timeout...")
+
+    executor = ToolExecutor(mode="thread", max_workers=1, timeout=0.05)
+
+    async def run():
+        start = time.perf_counter()
+        try:
+            await executor.run(time.sleep, 0.5)
+            assert False, "Should have raised TimeoutError"
+        except TimeoutError as e:
+            elapsed = time.perf_counter() - start
+            print(f"  ✓ Timed out after {elapsed:.3f}s: {e}")
+            assert elapsed < 0.4, f"Timeout took too long: {elapsed:.3f}s"
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    print("\n✓ Timeout test passed!")
+
+
+if __name__ == "__main__":
+    test_execution_modes()
+    test_concurrency_limit()
+    test_timeout()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test the feasibility index used by the MCP server.
+"""
+
+import json
+import os
+import tempfile
+
+from feasibility import (
+    FeasibilityIndex,
+    check_parameters,
+    suggest_corrections,
+    default_auction_lengths,
+    DEFAULT_INDEX_PATH,
+    FEASIBLE,
+    COLLAPSED,
+    FAILS,
+)
+from logic import check_feasibility
+
+
+def _params(auction_blocks: int, num_steps: int, round_to_nearest=None, **overrides) -> dict:
+    """generate_schedule keyword arguments with default curve parameters."""
+    return {
+        "auction_blocks": auction_blocks,
+        "prebid_blocks": 0,
+        "num_steps": num_steps,
+        "final_block_pct": 0.3,
+        "alpha": 1.2,
+        "round_to_nearest": round_to_nearest,
+        "curve": "power",
+        "curve_params": None,
+        **overrides,
+    }
+
+
+def test_index_matches_check():
+    """Test that index statuses agree with check_feasibility."""
+    print("Testing index statuses...")
+
+    index = FeasibilityIndex.build([1_800, 7_200], roundings=(None, 100, 500), max_num_steps=64)
+    seen = set()
+    for auction_blocks in (1_800, 7_200):
+        for rounding in (None, 100, 500):
+            for num_steps in range(1, 65):
+                params = _params(auction_blocks, num_steps, rounding)
+                result = check_feasibility(**params)
+                expected = FEASIBLE if result["feasible"] else (COLLAPSED if result["generates"] else FAILS)
+                assert index.status(params) == expected, f"Status mismatch for {params}"
+                seen.add(expected)
+    assert seen == {FEASIBLE, COLLAPSED, FAILS}, f"Expected every status to be exercised, got {seen}"
+    print(f"  ✓ {len(index)} entries agree with check_feasibility")
+
+    # Parameters outside the index are not answered
+    assert index.status(_params(1_801, 12)) is None, "Unindexed auction length"
+    assert index.status(_params(1_800, 65)) is None, "num_steps beyond max_num_steps"
+    assert index.status(_params(1_800, 12, alpha=1.5)) is None, "Non-default alpha"
+    assert index.status(_params(1_800, 12, curve="logistic")) is None, "Non-default curve"
+    print("  ✓ Uncovered parameters return None")
+    print("\n✓ Index status test passed!")
+
+
+def test_save_and_load():
+    """Test the stored format and the shipped index."""
+    print("\nTesting save and load...")
+
+    index = FeasibilityIndex.build([3_600], roundings=(None, 1_000), max_num_steps=32)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.json")
+        index.save(path)
+        loaded = FeasibilityIndex.load(path)
+        assert loaded.to_dict() == index.to_dict(), "Round trip should preserve the index"
+
+        with open(path) as f:
+            data = json.load(f)
+        data["version"] = 0
+        with open(path, "w") as f:
+            json.dump(data, f)
+        try:
+            FeasibilityIndex.load(path)
+            assert False, "Should have raised ValueError for an old index version"
+        except ValueError as e:
+            print(f"  ✓ Old version rejected: {e}")
+
+    # The shipped index covers the default lengths and agrees with spot checks
+    shipped = FeasibilityIndex.load(DEFAULT_INDEX_PATH)
+    lengths = {int(key.split(":")[0]) for key in shipped.entries}
+    assert lengths == set(default_auction_lengths()), "Shipped index should cover every default length"
+    for auction_blocks, num_steps, rounding in ((86_400, 12, None), (86_400, 40, 5_000), (1_800, 40, 500), (43_200, 200, 100)):
+        params = _params(auction_blocks, num_steps, rounding)
+        assert check_parameters(shipped, params)["feasible"] == check_feasibility(**params)["feasible"]
+    print(f"  ✓ Shipped index loaded ({len(shipped)} entries, {os.path.getsize(DEFAULT_INDEX_PATH)} bytes)")
+    print("\n✓ Save and load test passed!")
+
+
+def test_suggestions():
+    """Test that suggested corrections are feasible."""
+    print("\nTesting suggestions...")
+
+    index = FeasibilityIndex.load(DEFAULT_INDEX_PATH)
+    empty = FeasibilityIndex()
+    for params in (_params(86_400, 40, 5_000), _params(1_800, 40, 500), _params(86_401, 40, 5_000)):
+        result = check_parameters(index, params)
+        assert not result["feasible"], f"Expected {params} to be infeasible"
+        suggestions = suggest_corrections(index, params)
+        assert suggestions == suggest_corrections(empty, params), "Index and computed suggestions should agree"
+        assert {key for s in suggestions for key in s} == {"num_steps", "round_to_nearest"}
+        for suggestion in suggestions:
+            assert check_feasibility(**{**params, **suggestion})["feasible"], f"Infeasible suggestion {suggestion}"
+        print(f"  ✓ {result['source']}: {suggestions}")
+
+    print("\n✓ Suggestions test passed!")
+
+
+if __name__ == "__main__":
+    test_index_matches_check()
+    test_save_and_load()
+    test_suggestions()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
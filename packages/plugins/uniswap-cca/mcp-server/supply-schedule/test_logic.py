@@ -3,11 +3,41 @@
 Test the supply schedule generation logic with normalized convex curve.
 """
 
+import io
+import itertools
+import math
+import os
+import socket
+import tempfile
+from fractions import Fraction
+
 # Import the logic to test (from logic.py, not server.py, to avoid mcp dependency)
 from logic import (
     generate_schedule,
+    generate_schedule_batch,
+    iter_schedule,
+    write_supply_schedule,
+    export_dense_emission,
+    dense_emission_size,
+    DenseEmission,
     encode_supply_schedule,
+    pack_supply_schedule,
+    decode_supply_schedule,
+    compact_schedule,
+    release_deviation,
+    estimate_calldata_gas,
+    optimize_calldata_gas,
+    solve_schedule,
+    check_feasibility,
+    schedule_violations,
+    token_amounts,
+    numeric_inverse,
+    _sampled_table,
+    get_curve,
+    CURVES,
+    SupplySchedule,
     TOTAL_TARGET,
+    SOLVER_ALPHA_STEP,
     DEFAULT_NUM_STEPS,
     DEFAULT_FINAL_BLOCK_PCT,
     DEFAULT_ALPHA,
@@ -351,6 +381,26 @@ def test_encode_schedule():
     assert len(encoded_generated) > 2, "Generated schedule encoding should have content"
     print(f"  ✓ Generated schedule encodes successfully: {len(generated)} phases, {len(encoded_generated)} chars")
 
+    # Test 7: Raw bytes and memoryview output match the hex encoding
+    print("\nTest 7: Raw packed output")
+    packed = pack_supply_schedule(generated)
+    view = pack_supply_schedule(generated, as_memoryview=True)
+    assert isinstance(packed, bytes), f"Expected bytes, got {type(packed)}"
+    assert isinstance(view, memoryview), f"Expected memoryview, got {type(view)}"
+    assert "0x" + packed.hex() == encoded_generated, "Packed bytes should match the hex encoding"
+    assert view.tobytes() == packed, "memoryview should expose the same bytes"
+    assert pack_supply_schedule([]) == b"", "Empty schedule should pack to empty bytes"
+    print(f"  ✓ Raw packed output matches: {len(packed)} bytes")
+
+    # Test 8: Negative values are rejected
+    print("\nTest 8: Negative values")
+    try:
+        encode_supply_schedule([{"mps": -1, "blockDelta": 1000}])
+        assert False, "Should have raised ValueError for negative mps"
+    except ValueError as e:
+        assert "non-negative" in str(e), f"Expected non-negative error, got: {e}"
+        print(f"  ✓ Negative mps rejected: {e}")
+
     print("\n✓ encode_supply_schedule test passed!")
 
 
@@ -397,6 +447,678 @@ def test_rounding_validation():
     print("\n✓ Rounding validation test passed!")
 
 
+def test_batch_schedule():
+    """Test that generate_schedule_batch matches generate_schedule for every combination."""
+    print("\nTesting batch schedule generation...")
+
+    blocks = [14400, 43200, 86400]
+    steps = [8, 12]
+    alphas = [1.0, 1.2, 1.5]
+    roundings = [None, 100]
+
+    batch = generate_schedule_batch(
+        auction_blocks=blocks,
+        num_steps=steps,
+        alpha=alphas,
+        round_to_nearest=roundings,
+        grid=True
+    )
+
+    expected_count = len(blocks) * len(steps) * len(alphas) * len(roundings)
+    assert len(batch["error"]) == expected_count, f"Expected {expected_count} combinations, got {len(batch['error'])}"
+
+    for i in range(expected_count):
+        expected = generate_schedule(
+            auction_blocks=batch["auction_blocks"][i],
+            prebid_blocks=batch["prebid_blocks"][i],
+            num_steps=batch["num_steps"][i],
+            final_block_pct=batch["final_block_pct"][i],
+            alpha=batch["alpha"][i],
+            round_to_nearest=batch["round_to_nearest"][i]
+        )
+        assert batch["error"][i] is None, f"Combination {i} failed: {batch['error'][i]}"
+        assert batch["schedule"][i] == expected, f"Combination {i} differs from generate_schedule"
+        assert batch["final_block_mps"][i] == expected[-1]["mps"], f"Combination {i} final block mismatch"
+    print(f"  ✓ Grid of {expected_count} combinations matches generate_schedule")
+
+    # Zipped mode broadcasts scalars and one-element sequences
+    zipped = generate_schedule_batch(auction_blocks=[14400, 86400], num_steps=[12], alpha=1.2)
+    assert zipped["num_steps"] == [12, 12], f"Expected broadcast num_steps, got {zipped['num_steps']}"
+    assert zipped["auction_blocks"] == [14400, 86400]
+    print("  ✓ Scalars and one-element sequences broadcast in zipped mode")
+
+    # Mismatched lengths cannot be broadcast
+    try:
+        generate_schedule_batch(auction_blocks=[14400, 86400], alpha=[1.0, 1.2, 1.5])
+        assert False, "Should have raised ValueError for mismatched lengths"
+    except ValueError as e:
+        assert "Cannot broadcast" in str(e), f"Expected broadcast error, got: {e}"
+        print(f"  ✓ Mismatched lengths rejected: {e}")
+
+    # Invalid combinations report errors without failing the batch
+    mixed = generate_schedule_batch(auction_blocks=86400, num_steps=[12, 0], include_schedules=False)
+    assert "schedule" not in mixed, "Schedules should be omitted when include_schedules=False"
+    assert mixed["error"][0] is None and mixed["total_phases"][0] == 13
+    assert mixed["error"][1] is not None and mixed["total_phases"][1] is None
+    print(f"  ✓ Per-combination errors reported: {mixed['error'][1]}")
+
+    print("\n✓ Batch schedule test passed!")
+
+
+def test_decode_schedule():
+    """Test decode_supply_schedule as the inverse of encode_supply_schedule."""
+    print("\nTesting decode_supply_schedule function...")
+
+    # Test 1: Round trip of a generated schedule
+    schedule = generate_schedule(86400, 43200, round_to_nearest=100)
+    encoded = encode_supply_schedule(schedule)
+    decoded = decode_supply_schedule(encoded, verify_round_trip=True)
+    assert decoded == schedule, "Decoded schedule should match the original"
+    print(f"  ✓ Generated schedule round-trips: {len(decoded)} elements")
+
+    # Test 2: Boundary values and accepted input forms
+    max_mps = 2**24 - 1
+    max_block_delta = 2**40 - 1
+    boundary = [
+        {"mps": max_mps, "blockDelta": max_block_delta},
+        {"mps": 0, "blockDelta": 0},
+        {"mps": 1, "blockDelta": max_block_delta},
+        {"mps": max_mps, "blockDelta": 1}
+    ]
+    encoded_boundary = encode_supply_schedule(boundary)
+    assert decode_supply_schedule(encoded_boundary) == boundary, "Boundary values should decode exactly"
+    assert decode_supply_schedule(encoded_boundary[2:]) == boundary, "Hex without 0x prefix should decode"
+    assert decode_supply_schedule(bytes.fromhex(encoded_boundary[2:])) == boundary, "Raw bytes should decode"
+    assert decode_supply_schedule("0x") == [], "Empty input should decode to an empty schedule"
+    print("  ✓ Boundary values decode exactly from hex and raw bytes")
+
+    # Test 3: Malformed input
+    for bad, expected in [("0x1234", "multiple of 8"), ("0xzz", "not valid hex")]:
+        try:
+            decode_supply_schedule(bad)
+            assert False, f"Should have raised ValueError for {bad}"
+        except ValueError as e:
+            assert expected in str(e), f"Expected '{expected}' error, got: {e}"
+            print(f"  ✓ Malformed input rejected: {e}")
+
+    print("\n✓ decode_supply_schedule test passed!")
+
+
+def test_supply_schedule_type():
+    """Test the array-backed SupplySchedule type."""
+    print("\nTesting SupplySchedule type...")
+
+    entries = [
+        {"mps": 0, "blockDelta": 100},
+        {"mps": 50, "blockDelta": 1000},
+        {"mps": 9950000, "blockDelta": 1}
+    ]
+    schedule = SupplySchedule.from_dicts(entries)
+
+    # Dict-compatible sequence behaviour
+    assert len(schedule) == 3, f"Expected 3 entries, got {len(schedule)}"
+    assert schedule[1] == {"mps": 50, "blockDelta": 1000}, f"Unexpected entry: {schedule[1]}"
+    assert schedule[-1]["mps"] == 9950000, "Negative indexing should return the final block"
+    assert list(schedule) == entries, "Iteration should yield the original dicts"
+    assert schedule.to_dicts() == entries, "to_dicts should round-trip"
+    assert schedule == entries, "SupplySchedule should compare equal to the dict form"
+    assert schedule[1:] == entries[1:], "Slicing should return the matching entries"
+    assert SupplySchedule.from_dicts(schedule) is schedule, "from_dicts should not copy a SupplySchedule"
+    assert SupplySchedule.from_pairs([(0, 100), (50, 1000), (9950000, 1)]) == schedule
+    print("  ✓ Behaves as a sequence of {mps, blockDelta} dicts")
+
+    # Cached totals and prefix sums
+    assert schedule.total_mps == TOTAL_TARGET, f"Expected {TOTAL_TARGET}, got {schedule.total_mps}"
+    assert schedule.total_blocks == 1101, f"Expected 1101 blocks, got {schedule.total_blocks}"
+    assert schedule.final_block_mps == 9950000
+    assert list(schedule.cumulative_blocks) == [0, 100, 1100, 1101]
+    assert list(schedule.cumulative_mps) == [0, 0, 50000, TOTAL_TARGET]
+    print("  ✓ Totals and prefix sums are correct")
+
+    # Columns are read-only
+    try:
+        schedule.mps[0] = 1
+        assert False, "mps column should be read-only"
+    except TypeError:
+        print("  ✓ Columns are read-only")
+
+    # Invalid values
+    for bad in ([{"mps": -1, "blockDelta": 1}], [{"mps": 1}], [{"mps": 1.5, "blockDelta": 1}]):
+        try:
+            SupplySchedule.from_dicts(bad)
+            assert False, f"Should have raised ValueError for {bad}"
+        except ValueError as e:
+            print(f"  ✓ Invalid schedule rejected: {e}")
+
+    # generate_schedule returns a SupplySchedule
+    generated = generate_schedule(86400, 0)
+    assert isinstance(generated, SupplySchedule), f"Expected SupplySchedule, got {type(generated)}"
+    assert generated.total_mps == TOTAL_TARGET
+    print("  ✓ generate_schedule returns a SupplySchedule")
+
+    print("\n✓ SupplySchedule type test passed!")
+
+
+def test_compact_schedule():
+    """Test merging equal-mps runs and optimal segmentation."""
+    print("\nTesting compact_schedule function...")
+
+    # Test 1: Merging keeps the per-block release identical
+    schedule = generate_schedule(86400, 1000, num_steps=500)
+    merged = compact_schedule(schedule)
+    assert len(merged) < len(schedule), "Fine-grained schedule should have equal-mps runs to merge"
+    assert all(a["mps"] != b["mps"] for a, b in zip(merged, merged[1:])), "Adjacent entries should differ"
+    assert all(entry["blockDelta"] > 0 for entry in merged), "Zero-length entries should be dropped"
+    assert merged.total_mps == TOTAL_TARGET and merged.total_blocks == schedule.total_blocks
+    assert release_deviation(schedule, merged) == 0, "Merging should not change the release"
+    print(f"  ✓ Merged {len(schedule)} entries into {len(merged)} with identical release")
+
+    # Test 2: Optimal segmentation respects max_entries and keeps the total exact
+    for max_entries in (3, 5, 20):
+        compacted = compact_schedule(schedule, max_entries=max_entries)
+        assert len(compacted) <= max_entries, f"Expected at most {max_entries} entries, got {len(compacted)}"
+        assert compacted.total_mps == TOTAL_TARGET, f"Total should stay {TOTAL_TARGET}"
+        assert compacted.total_blocks == schedule.total_blocks, "Block coverage should not change"
+        assert compacted[0] == {"mps": 0, "blockDelta": 1000}, "Prebid period should be kept"
+        assert compacted[-1]["blockDelta"] == 1, "Final block should be kept"
+        print(f"  ✓ max_entries={max_entries}: {len(compacted)} entries, "
+              f"max deviation {release_deviation(schedule, compacted)} MPS")
+
+    # Test 3: Segmentation matches an exhaustive search on a small schedule
+    small = generate_schedule(86400, num_steps=10, round_to_nearest=100)
+    steps = small[:-1]
+
+    def fit_error(steps, boundaries):
+        error = 0.0
+        for start, end in zip(boundaries, boundaries[1:]):
+            segment = steps[start:end]
+            blocks = segment.total_blocks
+            mean = segment.total_mps / blocks
+            error += sum(d * (m - mean) ** 2 for m, d in zip(segment.mps, segment.block_delta))
+        return error
+
+    def compacted_boundaries(steps, compacted):
+        cuts = list(itertools.accumulate(compacted.block_delta[:-1], initial=0))
+        return [list(steps.cumulative_blocks).index(c) for c in cuts]
+
+    best = min(
+        fit_error(steps, [0, *cuts, len(steps)])
+        for cuts in itertools.combinations(range(1, len(steps)), 3)
+    )
+    compacted = compact_schedule(small, max_entries=5)
+    assert abs(fit_error(steps, compacted_boundaries(steps, compacted)) - best) < 1e-6, (
+        "Segmentation should match the exhaustive optimum"
+    )
+    print("  ✓ Segmentation matches exhaustive search")
+
+    # Test 4: Non-monotone rates (rise then fall) match a brute-force DP over every split point
+    def brute_force_error(steps, max_segments):
+        errors = [0.0] + [math.inf] * len(steps)
+        for _ in range(max_segments):
+            errors = [min([errors[j]] + [errors[i] + fit_error(steps, [i, j]) for i in range(j)])
+                      for j in range(len(steps) + 1)]
+        return errors[-1]
+
+    logistic = generate_schedule(86400, num_steps=40, curve="logistic")
+    steps = compact_schedule(logistic)[:-1]
+    for max_entries in (4, 7):
+        compacted = compact_schedule(logistic, max_entries=max_entries)
+        error = fit_error(steps, compacted_boundaries(steps, compacted))
+        best = brute_force_error(steps, max_entries - 1)
+        assert abs(error - best) <= 1e-9 * best, f"max_entries={max_entries}: error {error:.0f}, optimum {best:.0f}"
+    print(f"  ✓ Logistic curve segmentation matches brute-force DP (error {error:.0f})")
+
+    # Test 5: max_entries too small
+    try:
+        compact_schedule(schedule, max_entries=2)
+        assert False, "Should have raised ValueError for max_entries=2 with a prebid period"
+    except ValueError as e:
+        print(f"  ✓ Too-small max_entries rejected: {e}")
+
+    print("\n✓ compact_schedule test passed!")
+
+
+def test_calldata_gas():
+    """Test calldata gas estimation and the nearby-parameter search."""
+    print("\nTesting calldata gas estimation...")
+
+    # Test 1: Byte counts for a known encoding (0x000036 0000002a8e: 5 zero bytes, 3 nonzero)
+    estimate = estimate_calldata_gas([{"mps": 54, "blockDelta": 10894}])
+    assert estimate == {"length_bytes": 8, "zero_bytes": 5, "nonzero_bytes": 3, "gas": 5 * 4 + 3 * 16}, estimate
+    assert estimate_calldata_gas("0x0000360000002a8e", zero_byte_gas=1, nonzero_byte_gas=10)["gas"] == 35
+    print(f"  ✓ Single element: {estimate}")
+
+    # Test 2: Hex, bytes and schedule inputs agree
+    schedule = generate_schedule(86400, 100)
+    encoded = encode_supply_schedule(schedule)
+    from_schedule = estimate_calldata_gas(schedule)
+    assert from_schedule == estimate_calldata_gas(encoded) == estimate_calldata_gas(bytes.fromhex(encoded[2:]))
+    assert from_schedule["length_bytes"] == len(schedule) * 8
+    print(f"  ✓ Default schedule with prebid: {from_schedule['gas']} gas")
+
+    # Test 3: Search never returns something worse than the request, and respects the tolerance
+    result = optimize_calldata_gas(86400, tolerance=0.01)
+    best, requested = result["best"], result["requested"]
+    assert best["gas"] <= requested["gas"], "Best candidate should not cost more than the request"
+    assert result["gas_saved"] == requested["gas"] - best["gas"]
+    assert best["max_release_deviation_mps"] <= 0.01 * TOTAL_TARGET, "Best candidate exceeds the tolerance"
+    assert best["schedule"].total_mps == TOTAL_TARGET
+    print(f"  ✓ Best of {result['candidates_evaluated']} candidates: num_steps={best['num_steps']}, "
+          f"round_to_nearest={best['round_to_nearest']}, saves {result['gas_saved']} gas")
+
+    # Test 4: Zero tolerance only accepts schedules with the same release
+    exact = optimize_calldata_gas(86400, tolerance=0.0)
+    assert exact["best"]["max_release_deviation_mps"] == 0
+    print("  ✓ Zero tolerance keeps the requested release")
+
+    print("\n✓ Calldata gas test passed!")
+
+
+def test_block_queries():
+    """Test step and released-supply lookups against a per-block expansion."""
+    print("\nTesting block queries...")
+
+    schedule = generate_schedule(14400, 100, num_steps=40, round_to_nearest=50)
+
+    # Expand to one mps value per block as the reference
+    per_block = []
+    for entry in schedule:
+        per_block.extend([entry["mps"]] * entry["blockDelta"])
+    released = list(itertools.accumulate(per_block))
+    assert len(per_block) == schedule.total_blocks
+
+    blocks = [-1, 0, 99, 100, 101, 7000, 14499, 14500, 14501, 10**9]
+    results = schedule.query_blocks(blocks)
+    for i, block in enumerate(blocks):
+        if 0 <= block < len(per_block):
+            step = results["step"][i]
+            assert step == schedule.step_at(block), f"step_at mismatch at block {block}"
+            assert schedule[step]["mps"] == per_block[block], f"Wrong step at block {block}"
+            assert results["mps"][i] == per_block[block], f"Wrong mps at block {block}"
+            assert results["released"][i] == released[block], f"Wrong released supply at block {block}"
+            assert schedule.released_before(block + 1) == released[block]
+        else:
+            assert results["step"][i] is None and schedule.step_at(block) is None
+            assert results["mps"][i] == 0
+            assert results["released"][i] == (0 if block < 0 else TOTAL_TARGET)
+    print(f"  ✓ {len(blocks)} queries match the per-block expansion")
+
+    assert schedule.released_before(0) == 0
+    assert schedule.released_before(schedule.total_blocks) == TOTAL_TARGET
+    assert schedule.step_at(schedule.total_blocks - 1) == len(schedule) - 1, "Last block is the final block"
+    print("  ✓ Schedule edges are handled")
+
+    print("\n✓ Block queries test passed!")
+
+
+def test_iter_schedule():
+    """Test the lazy entry iterator and the incremental encoder."""
+    print("\nTesting iter_schedule and write_supply_schedule...")
+
+    # Test 1: Lazy entries match generate_schedule
+    for kwargs in (
+        {"auction_blocks": 86400},
+        {"auction_blocks": 14400, "prebid_blocks": 100, "round_to_nearest": 100},
+        {"auction_blocks": 604800, "num_steps": 500, "alpha": 1.7, "final_block_pct": 0.4},
+    ):
+        entries = list(iter_schedule(**kwargs))
+        assert SupplySchedule.from_pairs(entries) == generate_schedule(**kwargs), f"Mismatch for {kwargs}"
+        assert sum(m * d for m, d in entries) == TOTAL_TARGET, "Running total should leave an exact final block"
+    print("  ✓ Entries match generate_schedule")
+
+    # Test 2: Streaming into a file matches encode_supply_schedule, in hex and raw bytes
+    expected = generate_schedule(86400, 50, num_steps=300)
+    for chunk_size in (1, 7, 4096):
+        raw = io.BytesIO()
+        stats = write_supply_schedule(iter_schedule(86400, 50, num_steps=300), raw, chunk_size=chunk_size)
+        assert raw.getvalue() == pack_supply_schedule(expected), f"Raw bytes differ (chunk_size={chunk_size})"
+        assert stats == {"num_elements": len(expected), "length_bytes": len(expected) * 8, "total_mps": TOTAL_TARGET}
+    hex_sink = io.BytesIO()
+    write_supply_schedule(iter_schedule(86400, 50, num_steps=300), hex_sink, hex_output=True)
+    assert hex_sink.getvalue().decode("ascii") == encode_supply_schedule(expected), "Hex output differs"
+    print(f"  ✓ Streamed encoding matches encode_supply_schedule: {stats}")
+
+    # Test 3: Sockets are written with sendall
+    left, right = socket.socketpair()
+    with left, right:
+        write_supply_schedule(iter_schedule(86400), left)
+        left.shutdown(socket.SHUT_WR)
+        received = b"".join(iter(lambda: right.recv(65536), b""))
+    assert received == pack_supply_schedule(generate_schedule(86400)), "Socket output differs"
+    print("  ✓ Socket sink receives the packed schedule")
+
+    # Test 4: Errors surface when the offending step is reached
+    entries = iter_schedule(100, round_to_nearest=150)
+    assert next(entries) == (0, 0), "Entries before the invalid step should still be yielded"
+    try:
+        list(entries)
+        assert False, "Should have raised ValueError for a step ending before it starts"
+    except ValueError as e:
+        print(f"  ✓ Invalid schedule rejected lazily: {e}")
+
+    print("\n✓ iter_schedule test passed!")
+
+
+def test_curves():
+    """Test the release curve registry."""
+    print("\nTesting release curves...")
+
+    # Test 1: The power curve is the default, with alpha taken from the alpha argument
+    assert generate_schedule(86400, curve="power") == generate_schedule(86400), "Power curve should be the default"
+    assert (generate_schedule(86400, curve="power", curve_params={"alpha": 1.7})
+            == generate_schedule(86400, alpha=1.7)), "curve_params alpha should match the alpha argument"
+    print("  ✓ Default curve unchanged")
+
+    # Test 2: Closed-form inverses agree with the numeric inverse of the cdf
+    fractions = [i / 50 for i in range(51)]
+    for name, curve in CURVES.items():
+        params = curve.resolve_params()
+        closed = list(curve.inverse(fractions, **params))
+        numeric = list(numeric_inverse(lambda t: curve.cdf(t, **params), fractions))
+        error = max(abs(a - b) for a, b in zip(closed, numeric))
+        assert error < 1e-9, f"{name}: closed-form and numeric inverse differ by {error}"
+        assert all(a <= b for a, b in zip(closed, closed[1:])), f"{name}: inverse should be non-decreasing"
+    print(f"  ✓ Closed-form inverses match numeric inversion for {sorted(CURVES)}")
+
+    # Test 3: Every curve produces a valid schedule with an exact total
+    for name in CURVES:
+        for kwargs in ({"auction_blocks": 86400}, {"auction_blocks": 14400, "prebid_blocks": 100, "round_to_nearest": 100}):
+            schedule = generate_schedule(curve=name, **kwargs)
+            assert schedule.total_mps == TOTAL_TARGET, f"{name}: total {schedule.total_mps} != {TOTAL_TARGET}"
+            # The final block is one block past the auction duration
+            assert schedule.total_blocks == kwargs["auction_blocks"] + kwargs.get("prebid_blocks", 0) + 1
+    front = generate_schedule(86400, curve="concave")
+    back = generate_schedule(86400, curve="exponential")
+    assert front[0]["mps"] > front[-2]["mps"] and back[0]["mps"] < back[-2]["mps"], "Curves should shape the release"
+    print("  ✓ Every curve totals exactly")
+
+    # Test 4: Custom piecewise-linear points
+    schedule = generate_schedule(86400, curve="piecewise_linear", curve_params={"points": [[0, 0], [0.5, 0.5], [1, 1]]})
+    assert schedule == generate_schedule(86400, alpha=1.0), "Straight line should match the linear power curve"
+    print("  ✓ Piecewise-linear straight line matches alpha=1")
+
+    # Test 5: Unknown curves and invalid parameters are rejected
+    for kwargs in (
+        {"curve": "cubic"},
+        {"curve": "logistic", "curve_params": {"alpha": 2.0}},
+        {"curve": "exponential", "curve_params": {"k": 0}},
+        {"curve": "piecewise_linear", "curve_params": {"points": [[0, 0], [0.5, 0.6], [0.4, 0.7], [1, 1]]}},
+    ):
+        try:
+            generate_schedule(86400, **kwargs)
+            assert False, f"Should have raised ValueError for {kwargs}"
+        except ValueError as e:
+            print(f"  ✓ Rejected {kwargs['curve']}: {e}")
+    assert get_curve(CURVES["power"]) is CURVES["power"], "Curve instances should pass through get_curve"
+
+    # Test 6: Batch generation and the calldata optimizer accept a curve
+    batch = generate_schedule_batch(86400, alpha=[1.0, 2.0], curve="logistic")
+    assert batch["schedule"][0] == generate_schedule(86400, curve="logistic"), "Batch should use the curve"
+    assert batch["schedule"][0] == batch["schedule"][1], "alpha should not affect the logistic curve"
+    print("  ✓ Batch generation uses the curve")
+
+    print("\n✓ Release curves test passed!")
+
+
+def test_sampled_curve():
+    """Test sampled curves and their cached inverse lookup tables."""
+    print("\nTesting sampled curves...")
+
+    # Test 1: The interpolant passes through the samples and never decreases
+    points = [[0, 0], [0.1, 0.02], [0.3, 0.05], [0.4, 0.2], [0.7, 0.6], [1, 1]]
+    curve = CURVES["sampled"]
+    for t, c in points:
+        assert abs(curve.cdf(t, points=points) - c) < 1e-12, f"C({t}) should be {c}"
+    values = [curve.cdf(i / 1000, points=points) for i in range(1001)]
+    assert all(a <= b for a, b in zip(values, values[1:])), "Interpolant should be non-decreasing"
+    print("  ✓ Monotone interpolant through the samples")
+
+    # Test 2: Collinear samples give the linear curve; spreadsheet units are rescaled
+    linear = generate_schedule(86400, curve="sampled", curve_params={"points": [[0, 0], [0.3, 0.3], [1, 1]]})
+    assert linear == generate_schedule(86400, alpha=1.0), "Collinear samples should match alpha=1"
+    days = [[t * 30, c * 1_000_000] for t, c in points]
+    assert (generate_schedule(86400, curve="sampled", curve_params={"points": days})
+            == generate_schedule(86400, curve="sampled", curve_params={"points": points})), "Units should not matter"
+    print("  ✓ Collinear and rescaled samples")
+
+    # Test 3: Flat stretches (no release) lengthen the steps that cross them
+    flat = generate_schedule(86400, curve="sampled", curve_params={"points": [[0, 0], [0.5, 0.5], [0.8, 0.5], [1, 1]]})
+    assert flat.total_mps == TOTAL_TARGET and max(flat.block_delta[:-1]) > 86400 * 0.3, "Flat stretch should span one step"
+    print(f"  ✓ Flat stretch handled (longest step {max(flat.block_delta[:-1])} blocks)")
+
+    # Test 4: Repeated calls with the same curve reuse the table
+    _sampled_table.cache_clear()
+    for auction_blocks, num_steps in ((86400, 12), (14400, 50), (604800, 500)):
+        schedule = generate_schedule(auction_blocks, num_steps=num_steps, curve="sampled", curve_params={"points": points})
+        assert schedule.total_mps == TOTAL_TARGET
+    info = _sampled_table.cache_info()
+    assert info.misses == 1 and info.hits == 2, f"Expected one fit reused twice, got {info}"
+    print(f"  ✓ Lookup table reused: {info}")
+
+    # Test 5: Invalid samples are rejected
+    for bad in (
+        [[0, 0]],
+        [[0, 0], [0.5, 0.6], [0.5, 0.7], [1, 1]],
+        [[0, 0], [0.5, 0.6], [0.7, 0.4], [1, 1]],
+        [[0, 0.5], [1, 0.5]],
+        [[0, 0], ["a", 1]],
+    ):
+        try:
+            generate_schedule(86400, curve="sampled", curve_params={"points": bad})
+            assert False, f"Should have raised ValueError for {bad}"
+        except ValueError as e:
+            print(f"  ✓ Rejected: {e}")
+
+    print("\n✓ Sampled curves test passed!")
+
+
+def test_solve_schedule():
+    """Test the constraint solver."""
+    print("\nTesting solve_schedule...")
+
+    # Test 1: Feasible requests come back unchanged after one evaluation
+    result = solve_schedule(86400, max_mps=100, min_block_delta=6000)
+    assert result["feasible"] and result["requested"]["violations"] == []
+    assert result["best"]["schedule"] == generate_schedule(86400), "Feasible request should be returned as-is"
+    assert result["candidates_evaluated"] == 1
+    print(f"  ✓ Feasible request unchanged: {result['best']['metrics']}")
+
+    # Test 2: max_mps is met by bisecting alpha to the largest feasible grid value
+    result = solve_schedule(86400, max_mps=90)
+    params, metrics = result["best"]["params"], result["best"]["metrics"]
+    assert result["requested"]["violations"], "Default schedule peaks above 90 mps"
+    assert params["num_steps"] == DEFAULT_NUM_STEPS and 1.0 <= params["alpha"] < DEFAULT_ALPHA
+    assert metrics["max_mps"] <= 90
+    next_alpha = round(params["alpha"] + SOLVER_ALPHA_STEP, 6)
+    assert schedule_violations(generate_schedule(86400, alpha=next_alpha), max_mps=90), "Alpha should be the largest feasible"
+    print(f"  ✓ max_mps=90 solved with alpha={params['alpha']} ({result['candidates_evaluated']} candidates)")
+
+    # Test 3: max_entries lowers num_steps; the final-block range and rounding are honored
+    result = solve_schedule(14400, prebid_blocks=100, max_entries=8, final_block_pct_range=(0.25, 0.35))
+    best = result["best"]
+    assert best["params"]["num_steps"] == 6 and best["metrics"]["entries"] == 8, f"Unexpected solution {best['params']}"
+    assert 0.25 <= best["metrics"]["final_block_pct"] <= 0.35
+    print(f"  ✓ max_entries=8 solved with num_steps={best['params']['num_steps']}")
+
+    # Test 4: Rounding that collapses steps falls back to an allowed candidate
+    result = solve_schedule(86400, num_steps=40, round_to_nearest=3000, rounding_candidates=[2500, 1000, 500])
+    assert any("shorter than" in v for v in result["requested"]["violations"]), "Collapsed steps should be reported"
+    best = result["best"]
+    assert best["params"]["round_to_nearest"] in (2500, 1000, 500) and best["metrics"]["min_block_delta"] >= 1
+    assert best["schedule"] == generate_schedule(**best["params"]), "Returned params should reproduce the schedule"
+    print(f"  ✓ Collapsed rounding replaced by round_to_nearest={best['params']['round_to_nearest']}, "
+          f"num_steps={best['params']['num_steps']}")
+
+    # Test 5: Every returned solution satisfies its constraints
+    for constraints in (
+        {"max_mps": 85, "min_block_delta": 5000},
+        {"max_mps": 95, "final_block_pct_range": (0.3, 0.4), "max_entries": 10},
+        {"min_block_delta": 7000, "rounding_candidates": [100, 1000]},
+    ):
+        result = solve_schedule(86400, **constraints)
+        assert result["feasible"], f"Expected a solution for {constraints}"
+        checked = {k: v for k, v in constraints.items() if k != "rounding_candidates"}
+        assert schedule_violations(result["best"]["schedule"], **checked) == [], f"Violations for {constraints}"
+    print("  ✓ Solutions satisfy their constraints")
+
+    # Test 6: Infeasible constraints are reported instead of raising
+    result = solve_schedule(86400, max_mps=10)
+    assert not result["feasible"] and result["best"] is None
+    print(f"  ✓ Infeasible request reported: {result['requested']['violations']}")
+
+    # Test 7: Candidates that fail arithmetically (final_block_pct=1.0 leaves no main supply) are skipped
+    result = solve_schedule(86400, max_mps=40, final_block_pct_range=(0.5, 1.0))
+    assert not result["feasible"] and result["candidates_evaluated"] > 1, "Expected no solution for max_mps=40"
+    print("  ✓ final_block_pct=1.0 candidate reported as infeasible instead of raising")
+
+    print("\n✓ solve_schedule test passed!")
+
+
+def test_check_feasibility():
+    """Test the feasibility pre-check against generate_schedule."""
+    print("\nTesting check_feasibility...")
+
+    # Test 1: Agrees with generate_schedule across roundings that fail, collapse and succeed
+    counts = {"feasible": 0, "collapsed": 0, "fails": 0}
+    for auction_blocks, num_steps, rounding in itertools.product(
+        (1_800, 7_200, 86_400), (1, 5, 12, 40, 150), (None, 100, 500, 5_000)
+    ):
+        if rounding is not None and rounding >= auction_blocks:
+            continue
+        result = check_feasibility(auction_blocks, 50, num_steps, round_to_nearest=rounding)
+        try:
+            schedule = generate_schedule(auction_blocks, 50, num_steps, round_to_nearest=rounding)
+        except ValueError as e:
+            assert not result["generates"] and result["error"] == str(e), f"Mismatch for {auction_blocks}, {num_steps}, {rounding}"
+            counts["fails"] += 1
+            continue
+        collapsed = sum(1 for entry in schedule if entry["blockDelta"] == 0)
+        assert result["generates"] and result["collapsed_steps"] == collapsed
+        assert result["feasible"] == (collapsed == 0)
+        counts["feasible" if collapsed == 0 else "collapsed"] += 1
+    assert all(counts.values()), f"Expected every outcome to be exercised: {counts}"
+    print(f"  ✓ Matches generate_schedule: {counts}")
+
+    # Test 2: Invalid curves raise instead of being reported as infeasible
+    try:
+        check_feasibility(86400, curve="logistic", curve_params={"k": -1})
+        assert False, "Should have raised ValueError for invalid curve parameters"
+    except ValueError as e:
+        print(f"  ✓ Invalid curve raised: {e}")
+
+    print("\n✓ check_feasibility test passed!")
+
+
+def test_dense_emission():
+    """Test the dense per-block export and windowed reads."""
+    print("\nTesting dense emission export...")
+
+    schedule = generate_schedule(14400, 100, num_steps=20, round_to_nearest=100)
+    start_block = 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "emission.bin")
+
+        # Test 1: File and buffer exports are identical, with small chunks too
+        stats = export_dense_emission(schedule, path, start_block)
+        assert stats == {"num_blocks": schedule.total_blocks, "length_bytes": dense_emission_size(schedule),
+                         "total_mps": TOTAL_TARGET}
+        buffer = bytearray(dense_emission_size(schedule))
+        export_dense_emission(schedule.to_dicts(), buffer, start_block, chunk_size=7)
+        with open(path, "rb") as f:
+            assert f.read() == bytes(buffer), "File and buffer exports should match"
+        print(f"  ✓ Exported {stats['num_blocks']} blocks ({stats['length_bytes']} bytes)")
+
+        # Test 2: Every block matches the run-length schedule
+        with DenseEmission(path) as emission:
+            assert len(emission) == schedule.total_blocks and emission.start_block == start_block
+            mps, released = emission.window(start_block, start_block + len(emission))
+            expected = schedule.query_blocks(range(schedule.total_blocks))
+            assert mps.tolist() == expected["mps"], "Dense mps differs from the schedule"
+            assert released.tolist() == expected["released"], "Cumulative supply differs from the schedule"
+            assert released[-1] == emission.total_mps == TOTAL_TARGET
+            del mps, released
+        print("  ✓ Every block matches query_blocks")
+
+        # Test 3: Windows are addressed by block number and clipped to the export
+        with DenseEmission(buffer) as emission:
+            mps, released = emission.window(start_block + 5_000, start_block + 5_010)
+            assert mps.tolist() == expected["mps"][5_000:5_010]
+            assert released.tolist() == expected["released"][5_000:5_010]
+            mps, released = emission.window(0, start_block + 3)
+            assert mps.tolist() == [0, 0, 0] and len(released) == 3, "Window should start at start_block"
+            mps, released = emission.window(start_block + 20_000, start_block + 30_000)
+            assert len(mps) == 0 and len(released) == 0, "Window past the end should be empty"
+            del mps, released
+        print("  ✓ Windows addressed by block number and clipped")
+
+        # Test 4: Bad inputs are rejected
+        for bad in (b"", b"XXXX" + bytes(28), bytes(buffer[:100])):
+            try:
+                DenseEmission(bad)
+                assert False, "Should have raised ValueError for a bad buffer"
+            except ValueError as e:
+                print(f"  ✓ Rejected: {e}")
+        try:
+            export_dense_emission(schedule, bytearray(10))
+            assert False, "Should have raised ValueError for a small buffer"
+        except ValueError as e:
+            print(f"  ✓ Rejected: {e}")
+
+    print("\n✓ Dense emission test passed!")
+
+
+def test_token_amounts():
+    """Test exact token-unit conversion against rational arithmetic."""
+    print("\nTesting token amounts...")
+
+    # Test 1: Per-entry amounts are exact floors, and amounts plus dust reach the exact totals
+    schedules = (
+        generate_schedule(86400, 50),
+        generate_schedule(14400, 100, num_steps=40, round_to_nearest=50),
+        decode_supply_schedule(encode_supply_schedule(generate_schedule(604800, num_steps=300))),
+    )
+    for schedule in schedules:
+        for total_supply in (1, 10**7 - 1, 123456789012345678901, 10**29, 10**29 + 7):
+            amounts = token_amounts(schedule, total_supply)
+            released = 0
+            cumulative = 0
+            for i, entry in enumerate(schedule):
+                per_block = Fraction(total_supply * entry["mps"], TOTAL_TARGET)
+                assert amounts["tokens_per_block"][i] == math.floor(per_block), f"Inexact amount at entry {i}"
+                assert amounts["step_tokens"][i] == amounts["tokens_per_block"][i] * entry["blockDelta"]
+                cumulative += amounts["step_tokens"][i]
+                released += entry["mps"] * entry["blockDelta"]
+                assert amounts["cumulative_tokens"][i] == cumulative, f"Wrong cumulative amount at entry {i}"
+                assert amounts["dust"][i] >= 0
+                exact = math.floor(Fraction(total_supply * released, TOTAL_TARGET))
+                assert cumulative + sum(amounts["dust"][:i + 1]) == exact, f"Dust does not close entry {i}"
+            assert amounts["allocated_tokens"] + amounts["total_dust"] == total_supply, "Dust should close the supply"
+            assert amounts["unallocated_tokens"] == 0
+    print(f"  ✓ {len(schedules)} schedules convert exactly, dust closes every supply")
+
+    # Test 2: Supplies divisible by TOTAL_TARGET leave no dust
+    amounts = token_amounts(generate_schedule(86400), 10**29)
+    assert amounts["total_dust"] == 0 and amounts["allocated_tokens"] == 10**29
+    print(f"  ✓ 1e29 supply: dust {amounts['total_dust']}")
+
+    # Test 3: A schedule that does not release TOTAL_TARGET reports the unreleased supply
+    partial = SupplySchedule.from_pairs([(100, 1000), (50, 1000)])
+    amounts = token_amounts(partial, 10**18)
+    assert amounts["unallocated_tokens"] == 10**18 - amounts["allocated_tokens"] - amounts["total_dust"] > 0
+    print(f"  ✓ Partial schedule: {amounts['unallocated_tokens']} tokens unallocated")
+
+    # Test 4: Non-integer supplies are rejected
+    for bad in (1e29, -1, True, "1000"):
+        try:
+            token_amounts(partial, bad)
+            assert False, f"Should have raised ValueError for {bad!r}"
+        except ValueError as e:
+            print(f"  ✓ Rejected {bad!r}: {e}")
+
+    print("\n✓ Token amounts test passed!")
+
+
 if __name__ == "__main__":
     test_basic_schedule()
     test_canonical_sample()
@@ -406,6 +1128,19 @@ if __name__ == "__main__":
     test_custom_parameters()
     test_encode_schedule()
     test_rounding_validation()
+    test_batch_schedule()
+    test_decode_schedule()
+    test_supply_schedule_type()
+    test_compact_schedule()
+    test_calldata_gas()
+    test_block_queries()
+    test_iter_schedule()
+    test_curves()
+    test_sampled_curve()
+    test_solve_schedule()
+    test_check_feasibility()
+    test_dense_emission()
+    test_token_amounts()
     print("\n" + "="*60)
     print("✓ All tests passed!")
     print("="*60)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test the server metrics used by the MCP server.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from executor import ToolExecutor
+from logic import generate_schedule
+from metrics import LatencyHistogram, ServerMetrics, mark_error, phase
+
+
+def _generate_timed(auction_blocks: int) -> int:
+    """Tool body that times its own phases."""
+    with phase("generation"):
+        schedule = generate_schedule(auction_blocks)
+    with phase("serialization"):
+        return len(json.dumps(schedule.to_dicts()))
+
+
+def test_histogram():
+    """Test bucket counts and bucket-based quantiles."""
+    print("Testing latency histogram...")
+
+    histogram = LatencyHistogram(buckets=(1, 10, 100))
+    for value in (0.5, 0.7, 5, 50, 500):
+        histogram.observe(value)
+    result = histogram.to_dict()
+    assert result["count"] == 5 and result["max_ms"] == 500
+    assert result["buckets"] == [[1, 2], [10, 1], [100, 1], [None, 1]], f"Unexpected buckets {result['buckets']}"
+    assert histogram.quantile(0.4) == 1 and histogram.quantile(0.5) == 10 and histogram.quantile(0.99) == 500
+    assert LatencyHistogram().quantile(0.5) is None
+    print(f"  ✓ Buckets {result['buckets']}, p50 {result['p50_ms']} ms")
+
+    print("\n✓ Histogram test passed!")
+
+
+def test_tracking():
+    """Test per-tool counters and phases timed on worker threads."""
+    print("\nTesting call tracking...")
+
+    metrics = ServerMetrics()
+    executor = ToolExecutor(mode="thread", max_workers=2)
+
+    async def call(tool: str, fail: bool = False) -> None:
+        with metrics.track(tool) as record:
+            with phase("validation"):
+                pass
+            record.payload_bytes = await executor.run(_generate_timed, 86400)
+            if fail:
+                mark_error()
+
+    async def run():
+        await asyncio.gather(call("generate"), call("generate"), call("generate", fail=True), call("other"))
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    snapshot = metrics.snapshot()
+    generate = snapshot["tools"]["generate"]
+    assert snapshot["requests"] == 4 and snapshot["errors"] == 1
+    assert generate["requests"] == 3 and generate["errors"] == 1
+    assert set(generate["latency"]) == {"total", "validation", "generation", "serialization"}
+    assert all(histogram["count"] == 3 for histogram in generate["latency"].values())
+    assert generate["payload_bytes"]["max"] > 0
+    print(f"  ✓ Phases from worker threads: {sorted(generate['latency'])}")
+
+    # Phases outside a tracked call are ignored
+    _generate_timed(1_000)
+    assert metrics.snapshot()["requests"] == 4
+
+    metrics.reset()
+    assert metrics.snapshot()["tools"] == {}
+    print("  ✓ Untracked phases ignored, reset clears")
+
+    print("\n✓ Tracking test passed!")
+
+
+def _slow_phase(seconds: float) -> None:
+    """Tool body whose generation phase outlives a short timeout."""
+    with phase("generation"):
+        time.sleep(seconds)
+    mark_error()
+
+
+def test_timed_out_call():
+    """Test that a worker outliving its timed-out call does not add to the folded record."""
+    print("\nTesting phases reported after a timeout...")
+
+    metrics = ServerMetrics()
+    executor = ToolExecutor(mode="thread", max_workers=1, timeout=0.05)
+
+    async def run():
+        with metrics.track("slow") as record:
+            try:
+                await executor.run(_slow_phase, 0.2)
+            except TimeoutError:
+                pass
+        # Let the worker finish its phase after the call was folded
+        await asyncio.sleep(0.3)
+        return record
+
+    try:
+        record = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    slow = metrics.snapshot()["tools"]["slow"]
+    assert record.closed and "generation" not in record.phases, f"Record changed after close: {record.phases}"
+    assert "generation" not in slow["latency"], f"Late phase recorded: {slow['latency']}"
+    assert slow["errors"] == 0, "Late mark_error() recorded"
+    print(f"  ✓ Late phase dropped (total {slow['latency']['total']['max_ms']} ms)")
+
+    print("\n✓ Timed-out call test passed!")
+
+
+def test_diagnostics_modes():
+    """Test structured logging and profiling switched on at runtime."""
+    print("\nTesting diagnostics modes...")
+
+    lines = []
+
+    class Collect(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            lines.append(record.getMessage())
+
+    logger = logging.getLogger("test-metrics")
+    logger.addHandler(Collect())
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    metrics = ServerMetrics(logger=logger)
+    executor = ToolExecutor(mode="inline", instrument=metrics.instrument)
+
+    async def call() -> None:
+        with metrics.track("generate"):
+            await executor.run(_generate_timed, 14400)
+
+    asyncio.run(call())
+    assert lines == [] and "profile" not in metrics.snapshot(), "Mode off should not log or profile"
+
+    metrics.set_diagnostics("log")
+    asyncio.run(call())
+    event = json.loads(lines[-1])
+    assert event["tool"] == "generate" and {"total", "generation"} <= set(event["phases_ms"])
+    print(f"  ✓ Structured log line: {lines[-1][:80]}...")
+
+    metrics.set_diagnostics("profile")
+    asyncio.run(call())
+    asyncio.run(call())
+    profile = metrics.snapshot()["profile"]
+    assert profile["profiled_calls"] == 2
+    assert any("generate_schedule" in entry["function"] for entry in profile["functions"])
+    print(f"  ✓ Profiled {profile['profiled_calls']} calls, top: {profile['functions'][0]['function']}")
+
+    try:
+        metrics.set_diagnostics("verbose")
+        assert False, "Should have raised ValueError for an unknown mode"
+    except ValueError as e:
+        print(f"  ✓ Unknown mode rejected: {e}")
+
+    print("\n✓ Diagnostics modes test passed!")
+
+
+if __name__ == "__main__":
+    test_histogram()
+    test_tracking()
+    test_timed_out_call()
+    test_diagnostics_modes()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test the Monte Carlo scenario runner.
+"""
+
+import multiprocessing
+import random
+
+import scenarios
+from logic import generate_schedule
+from scenarios import (
+    P2Quantile,
+    StreamingSummary,
+    iter_scenario_summaries,
+    run_scenarios,
+    SCENARIO_METRICS,
+)
+
+# A short auction keeps each scenario in the millisecond range
+SCHEDULE = generate_schedule(2_000, 100, num_steps=8)
+DEMAND = {"total_supply": 1_000.0, "floor_price": 1.0, "num_bids": 100, "expected_demand": 2_000.0}
+
+
+def test_p2_quantile():
+    """Test streaming quantile estimates against exact quantiles."""
+    print("Testing P-square quantiles...")
+
+    rng = random.Random(5)
+    for name, draw in (("normal", lambda: rng.gauss(0, 1)), ("log-normal", lambda: rng.lognormvariate(0, 1))):
+        values = [draw() for _ in range(20_000)]
+        exact = sorted(values)
+        spread = exact[int(0.99 * len(exact))] - exact[int(0.01 * len(exact))]
+        for quantile in (0.05, 0.5, 0.95):
+            estimator = P2Quantile(quantile)
+            for value in values:
+                estimator.add(value)
+            error = abs(estimator.value() - exact[int(quantile * len(exact))])
+            assert error < 0.01 * spread, f"{name} p{quantile}: error {error}"
+        print(f"  ✓ {name}: estimates within 1% of the 1-99% range")
+
+    # Exact for the first five values
+    estimator = P2Quantile(0.5)
+    for value in (5.0, 1.0, 3.0):
+        estimator.add(value)
+    assert estimator.value() == 3.0 and P2Quantile(0.5).value() is None
+    summary = StreamingSummary()
+    for value in range(1, 101):
+        summary.add(float(value))
+    result = summary.to_dict()
+    assert result["count"] == 100 and result["mean"] == 50.5 and (result["min"], result["max"]) == (1.0, 100.0)
+    assert set(result["quantiles"]) == {"p5", "p25", "p50", "p75", "p95"}
+    print("  ✓ Small streams and summaries")
+
+    print("\n✓ P-square quantile test passed!")
+
+
+def test_deterministic_runs():
+    """Test that results do not depend on workers, chunking or budget."""
+    print("\nTesting determinism...")
+
+    inline = run_scenarios(SCHEDULE, 24, **DEMAND, seed=3, max_workers=1)
+    pooled = run_scenarios(SCHEDULE, 24, **DEMAND, seed=3, max_workers=2, chunk_size=5)
+    assert inline["completed"] == pooled["completed"] == 24 and not inline["budget_exhausted"]
+    assert inline["metrics"] == pooled["metrics"], "Pool and in-process runs should match"
+    assert set(inline["metrics"]) == set(SCENARIO_METRICS)
+    print("  ✓ 2 workers in chunks of 5 match an in-process run")
+
+    other = run_scenarios(SCHEDULE, 24, **DEMAND, seed=4, max_workers=1)
+    assert other["metrics"] != inline["metrics"], "Different seeds should give different scenarios"
+    print("  ✓ Seeds select the scenarios")
+
+    # Summaries stream in, each covering more scenarios
+    completed = [summary["completed"] for summary in iter_scenario_summaries(
+        SCHEDULE, 24, **DEMAND, seed=3, max_workers=1, chunk_size=8
+    )]
+    assert completed == [8, 16, 24], f"Unexpected progress {completed}"
+    print(f"  ✓ Streamed summaries after {completed} scenarios")
+
+    print("\n✓ Determinism test passed!")
+
+
+def test_time_budget():
+    """Test that a time budget stops the run with a deterministic prefix."""
+    print("\nTesting time budget...")
+
+    for max_workers in (1, 2):
+        partial = run_scenarios(
+            SCHEDULE, 100_000, **DEMAND, max_workers=max_workers, chunk_size=4, time_budget=0.5
+        )
+        assert partial["budget_exhausted"] and 0 < partial["completed"] < 100_000
+        assert partial["elapsed"] < 2.0, f"Run overshot its budget: {partial['elapsed']:.2f}s"
+        prefix = run_scenarios(SCHEDULE, partial["completed"], **DEMAND, max_workers=1)
+        assert partial["metrics"] == prefix["metrics"], "A stopped run should cover its first scenarios exactly"
+        print(f"  ✓ {max_workers} worker(s): stopped after {partial['completed']} scenarios in {partial['elapsed']:.2f}s")
+
+    print("\n✓ Time budget test passed!")
+
+
+def test_shared_pool():
+    """Test that runs share one pool, so abandoned chunks cannot pile up worker processes."""
+    print("\nTesting the shared process pool...")
+
+    for _ in range(4):
+        partial = run_scenarios(SCHEDULE, 100_000, **DEMAND, max_workers=2, chunk_size=4, time_budget=0.2)
+        assert partial["budget_exhausted"], "Run should have stopped on its budget"
+    workers = multiprocessing.active_children()
+    assert len(workers) <= 2, f"Expected at most 2 worker processes after 4 runs, got {len(workers)}"
+    assert scenarios._shared_pool(2) is scenarios._shared_pool(2), "Runs should reuse the pool"
+    print(f"  ✓ 4 budget-stopped runs left {len(workers)} worker process(es)")
+
+    scenarios.shutdown_pools()
+    assert run_scenarios(SCHEDULE, 8, **DEMAND, max_workers=2)["completed"] == 8, "Pool should restart after shutdown"
+    scenarios.shutdown_pools()
+    print("  ✓ Pools restart after shutdown_pools()")
+
+    print("\n✓ Shared pool test passed!")
+
+
+def test_invalid_inputs():
+    """Test that bad run parameters are rejected."""
+    print("\nTesting invalid inputs...")
+
+    for overrides in ({"num_bids": 0}, {"floor_price": 0.0}, {"demand_sigma": -1.0}, {"expected_demand": -5.0}):
+        try:
+            run_scenarios(SCHEDULE, 10, **{**DEMAND, **overrides})
+            assert False, f"Should have raised ValueError for {overrides}"
+        except ValueError as e:
+            print(f"  ✓ Rejected: {e}")
+
+    print("\n✓ Invalid inputs test passed!")
+
+
+if __name__ == "__main__":
+    test_p2_quantile()
+    test_deterministic_runs()
+    test_time_budget()
+    test_shared_pool()
+    test_invalid_inputs()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
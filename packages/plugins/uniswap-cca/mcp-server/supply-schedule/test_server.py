@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Test the MCP server's tool handlers end to end.
+
+Requires the server requirements (mcp, pydantic); the tests are skipped when
+they are not installed.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+
+from logic import (
+    decode_supply_schedule,
+    encode_supply_schedule,
+    generate_schedule,
+    pack_supply_schedule,
+    SupplySchedule,
+    ENCODED_ELEMENT_BYTES,
+)
+
+try:
+    import server
+except ImportError as e:
+    server = None
+    SKIP_REASON = str(e)
+
+
+def _call_text(name: str, arguments: dict) -> str:
+    """Call a tool and return its response text."""
+    return asyncio.run(server.call_tool(name, arguments))[0].text
+
+
+def _call(name: str, arguments: dict) -> dict:
+    """Call a tool and parse its JSON response."""
+    return json.loads(_call_text(name, arguments))
+
+
+def _skipped() -> bool:
+    if server is None:
+        print(f"  Skipped (server requirements not installed: {SKIP_REASON})")
+        return True
+    logging.getLogger("cca-supply-schedule").setLevel(logging.CRITICAL)
+    return False
+
+
+def test_batch_parameter_bounds():
+    """Test that the batch tool rejects the same out-of-range curve parameters as the single tool."""
+    print("Testing batch and single tools share parameter bounds...")
+    if _skipped():
+        return
+
+    for field, value in (("final_block_pct", 0.95), ("final_block_pct", 0.0), ("final_block_pct", 1.0),
+                         ("final_block_pct", 0.1), ("alpha", 0.0), ("alpha", -1.2)):
+        single = _call("generate_supply_schedule", {"auction_blocks": 86400, field: value})
+        scalar = _call("generate_supply_schedule_batch", {"auction_blocks": 86400, field: value})
+        listed = _call("generate_supply_schedule_batch", {"auction_blocks": 86400, field: [0.3, value]})
+        for label, response in (("single", single), ("batch", scalar), ("batch list", listed)):
+            assert "error" in response, f"{label} accepted {field}={value}: {response}"
+            assert field in response["error"], f"{label} error does not name {field}: {response['error']}"
+        print(f"  ✓ {field}={value} rejected by both tools")
+
+    batch = _call("generate_supply_schedule_batch", {"auction_blocks": 86400, "final_block_pct": [0.2, 0.5]})
+    assert "error" not in batch, f"In-range batch failed: {batch}"
+    print("  ✓ In-range batch accepted")
+
+    print("\n✓ Batch parameter bounds test passed!")
+
+
+def test_corrupt_store_entry():
+    """Test that a garbage row in the schedule store falls back to generating the schedule."""
+    print("\nTesting corrupt schedule store entries...")
+    if _skipped():
+        return
+
+    from store import ScheduleStore, schedule_key
+
+    arguments = {"auction_blocks": 86400, "num_steps": 24}
+    key = schedule_key(server.GenerateScheduleInput(**arguments).generation_params())
+    server.schedule_cache.clear()
+    expected = _call("generate_supply_schedule", arguments)
+
+    original = server.schedule_store
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "schedules.db")
+        schedule_store = ScheduleStore(path)
+        server.schedule_store = lambda: schedule_store
+        try:
+            for column, value in (("steps", b"\x01" * 7), ("steps", bytes(16)), ("steps", os.urandom(24)),
+                                  ("summary", "{garbage"), ("compaction", "[")):
+                # Store a valid entry, then overwrite one column with garbage
+                server.schedule_cache.clear()
+                _call("generate_supply_schedule", arguments)
+                with sqlite3.connect(path) as connection:
+                    connection.execute(f"UPDATE schedules SET {column} = ? WHERE key = ?", (value, key))
+
+                errors = schedule_store.errors
+                server.schedule_cache.clear()
+                response = _call("generate_supply_schedule", arguments)
+                assert response == expected, f"Corrupt {column} changed the response: {response}"
+                assert schedule_store.errors == errors + 1, f"Corrupt {column} not counted as an error"
+                assert schedule_store.get(key) is not None, f"Corrupt {column} entry was not replaced"
+                print(f"  ✓ Corrupt {column} regenerated and replaced")
+        finally:
+            schedule_store.close()
+            server.schedule_store = original
+            server.schedule_cache.clear()
+
+    print("\n✓ Corrupt store entry test passed!")
+
+
+def test_response_cache_keys_by_tool():
+    """Test that tools sharing the response cache never get each other's entries."""
+    print("\nTesting response cache keys include the tool name...")
+    if _skipped():
+        return
+
+    arguments = {"auction_blocks": 86400, "num_steps": 18}
+    cache_key = server.GenerateScheduleInput(**arguments).cache_key()
+    server.schedule_cache.clear()
+    try:
+        # Another tool's entry under the same input key must not be served
+        server.schedule_cache.put(("solve_supply_schedule", cache_key), '{"stale": true}')
+        response = _call("generate_supply_schedule", arguments)
+        assert "stale" not in response and response["total_phases"] > 0, f"Served another tool's entry: {response}"
+        assert ("generate_supply_schedule", cache_key) in server.schedule_cache, "Response cached without tool name"
+        print("  ✓ Entries are keyed by tool name")
+    finally:
+        server.schedule_cache.clear()
+
+    print("\n✓ Response cache keys test passed!")
+
+
+def test_solve_one_final_bound():
+    """Test that the solver accepts a final-block range with only one bound set."""
+    print("\nTesting solve_supply_schedule with one final-block bound...")
+    if _skipped():
+        return
+
+    for bound, value in (("final_block_pct_min", 0.5), ("final_block_pct_max", 0.2)):
+        response = _call("solve_supply_schedule", {"auction_blocks": 86400, bound: value, "include_schedule": False})
+        assert "error" not in response, f"{bound}={value} failed: {response}"
+        final_pct = response["best"]["params"]["final_block_pct"]
+        assert (final_pct >= value) if bound.endswith("min") else (final_pct <= value), f"{bound} ignored: {final_pct}"
+        assert server.MIN_FINAL_BLOCK_PCT <= final_pct <= server.MAX_FINAL_BLOCK_PCT
+        print(f"  ✓ {bound}={value} solved with final_block_pct={final_pct}")
+
+    print("\n✓ One final-block bound test passed!")
+
+
+def test_response_formats():
+    """Test payload_bytes and the compact, columnar and binary response formats."""
+    print("\nTesting response formats...")
+    if _skipped():
+        return
+
+    arguments = {"auction_blocks": 86400, "prebid_blocks": 500, "num_steps": 40}
+    schedule = generate_schedule(86400, 500, num_steps=40)
+    responses = {}
+    for response_format in ("json", "compact", "columnar", "binary"):
+        for name in ("generate_supply_schedule", "generate_and_encode_supply_schedule"):
+            text = _call_text(name, {**arguments, "response_format": response_format})
+            response = json.loads(text)
+            assert response["payload_bytes"] == len(text.encode()), (
+                f"{name} ({response_format}): payload_bytes {response['payload_bytes']} != {len(text.encode())}"
+            )
+            responses[name, response_format] = response
+        print(f"  ✓ {response_format}: payload_bytes matches the {response['payload_bytes']}-byte text")
+
+    # Padding the output across a digit-count boundary still reports the exact size
+    for padding in range(85, 100):
+        text = server._render({"padding": "x" * padding}, "compact")
+        assert json.loads(text)["payload_bytes"] == len(text), f"Wrong size with {padding} bytes of padding"
+    print("  ✓ payload_bytes exact across a digit-count boundary")
+
+    compact = responses["generate_supply_schedule", "compact"]
+    assert compact == responses["generate_supply_schedule", "json"] | {"payload_bytes": compact["payload_bytes"]}
+    print("  ✓ compact carries the same fields as json")
+
+    columnar = responses["generate_supply_schedule", "columnar"]["schedule"]
+    assert SupplySchedule(columnar["mps"], columnar["blockDelta"]) == schedule, "Columnar arrays changed the schedule"
+    print("  ✓ columnar arrays round-trip to the schedule")
+
+    binary = responses["generate_supply_schedule", "binary"]
+    packed = base64.b64decode(binary["schedule_base64"])
+    assert packed == pack_supply_schedule(schedule), "schedule_base64 is not the packed schedule"
+    assert decode_supply_schedule(packed) == schedule
+    encoded = base64.b64decode(responses["generate_and_encode_supply_schedule", "binary"]["encoded_base64"])
+    assert encoded == pack_supply_schedule(schedule), "encoded_base64 is not the packed schedule"
+    print("  ✓ binary payloads base64-decode to pack_supply_schedule output")
+
+    print("\n✓ Response formats test passed!")
+
+
+def test_generate_and_encode():
+    """Test that generate_and_encode_supply_schedule matches generating and encoding separately."""
+    print("\nTesting generate_and_encode_supply_schedule...")
+    if _skipped():
+        return
+
+    params = {"auction_blocks": 50400, "prebid_blocks": 1000, "num_steps": 24, "alpha": 1.5, "round_to_nearest": 100}
+    schedule = generate_schedule(**params)
+    generated = _call("generate_supply_schedule", params)
+
+    combined = _call("generate_and_encode_supply_schedule", params)
+    assert combined["encoded"] == encode_supply_schedule(schedule), "encoded differs from encode_supply_schedule"
+    assert combined["schedule"] == schedule.to_dicts(), "schedule differs from generate_schedule"
+    assert combined["num_elements"] == len(schedule), "num_elements differs from the schedule length"
+    assert combined["length_bytes"] == ENCODED_ELEMENT_BYTES * len(schedule), "length_bytes differs from the encoding"
+    for field in ("auction_blocks", "prebid_blocks", "total_phases", "summary"):
+        assert combined[field] == generated[field], f"{field} differs from generate_supply_schedule"
+    print(f"  ✓ Encoding and summary match ({combined['length_bytes']} bytes)")
+
+    without = _call("generate_and_encode_supply_schedule", {**params, "include_schedule": False})
+    assert "schedule" not in without, "include_schedule=false should omit the schedule array"
+    assert without["encoded"] == combined["encoded"] and without["summary"] == combined["summary"]
+    print("  ✓ include_schedule=false omits the schedule array")
+
+    print("\n✓ generate_and_encode test passed!")
+
+
+def test_metrics_store_stats_off_loop():
+    """Test that get_server_metrics reports the store without querying it on the event loop."""
+    print("\nTesting get_server_metrics store stats...")
+    if _skipped():
+        return
+
+    from store import ScheduleStore
+
+    original = server.schedule_store
+    with tempfile.TemporaryDirectory() as directory:
+        schedule_store = ScheduleStore(os.path.join(directory, "schedules.db"))
+        threads = []
+        stats = schedule_store.stats
+        schedule_store.stats = lambda: threads.append(threading.current_thread()) or stats()
+        server.schedule_store = lambda: schedule_store
+        try:
+            response = _call("get_server_metrics", {})
+        finally:
+            server.schedule_store = original
+            schedule_store.close()
+
+    assert response["caches"]["store"]["entries"] == 0, f"Store stats missing: {response['caches']}"
+    assert threads and threads[0] is not threading.main_thread(), "Store stats queried on the event loop thread"
+    print(f"  ✓ Store stats queried on {threads[0].name}")
+
+    print("\n✓ Store stats test passed!")
+
+
+def test_feasibility_index_loaded_off_loop():
+    """Test that the feasibility index is read in a thread, not on the event loop, when a request is rejected."""
+    print("\nTesting the feasibility index loads off the event loop...")
+    if _skipped():
+        return
+
+    from feasibility import FeasibilityIndex
+
+    threads = []
+    original = FeasibilityIndex.__dict__["load"]
+    load = FeasibilityIndex.load
+    FeasibilityIndex.load = lambda path: threads.append(threading.current_thread()) or load(path)
+    server.feasibility_index.cache_clear()
+    try:
+        response = _call("generate_supply_schedule", {"auction_blocks": 1800, "num_steps": 40,
+                                                      "round_to_nearest": 500})
+    finally:
+        FeasibilityIndex.load = original
+        server.feasibility_index.cache_clear()
+
+    assert "error" in response and response["suggestions"], f"Known failure not rejected: {response}"
+    assert threads and threads[0] is not threading.main_thread(), "Feasibility index loaded on the event loop thread"
+    print(f"  ✓ Index loaded on {threads[0].name}, {len(response['suggestions'])} suggestions")
+
+    print("\n✓ Feasibility index test passed!")
+
+
+if __name__ == "__main__":
+    test_batch_parameter_bounds()
+    test_corrupt_store_entry()
+    test_response_cache_keys_by_tool()
+    test_solve_one_final_bound()
+    test_response_formats()
+    test_generate_and_encode()
+    test_metrics_store_stats_off_loop()
+    test_feasibility_index_loaded_off_loop()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test the CCA clearing simulation.
+"""
+
+import math
+import time
+
+from logic import decode_supply_schedule, encode_supply_schedule, generate_schedule, TOTAL_TARGET
+from simulation import simulate_auction, synthetic_bids
+
+
+def _reference(schedule, bids, total_supply, floor_price):
+    """Per-block clearing prices with a linear scan over the active bids."""
+    tokens_per_mps = total_supply / TOTAL_TARGET
+    arrivals = {}
+    for i, block in enumerate(bids["block"]):
+        arrivals.setdefault(block, []).append(i)
+    active = []  # [max_price, weight]
+    price = floor_price
+    prices = []
+    for block in range(schedule.total_blocks):
+        remaining = schedule.total_mps - schedule.released_before(block)
+        for i in arrivals.get(block, []):
+            if remaining > 0 and bids["max_price"][i] > price:
+                active.append((bids["max_price"][i], bids["amount"][i] / remaining))
+        if block in arrivals and remaining > 0:
+            levels = sorted({p for p, _ in active})
+            below = -math.inf
+            for level in levels + [math.inf]:
+                above = sum(w for p, w in active if p > below)
+                if above / tokens_per_mps < level:
+                    price = max(price, below, above / tokens_per_mps)
+                    break
+                below = level
+            active = [(p, w) for p, w in active if p >= price]
+        prices.append(price)
+    return prices
+
+
+def test_matches_reference():
+    """Test clearing prices against a linear-scan reference."""
+    print("Testing clearing prices...")
+
+    schedule = generate_schedule(2_000, 100, num_steps=8)
+    for seed, total_supply in ((1, 20.0), (2, 100.0), (3, 200.0)):
+        bids = synthetic_bids(300, schedule.total_blocks, 0.5, seed=seed, price_sigma=0.8)
+        result = simulate_auction(schedule, bids, total_supply, 0.5)
+        expected = _reference(schedule, bids, total_supply, 0.5)
+        assert len(result["clearing_price"]) == schedule.total_blocks
+        for block, (got, want) in enumerate(zip(result["clearing_price"], expected)):
+            assert math.isclose(got, want, rel_tol=1e-9), f"Price mismatch at block {block}: {got} != {want}"
+        print(
+            f"  ✓ seed {seed}: final price {result['final_clearing_price']:.4f}, "
+            f"{result['bids_outbid']} outbid, {result['bids_rejected']} rejected"
+        )
+
+    print("\n✓ Clearing price test passed!")
+
+
+def test_accounting():
+    """Test supply, budget and price invariants."""
+    print("\nTesting accounting...")
+
+    schedule = decode_supply_schedule(encode_supply_schedule(generate_schedule(14_400, 200, round_to_nearest=100)))
+    per_block_supply = []
+    for entry in schedule:
+        per_block_supply.extend([entry["mps"] * 50_000.0 / TOTAL_TARGET] * entry["blockDelta"])
+
+    for floor_price, label in ((0.01, "oversubscribed"), (10.0, "undersubscribed")):
+        bids = synthetic_bids(2_000, schedule.total_blocks, floor_price, seed=7)
+        result = simulate_auction(schedule, bids, 50_000.0, floor_price)
+        prices = result["clearing_price"]
+        assert all(a <= b for a, b in zip(prices, prices[1:])) and prices[0] >= floor_price, "Price must not drop"
+        for sold, supply in zip(result["tokens_sold"], per_block_supply):
+            assert sold <= supply * (1 + 1e-9), "Cannot sell more than the block releases"
+        assert math.isclose(result["total_tokens_sold"] + result["unsold_tokens"], 50_000.0, rel_tol=1e-9)
+        budgets = math.fsum(bids["amount"])
+        assert result["total_currency_raised"] <= budgets * (1 + 1e-9), "Cannot raise more than the bids hold"
+        assert result["bids_accepted"] + result["bids_rejected"] == 2_000
+        if result["bids_outbid"] == 0:
+            assert math.isclose(result["total_currency_raised"], budgets, rel_tol=1e-9), "Every budget is spent"
+        print(
+            f"  ✓ {label}: sold {result['total_tokens_sold']:.1f} tokens at {result['average_price']:.4f} "
+            f"on average, {result['unsold_tokens']:.1f} unsold"
+        )
+
+    # Prebid blocks release nothing, so nothing sells during them
+    assert all(sold == 0 for sold in result["tokens_sold"][:200])
+    print("  ✓ Nothing sells during prebid")
+
+    print("\n✓ Accounting test passed!")
+
+
+def test_full_auction():
+    """Test a 2-day Base auction against 100k bids."""
+    print("\nTesting a full-size auction...")
+
+    schedule = generate_schedule(86_400)
+    bids = synthetic_bids(100_000, schedule.total_blocks, 0.1, seed=1)
+    assert bids == synthetic_bids(100_000, schedule.total_blocks, 0.1, seed=1), "Bid books must be reproducible"
+
+    start = time.perf_counter()
+    result = simulate_auction(schedule, bids, 1_000_000.0, 0.1)
+    elapsed = time.perf_counter() - start
+    assert len(result["tokens_sold"]) == schedule.total_blocks
+    assert elapsed < 10, f"Simulation took {elapsed:.1f}s"
+    print(f"  ✓ 86,401 blocks x 100,000 bids in {elapsed:.2f}s (final price {result['final_clearing_price']:.4f})")
+
+    print("\n✓ Full auction test passed!")
+
+
+def test_invalid_inputs():
+    """Test that malformed bid books and prices are rejected."""
+    print("\nTesting invalid inputs...")
+
+    schedule = generate_schedule(1_000)
+    bids = synthetic_bids(10, schedule.total_blocks, 1.0)
+    for bad_bids, supply, floor_price in (
+        ({"block": [0], "max_price": [2.0]}, 100.0, 1.0),
+        ({"block": [0, 1], "max_price": [2.0], "amount": [1.0]}, 100.0, 1.0),
+        (bids, 0.0, 1.0),
+        (bids, 100.0, -1.0),
+    ):
+        try:
+            simulate_auction(schedule, bad_bids, supply, floor_price)
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            print(f"  ✓ Rejected: {e}")
+
+    # Bids at or below the floor, or after the supply is released, are rejected rather than raising
+    late = {"block": [0, 0, 5_000], "max_price": [1.0, 2.0, 2.0], "amount": [1.0, 1.0, 1.0]}
+    result = simulate_auction(schedule, late, 100.0, 1.0)
+    assert result["bids_accepted"] == 1 and result["bids_rejected"] == 2
+    print("  ✓ Underpriced and late bids rejected")
+
+    print("\n✓ Invalid inputs test passed!")
+
+
+if __name__ == "__main__":
+    test_matches_reference()
+    test_accounting()
+    test_full_auction()
+    test_invalid_inputs()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Test the persistent schedule store.
+"""
+
+import concurrent.futures
+import os
+import sqlite3
+import tempfile
+
+import store
+from logic import compact_schedule, decode_supply_schedule, generate_schedule, pack_supply_schedule
+from store import ScheduleStore, StoredSchedule, schedule_key
+
+
+def _stored(auction_blocks: int, num_steps: int = 12) -> StoredSchedule:
+    schedule = generate_schedule(auction_blocks, num_steps=num_steps)
+    return StoredSchedule(
+        pack_supply_schedule(schedule),
+        {"total_mps": schedule.total_mps, "num_steps": num_steps, "final_block_percentage": 30.0},
+        None
+    )
+
+
+def _write_many(path: str, start: int, count: int) -> int:
+    """Process-pool body: store count schedules from a separate process."""
+    schedule_store = ScheduleStore(path)
+    for auction_blocks in range(start, start + count):
+        key = schedule_key({"auction_blocks": auction_blocks})
+        schedule_store.put(key, _stored(auction_blocks))
+        assert schedule_store.get(key) is not None
+    return schedule_store.errors
+
+
+def test_keys():
+    """Test that keys are stable, order-independent and cover the algorithm version."""
+    print("Testing content-addressed keys...")
+
+    key = schedule_key({"auction_blocks": 86400, "alpha": 1.2})
+    assert key == schedule_key({"alpha": 1.2, "auction_blocks": 86400}), "Key depends on parameter order"
+    assert key != schedule_key({"auction_blocks": 86400, "alpha": 1.3}), "Different parameters share a key"
+    assert len(key) == 64, f"Expected a SHA-256 hex digest, got {key}"
+
+    original = store.ALGORITHM_VERSION
+    store.ALGORITHM_VERSION = original + 1
+    try:
+        assert schedule_key({"auction_blocks": 86400, "alpha": 1.2}) != key, "Key ignores the algorithm version"
+    finally:
+        store.ALGORITHM_VERSION = original
+    print(f"  ✓ Key: {key[:16]}...")
+
+    print("\n✓ Keys test passed!")
+
+
+def test_round_trip():
+    """Test that stored schedules, summaries and compaction reports survive a reopen."""
+    print("\nTesting round trip across reopen...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "nested", "schedules.db")
+        schedule = generate_schedule(86400, num_steps=50)
+        compacted = compact_schedule(schedule, max_entries=10)
+        report = {"mode": "optimal", "entries": len(compacted), "max_release_deviation_mps": 12.5}
+        entry = StoredSchedule(pack_supply_schedule(compacted), {"total_mps": 10_000_000, "alpha": 1.2}, report)
+        key = schedule_key({"auction_blocks": 86400, "num_steps": 50, "max_entries": 10})
+
+        writer = ScheduleStore(path)
+        assert writer.get(key) is None, "Empty store returned an entry"
+        writer.put(key, entry)
+        writer.close()
+
+        reader = ScheduleStore(path)
+        loaded = reader.get(key)
+        assert loaded == entry, f"Round trip changed the entry: {loaded}"
+        assert decode_supply_schedule(loaded.steps) == compacted, "Stored steps decode to another schedule"
+        stats = reader.stats()
+        assert stats["entries"] == 1 and stats["hits"] == 1, f"Unexpected stats: {stats}"
+        print(f"  ✓ Reopened store returned the entry ({stats['size_bytes']} bytes)")
+
+    print("\n✓ Round trip test passed!")
+
+
+def test_eviction():
+    """Test that the least recently used entries are evicted beyond max_bytes."""
+    print("\nTesting size-based eviction...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        entry_size = len(_stored(10_000).steps) + 60
+        schedule_store = ScheduleStore(os.path.join(directory, "schedules.db"), max_bytes=entry_size * 5)
+        keys = [schedule_key({"auction_blocks": 10_000 + i}) for i in range(12)]
+        for i, key in enumerate(keys):
+            schedule_store.put(key, _stored(10_000 + i))
+            # Keep the first entry recently used
+            connection = schedule_store._connect()
+            connection.execute("UPDATE schedules SET accessed = ? WHERE key = ?", (1e12, keys[0]))
+
+        stats = schedule_store.stats()
+        print(f"  Entries: {stats['entries']}, size: {stats['size_bytes']}/{stats['max_bytes']} bytes, "
+              f"evictions: {stats['evictions']}")
+        assert stats["size_bytes"] <= stats["max_bytes"], f"Store exceeds max_bytes: {stats}"
+        assert stats["evictions"] == 12 - stats["entries"], f"Eviction count mismatch: {stats}"
+        assert schedule_store.get(keys[0]) is not None, "Recently used entry was evicted"
+        assert schedule_store.get(keys[-1]) is not None, "Newest entry was evicted"
+        assert schedule_store.get(keys[1]) is None, "Least recently used entry was kept"
+        print("  ✓ Least recently used entries evicted, recent ones kept")
+
+    print("\n✓ Eviction test passed!")
+
+
+def test_algorithm_version_purge():
+    """Test that entries of other algorithm versions are dropped when a store opens."""
+    print("\nTesting purge of other algorithm versions...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "schedules.db")
+        old = ScheduleStore(path)
+        old.put(schedule_key({"auction_blocks": 86400}), _stored(86400))
+        old.close()
+
+        original = store.ALGORITHM_VERSION
+        store.ALGORITHM_VERSION = original + 1
+        try:
+            stats = ScheduleStore(path).stats()
+        finally:
+            store.ALGORITHM_VERSION = original
+        assert stats["entries"] == 0, f"Entries of the old version were kept: {stats}"
+        print("  ✓ Old version entries purged")
+
+    print("\n✓ Purge test passed!")
+
+
+def test_multiprocess_writers():
+    """Test that several processes can write to one store at once."""
+    print("\nTesting concurrent writers in separate processes...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "schedules.db")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=4) as pool:
+            errors = list(pool.map(_write_many, [path] * 4, [1_000, 1_000, 2_000, 3_000], [25] * 4))
+        stats = ScheduleStore(path).stats()
+        print(f"  Entries: {stats['entries']}, errors per process: {errors}")
+        assert errors == [0, 0, 0, 0], f"Writers reported errors: {errors}"
+        assert stats["entries"] == 75, f"Expected 75 distinct entries, got {stats['entries']}"
+
+    print("\n✓ Concurrent writers test passed!")
+
+
+def test_unusable_database():
+    """Test that an unreadable database degrades to misses instead of raising."""
+    print("\nTesting unusable database...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "schedules.db")
+        with open(path, "wb") as f:
+            f.write(b"not a database" * 100)
+
+        schedule_store = ScheduleStore(path)
+        key = schedule_key({"auction_blocks": 86400})
+        assert schedule_store.get(key) is None, "Corrupt store returned an entry"
+        schedule_store.put(key, _stored(86400))
+        assert schedule_store.errors == 2, f"Expected 2 errors, got {schedule_store.errors}"
+        assert schedule_store.stats()["entries"] is None
+        print("  ✓ Read and write failures counted, not raised")
+
+    print("\n✓ Unusable database test passed!")
+
+
+def test_corrupt_entry():
+    """Test that entries whose summary or compaction does not decode are discarded as misses."""
+    print("\nTesting corrupt entries...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "schedules.db")
+        schedule_store = ScheduleStore(path)
+        key = schedule_key({"auction_blocks": 86400})
+        for column, value in (("summary", "{not json"), ("summary", "[1, 2]"), ("compaction", "\x00")):
+            schedule_store.put(key, _stored(86400))
+            with sqlite3.connect(path) as connection:
+                connection.execute(f"UPDATE schedules SET {column} = ? WHERE key = ?", (value, key))
+            errors = schedule_store.errors
+            assert schedule_store.get(key) is None, f"Corrupt {column} {value!r} returned an entry"
+            assert schedule_store.errors == errors + 1, f"Corrupt {column} {value!r} not counted as an error"
+            assert schedule_store.stats()["entries"] == 0, f"Corrupt {column} {value!r} not deleted"
+            print(f"  ✓ {column}={value!r} discarded")
+
+    print("\n✓ Corrupt entry test passed!")
+
+
+if __name__ == "__main__":
+    test_keys()
+    test_round_trip()
+    test_eviction()
+    test_algorithm_version_purge()
+    test_multiprocess_writers()
+    test_unusable_database()
+    test_corrupt_entry()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
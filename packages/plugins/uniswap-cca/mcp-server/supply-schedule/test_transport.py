@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test the in-flight request limiter of the HTTP transport.
+"""
+
+import asyncio
+
+from transport import InFlightLimiter
+
+
+def _scope(method: str) -> dict:
+    return {"type": "http", "method": method, "path": "/mcp", "headers": []}
+
+
+async def _request(app, method: str) -> tuple[int, dict]:
+    """Send one request through an ASGI app; returns the status and response headers."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(_scope(method), receive, send)
+    start = sent[0]
+    return start["status"], dict(start["headers"])
+
+
+def test_limits():
+    """Test that at most max_in_flight requests run and at most max_queued wait."""
+    print("Testing in-flight and queue limits...")
+
+    running = []
+    peak = []
+
+    async def app(scope, receive, send):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.02)
+        running.pop()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def run():
+        limiter = InFlightLimiter(app, max_in_flight=2, max_queued=3)
+        statuses = await asyncio.gather(*[_request(limiter, "POST") for _ in range(8)])
+        return limiter, statuses
+
+    limiter, statuses = asyncio.run(run())
+    codes = sorted(status for status, _ in statuses)
+    print(f"  Statuses: {codes}, peak in flight: {max(peak)}")
+    assert codes == [200] * 5 + [503] * 3, f"Expected 5 served and 3 rejected, got {codes}"
+    assert max(peak) <= 2, f"Expected at most 2 requests in flight, got {max(peak)}"
+
+    rejected_headers = next(headers for status, headers in statuses if status == 503)
+    assert rejected_headers[b"retry-after"] == b"1", "503 responses should carry Retry-After"
+
+    stats = limiter.stats()
+    assert stats["served"] == 5 and stats["rejected"] == 3, f"Unexpected counters: {stats}"
+    assert stats["in_flight"] == 0 and stats["queued"] == 0, f"Counters did not drain: {stats}"
+    print(f"  ✓ Counters: {stats}")
+
+    try:
+        InFlightLimiter(app, max_in_flight=0)
+        assert False, "Should have raised ValueError for max_in_flight=0"
+    except ValueError as e:
+        print(f"  ✓ Invalid limit rejected: {e}")
+
+    print("\n✓ Limits test passed!")
+
+
+def test_streams_bypass_limit():
+    """Test that GET (SSE streams) and DELETE requests are not limited."""
+    print("\nTesting non-POST requests bypass the limiter...")
+
+    release = None
+
+    async def app(scope, receive, send):
+        if scope["method"] == "POST":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        limiter = InFlightLimiter(app, max_in_flight=1, max_queued=0)
+        blocked = asyncio.create_task(_request(limiter, "POST"))
+        await asyncio.sleep(0)
+        # The only slot is taken and nothing may queue
+        rejected, _ = await _request(limiter, "POST")
+        streams = [status for status, _ in await asyncio.gather(
+            _request(limiter, "GET"), _request(limiter, "DELETE")
+        )]
+        release.set()
+        served, _ = await blocked
+        return rejected, streams, served
+
+    rejected, streams, served = asyncio.run(run())
+    assert rejected == 503, f"Expected a full limiter to reject POST, got {rejected}"
+    assert streams == [200, 200], f"Expected GET and DELETE to pass, got {streams}"
+    assert served == 200, f"Expected the blocked POST to finish, got {served}"
+    print("  ✓ GET and DELETE served while POST slots were full")
+
+    print("\n✓ Bypass test passed!")
+
+
+if __name__ == "__main__":
+    test_limits()
+    test_streams_bypass_limit()
+    print("\n" + "="*60)
+    print("✓ All tests passed!")
+    print("="*60)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+CCA Supply Schedule - HTTP Transport
+
+Serves the MCP server over Streamable HTTP (JSON-RPC over HTTP POST, with
+server-sent events for streamed responses and notifications), so one warm
+process serves many concurrent local clients instead of every agent
+spawning its own server over stdio and paying interpreter startup and
+imports each time.
+
+Connections are kept alive between requests (keep_alive seconds), and tool
+requests pass through InFlightLimiter: at most max_in_flight POSTs are
+processed at once, up to max_queued more wait for a slot, and anything
+beyond that is turned away with 503 and Retry-After instead of piling up
+in memory.
+
+The limiter has no external dependencies; starlette and uvicorn (installed
+with mcp) are imported only when the HTTP server is built.
+"""
+
+import asyncio
+import contextlib
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+# ASGI callables
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_PATH = "/mcp"
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_MAX_QUEUED = 256
+DEFAULT_KEEP_ALIVE = 30.0
+
+# Seconds clients are told to wait after a 503
+RETRY_AFTER_SECONDS = 1
+
+# Host headers accepted when bound to loopback (DNS rebinding protection)
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+
+
+class InFlightLimiter:
+    """
+    ASGI middleware bounding concurrent POST requests with a bounded wait queue.
+
+    Only POSTs (tool calls and other JSON-RPC messages) are limited; GETs
+    (long-lived SSE notification streams) and DELETEs (session teardown)
+    pass straight through, so an idle client cannot hold a slot.
+
+    Counters:
+        in_flight: POSTs being processed
+        queued: POSTs waiting for a slot
+        served: POSTs processed
+        rejected: POSTs turned away because the queue was full
+    """
+
+    def __init__(self, app: ASGIApp, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, max_queued: int = DEFAULT_MAX_QUEUED):
+        """
+        Args:
+            app: Wrapped ASGI application
+            max_in_flight: Max POSTs processed at once
+            max_queued: Max POSTs waiting for a slot (0: reject when all slots are busy)
+        """
+        if max_in_flight < 1 or max_queued < 0:
+            raise ValueError(f"max_in_flight must be >= 1 and max_queued >= 0, got {max_in_flight}, {max_queued}")
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.queued = 0
+        self.served = 0
+        self.rejected = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        if self._semaphore.locked() and self.queued >= self.max_queued:
+            self.rejected += 1
+            await _send_json(send, 503, {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32000, "message": "Server busy, retry later"}
+            }, [(b"retry-after", str(RETRY_AFTER_SECONDS).encode())])
+            return
+
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            self.served += 1
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of the limits and counters."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "served": self.served,
+            "rejected": self.rejected,
+        }
+
+
+async def _send_json(send: Send, status: int, body: dict[str, Any], headers: list[tuple[bytes, bytes]] = ()) -> None:
+    """Send a complete JSON response."""
+    payload = json.dumps(body).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+def build_http_app(
+    mcp_server: Any,
+    host: str = DEFAULT_HOST,
+    path: str = DEFAULT_PATH,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    max_queued: int = DEFAULT_MAX_QUEUED,
+    stats: Callable[[], dict[str, Any]] = dict
+) -> tuple[ASGIApp, InFlightLimiter]:
+    """
+    ASGI app serving an MCP server over Streamable HTTP at path, plus GET /health.
+
+    Args:
+        mcp_server: The mcp.server.Server to serve
+        host: Interface the app will be bound to; loopback hosts get DNS
+            rebinding protection limited to loopback Host headers
+        path: Endpoint of the MCP transport
+        max_in_flight: See InFlightLimiter
+        max_queued: See InFlightLimiter
+        stats: Extra fields for the /health response
+
+    Returns:
+        The app and its limiter (for its counters)
+    """
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from mcp.server.transport_security import TransportSecuritySettings
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+    from starlette.routing import Mount, Route
+
+    security = None
+    if host in ("127.0.0.1", "localhost", "::1"):
+        security = TransportSecuritySettings(
+            allowed_hosts=[f"{name}:*" for name in LOOPBACK_HOSTS] + list(LOOPBACK_HOSTS),
+            allowed_origins=[f"http://{name}:*" for name in LOOPBACK_HOSTS]
+        )
+    session_manager = StreamableHTTPSessionManager(app=mcp_server, security_settings=security)
+
+    async def handle_mcp(scope: Scope, receive: Receive, send: Send) -> None:
+        await session_manager.handle_request(scope, receive, send)
+
+    limiter = InFlightLimiter(handle_mcp, max_in_flight, max_queued)
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "limiter": limiter.stats(), **stats()})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with session_manager.run():
+            yield
+
+    app = Starlette(
+        routes=[Route("/health", health, methods=["GET"]), Mount(path, app=limiter)],
+        lifespan=lifespan
+    )
+    return app, limiter
+
+
+async def serve_http(
+    mcp_server: Any,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    path: str = DEFAULT_PATH,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    max_queued: int = DEFAULT_MAX_QUEUED,
+    keep_alive: float = DEFAULT_KEEP_ALIVE,
+    stats: Callable[[], dict[str, Any]] = dict
+) -> None:
+    """Serve an MCP server over Streamable HTTP with uvicorn until cancelled or interrupted."""
+    import uvicorn
+
+    app, _ = build_http_app(mcp_server, host, path, max_in_flight, max_queued, stats)
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        timeout_keep_alive=keep_alive,
+        log_level="warning",
+        lifespan="on"
+    )
+    await uvicorn.Server(config).serve()